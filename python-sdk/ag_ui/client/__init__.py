@@ -0,0 +1,31 @@
+"""
+This module contains the client side of the Agent User Interaction Protocol.
+"""
+
+from ag_ui.client.sse import ServerSentEvent, SSEParser, parse_sse_stream
+from ag_ui.client.http_agent import HttpAgent
+from ag_ui.client.apply import EventApplier
+from ag_ui.client.chunks import ChunkTransformer, transform_chunks, transform_chunk_stream
+from ag_ui.client.verify import (
+    AGUIError,
+    EventVerifier,
+    verify_events,
+    verify_event_stream,
+    verified
+)
+
+__all__ = [
+    "ServerSentEvent",
+    "SSEParser",
+    "parse_sse_stream",
+    "HttpAgent",
+    "EventApplier",
+    "ChunkTransformer",
+    "transform_chunks",
+    "transform_chunk_stream",
+    "AGUIError",
+    "EventVerifier",
+    "verify_events",
+    "verify_event_stream",
+    "verified"
+]
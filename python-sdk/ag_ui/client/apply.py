@@ -0,0 +1,158 @@
+"""
+This module contains the event applier, which builds up messages and state
+from a stream of events.
+"""
+
+import copy
+import logging
+from typing import Iterable, List, Optional
+
+from ag_ui.core.events import BaseEvent, EventType
+from ag_ui.core.types import AssistantMessage, FunctionCall, Message, State, ToolCall
+from ag_ui.state.patch import JsonPatchError, apply_patch
+
+logger = logging.getLogger(__name__)
+
+
+class EventApplier:
+    """
+    Applies events to a list of messages and a state, like the TypeScript
+    client's `defaultApplyEvents`.
+
+    Events are applied in place. Text and tool call argument deltas are
+    collected in lists of chunks and only joined when the messages are read,
+    so rebuilding a conversation is linear in the size of the stream.
+    `messages` and `state` return copies, which can be kept while more
+    events are applied.
+    """
+
+    def __init__(self, messages: Optional[List[Message]] = None, state: State = None):
+        self._messages: List[Message] = [
+            message.model_copy(deep=True) for message in messages or ()
+        ]
+        self._state = copy.deepcopy(state)
+        self._text_message = None
+        self._text_chunks: List[str] = []
+        self._function = None
+        self._argument_chunks: List[str] = []
+
+    @property
+    def messages(self) -> List[Message]:
+        """
+        Returns a copy of the messages.
+        """
+        self._join_chunks()
+        return [message.model_copy(deep=True) for message in self._messages]
+
+    @property
+    def state(self) -> State:
+        """
+        Returns a copy of the state.
+        """
+        return copy.deepcopy(self._state)
+
+    def apply(self, event: BaseEvent) -> bool:
+        """
+        Applies an event and returns whether it changed the messages or the state.
+        """
+        handler = _HANDLERS.get(event.type)
+        if handler is None:
+            return False
+        return handler(self, event)
+
+    def apply_events(self, events: Iterable[BaseEvent]) -> "EventApplier":
+        """
+        Applies several events and returns the applier.
+        """
+        apply = self.apply
+        for event in events:
+            apply(event)
+        return self
+
+    def _join_chunks(self):
+        """
+        Writes the pending chunks to the message content and tool call arguments.
+        """
+        if len(self._text_chunks) > 1:
+            content = "".join(self._text_chunks)
+            self._text_chunks = [content]
+            self._text_message.content = content
+        if len(self._argument_chunks) > 1:
+            arguments = "".join(self._argument_chunks)
+            self._argument_chunks = [arguments]
+            self._function.arguments = arguments
+
+    def _text_message_start(self, event) -> bool:
+        self._messages.append(AssistantMessage(id=event.message_id, role=event.role, content=""))
+        return True
+
+    def _text_message_content(self, event) -> bool:
+        message = self._messages[-1]
+        if message is not self._text_message:
+            self._join_chunks()
+            self._text_message = message
+            self._text_chunks = [message.content or ""]
+        self._text_chunks.append(event.delta)
+        return True
+
+    def _tool_call_start(self, event) -> bool:
+        parent_message_id = event.parent_message_id
+        if parent_message_id and self._messages and self._messages[-1].id == parent_message_id:
+            message = self._messages[-1]
+        else:
+            message = AssistantMessage(id=parent_message_id or event.tool_call_id, role="assistant")
+            self._messages.append(message)
+        if message.tool_calls is None:
+            message.tool_calls = []
+        message.tool_calls.append(ToolCall(
+            id=event.tool_call_id,
+            type="function",
+            function=FunctionCall(name=event.tool_call_name, arguments=""),
+        ))
+        return True
+
+    def _tool_call_args(self, event) -> bool:
+        function = self._messages[-1].tool_calls[-1].function
+        if function is not self._function:
+            self._join_chunks()
+            self._function = function
+            self._argument_chunks = [function.arguments]
+        self._argument_chunks.append(event.delta)
+        return True
+
+    def _state_snapshot(self, event) -> bool:
+        self._state = copy.deepcopy(event.snapshot)
+        return True
+
+    def _state_delta(self, event) -> bool:
+        try:
+            self._state = apply_patch(self._state, event.delta, in_place=True)
+        except JsonPatchError as error:
+            logger.warning("Failed to apply state patch %r: %s", event.delta, error)
+            return False
+        return True
+
+    def _messages_snapshot(self, event) -> bool:
+        self._messages = [message.model_copy(deep=True) for message in event.messages]
+        self._text_message = None
+        self._text_chunks = []
+        self._function = None
+        self._argument_chunks = []
+        return True
+
+    def _chunk(self, event) -> bool:
+        raise ValueError(f"{event.type.value} must be transformed before being applied")
+
+
+# event type -> handler; events that do not change messages or state are not listed
+_HANDLERS = {
+    EventType.TEXT_MESSAGE_START: EventApplier._text_message_start,
+    EventType.TEXT_MESSAGE_CONTENT: EventApplier._text_message_content,
+    EventType.TOOL_CALL_START: EventApplier._tool_call_start,
+    EventType.TOOL_CALL_ARGS: EventApplier._tool_call_args,
+    EventType.STATE_SNAPSHOT: EventApplier._state_snapshot,
+    EventType.STATE_DELTA: EventApplier._state_delta,
+    EventType.MESSAGES_SNAPSHOT: EventApplier._messages_snapshot,
+    EventType.TEXT_MESSAGE_CHUNK: EventApplier._chunk,
+    EventType.TOOL_CALL_CHUNK: EventApplier._chunk,
+}
@@ -0,0 +1,149 @@
+"""
+This module contains the chunk transform, which expands TEXT_MESSAGE_CHUNK and
+TOOL_CALL_CHUNK events into start, content and end events.
+"""
+
+import logging
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    TextMessageChunkEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ToolCallArgsEvent,
+    ToolCallChunkEvent,
+    ToolCallEndEvent,
+    ToolCallStartEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkTransformer:
+    """
+    Expands chunk events into canonical event sequences, like the TypeScript
+    client's `transformChunks`.
+
+    A TEXT_MESSAGE_CHUNK starts a text message unless one with the same id
+    is already open, and a TOOL_CALL_CHUNK does the same for tool calls. The
+    open message or tool call is ended by the next event of any other type
+    except RAW, or by `close` at the end of the stream. Only the id of the
+    one open message or tool call is kept.
+    """
+
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self._message_id: Optional[str] = None
+        self._tool_call_id: Optional[str] = None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Returns whether a text message or tool call started by a chunk is open.
+        """
+        return self._message_id is not None or self._tool_call_id is not None
+
+    def transform(self, event: BaseEvent) -> List[BaseEvent]:
+        """
+        Returns the events that an event expands to.
+        """
+        event_type = event.type
+        if event_type == EventType.TEXT_MESSAGE_CHUNK:
+            return self._text_message_chunk(event)
+        if event_type == EventType.TOOL_CALL_CHUNK:
+            return self._tool_call_chunk(event)
+        if event_type == EventType.RAW or (self._message_id is None and self._tool_call_id is None):
+            return [event]
+        events = self.close()
+        events.append(event)
+        return events
+
+    def close(self) -> List[BaseEvent]:
+        """
+        Ends the open text message or tool call, if any, and returns the end event.
+        """
+        if self._message_id is not None:
+            event = TextMessageEndEvent.trusted(message_id=self._message_id)
+            self._message_id = None
+        elif self._tool_call_id is not None:
+            event = ToolCallEndEvent.trusted(tool_call_id=self._tool_call_id)
+            self._tool_call_id = None
+        else:
+            return []
+        self._log(event)
+        return [event]
+
+    def _text_message_chunk(self, chunk: TextMessageChunkEvent) -> List[BaseEvent]:
+        message_id = chunk.message_id
+        if self._message_id is None or (message_id is not None and message_id != self._message_id):
+            events = self.close()
+            if message_id is None:
+                raise ValueError("First TEXT_MESSAGE_CHUNK must have a messageId")
+            self._message_id = message_id
+            events.append(self._log(TextMessageStartEvent.trusted(message_id=message_id, role="assistant")))
+        else:
+            events = []
+        if chunk.delta:
+            events.append(self._log(TextMessageContentEvent.trusted(
+                message_id=self._message_id,
+                delta=chunk.delta,
+            )))
+        return events
+
+    def _tool_call_chunk(self, chunk: ToolCallChunkEvent) -> List[BaseEvent]:
+        tool_call_id = chunk.tool_call_id
+        if self._tool_call_id is None or (tool_call_id is not None and tool_call_id != self._tool_call_id):
+            events = self.close()
+            if tool_call_id is None:
+                raise ValueError("First TOOL_CALL_CHUNK must have a toolCallId")
+            if chunk.tool_call_name is None:
+                raise ValueError("First TOOL_CALL_CHUNK must have a toolCallName")
+            self._tool_call_id = tool_call_id
+            events.append(self._log(ToolCallStartEvent.trusted(
+                tool_call_id=tool_call_id,
+                tool_call_name=chunk.tool_call_name,
+                parent_message_id=chunk.parent_message_id,
+            )))
+        else:
+            events = []
+        if chunk.delta is not None:
+            events.append(self._log(ToolCallArgsEvent.trusted(
+                tool_call_id=self._tool_call_id,
+                delta=chunk.delta,
+            )))
+        return events
+
+    def _log(self, event: BaseEvent) -> BaseEvent:
+        if self.debug:
+            logger.debug("[TRANSFORM]: %s %r", event.type.value, event)
+        return event
+
+
+def transform_chunks(events: Iterable[BaseEvent], debug: bool = False) -> Iterator[BaseEvent]:
+    """
+    Yields the events of an iterable with chunk events expanded.
+    """
+    transformer = ChunkTransformer(debug)
+    transform = transformer.transform
+    for event in events:
+        yield from transform(event)
+    yield from transformer.close()
+
+
+async def transform_chunk_stream(
+    events: AsyncIterable[BaseEvent],
+    debug: bool = False,
+) -> AsyncIterator[BaseEvent]:
+    """
+    Yields the events of an async iterable with chunk events expanded.
+    """
+    transformer = ChunkTransformer(debug)
+    transform = transformer.transform
+    async for event in events:
+        for transformed in transform(event):
+            yield transformed
+    for transformed in transformer.close():
+        yield transformed
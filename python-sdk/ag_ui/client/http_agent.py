@@ -0,0 +1,120 @@
+"""
+This module contains the HttpAgent class, which runs a remote agent over HTTP.
+"""
+
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Optional
+
+from ag_ui.client.sse import SSEParser
+from ag_ui.core.events import Event, parse_event
+from ag_ui.core.types import RunAgentInput
+from ag_ui.encoder.media_type import NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE
+from ag_ui.proto import AGUI_MEDIA_TYPE, ProtoStreamParser
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+
+
+def _import_httpx():
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError(
+            "HttpAgent requires httpx, install it with `pip install 'ag-ui-protocol[client]'`"
+        ) from None
+    return httpx
+
+
+class HttpAgent:
+    """
+    Runs an agent served by an AG-UI HTTP endpoint.
+
+    Runs share one pooled `httpx.AsyncClient`, so keep-alive connections are
+    reused across runs. Call `aclose()`, or use the agent as an async context
+    manager, to release the connections.
+
+    httpx is an optional dependency, installed with the `client` extra.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        use_protobuf: bool = True,
+        client: Optional["httpx.AsyncClient"] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    ):
+        httpx = _import_httpx()
+        self.url = url
+        self.headers = dict(headers or {})
+        self.use_protobuf = use_protobuf
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            # agents may take arbitrarily long between events
+            timeout=httpx.Timeout(10.0, read=None),
+        )
+
+    def request_headers(self) -> Dict[str, str]:
+        """
+        Returns the headers of a run request. Override this to customize the request.
+        """
+        if self.use_protobuf:
+            accept = f"{AGUI_MEDIA_TYPE}, {SSE_MEDIA_TYPE};q=0.9"
+        else:
+            accept = SSE_MEDIA_TYPE
+        return {
+            **self.headers,
+            "Content-Type": "application/json",
+            "Accept": accept,
+        }
+
+    async def run(self, input: RunAgentInput) -> AsyncIterator[Event]:
+        """
+        Runs the agent and yields the events it streams back.
+
+        The response is decoded according to its content type, which may be
+        protobuf, SSE or NDJSON. Raises `httpx.HTTPStatusError` if the endpoint
+        responds with an error status.
+        """
+        body = input.model_dump_json(by_alias=True, exclude_none=True)
+        async with self._client.stream(
+            "POST", self.url, content=body, headers=self.request_headers()
+        ) as response:
+            response.raise_for_status()
+            media_type = response.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+
+            if media_type == AGUI_MEDIA_TYPE:
+                parser = ProtoStreamParser()
+                async for chunk in response.aiter_bytes():
+                    for event in parser.feed(chunk):
+                        yield event
+                parser.close()
+            elif media_type == NDJSON_MEDIA_TYPE:
+                async for line in response.aiter_lines():
+                    if line:
+                        yield parse_event(line)
+            else:
+                parser = SSEParser()
+                async for chunk in response.aiter_bytes():
+                    for message in parser.feed(chunk):
+                        yield parse_event(message.data)
+
+    async def aclose(self):
+        """
+        Closes the pooled connections, unless the client was passed in.
+        """
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self) -> "HttpAgent":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,133 @@
+"""
+This module contains the Server-Sent Events parser for consuming AG-UI endpoints.
+"""
+
+from typing import AsyncIterable, AsyncIterator, List, NamedTuple, Optional
+
+from ag_ui.core.events import Event, parse_event
+
+_BOM = b"\xef\xbb\xbf"
+
+
+class ServerSentEvent(NamedTuple):
+    """
+    A message dispatched by the SSE parser.
+    """
+    data: bytes
+    event: str = "message"
+    id: Optional[str] = None
+
+
+class SSEParser:
+    """
+    Incrementally parses a Server-Sent Events stream, following the
+    WHATWG event stream interpretation rules.
+
+    Chunks may split lines, UTF-8 sequences and line endings at arbitrary
+    positions. Multi-line `data` fields are joined with newlines, comments
+    are skipped, and the `id` and `retry` fields are tracked in
+    `last_event_id` and `retry`. A UTF-8 byte order mark at the start of the
+    stream is skipped, and so are events without data. An event that is not
+    terminated by a blank line when the stream ends is discarded.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._started = False
+        self._scanned = 0
+        self._pending_cr = False
+        self._data: List[bytes] = []
+        self._event = ""
+        self.last_event_id: Optional[str] = None
+        self.retry: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[ServerSentEvent]:
+        """
+        Adds a chunk of data and returns the messages it completes.
+        """
+        if not self._started:
+            chunk = self._skip_bom(chunk)
+            if not chunk:
+                return []
+        if self._pending_cr or b"\r" in chunk:
+            chunk = self._normalize_line_endings(chunk)
+        buffer = self._buffer
+        buffer += chunk
+
+        messages: List[ServerSentEvent] = []
+        start = 0
+        view = memoryview(buffer)
+        try:
+            while True:
+                end = buffer.find(b"\n", max(start, self._scanned))
+                if end < 0:
+                    break
+                if end == start:
+                    self._dispatch(messages)
+                elif buffer.startswith(b"data: ", start, end):
+                    self._data.append(bytes(view[start + 6:end]))
+                else:
+                    self._process_field(view, start, end)
+                start = end + 1
+        finally:
+            view.release()
+
+        del buffer[:start]
+        self._scanned = len(buffer)
+        return messages
+
+    def _skip_bom(self, chunk: bytes) -> bytes:
+        # until the stream is known to start with something else, the buffer
+        # only holds the beginning of a byte order mark
+        chunk = bytes(self._buffer) + chunk
+        if len(chunk) < len(_BOM) and _BOM.startswith(chunk):
+            self._buffer = bytearray(chunk)
+            return b""
+        self._buffer = bytearray()
+        self._started = True
+        return chunk[len(_BOM):] if chunk.startswith(_BOM) else chunk
+
+    def _normalize_line_endings(self, chunk: bytes) -> bytes:
+        if self._pending_cr and chunk.startswith(b"\n"):
+            chunk = chunk[1:]
+        self._pending_cr = chunk.endswith(b"\r")
+        return chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+    def _process_field(self, view: memoryview, start: int, end: int):
+        line = bytes(view[start:end])
+        field, colon, value = line.partition(b":")
+        if colon and not field:
+            # comment
+            return
+        if value.startswith(b" "):
+            value = value[1:]
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"event":
+            self._event = value.decode("utf-8", errors="replace")
+        elif field == b"id":
+            if b"\0" not in value:
+                self.last_event_id = value.decode("utf-8", errors="replace")
+        elif field == b"retry":
+            if value.isdigit():
+                self.retry = int(value)
+
+    def _dispatch(self, messages: List[ServerSentEvent]):
+        if self._data:
+            data = self._data[0] if len(self._data) == 1 else b"\n".join(self._data)
+            if data:
+                messages.append(ServerSentEvent(data, self._event or "message", self.last_event_id))
+            self._data = []
+        self._event = ""
+
+
+async def parse_sse_stream(chunks: AsyncIterable[bytes]) -> AsyncIterator[Event]:
+    """
+    Parses an asynchronous stream of SSE byte chunks into typed events.
+
+    Raises `pydantic.ValidationError` if a message does not contain a valid event.
+    """
+    parser = SSEParser()
+    async for chunk in chunks:
+        for message in parser.feed(chunk):
+            yield parse_event(message.data)
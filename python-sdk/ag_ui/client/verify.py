@@ -0,0 +1,317 @@
+"""
+This module contains the event sequence verifier, a port of the TypeScript
+client's `verifyEvents`.
+"""
+
+import functools
+import logging
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, TypeVar
+
+from ag_ui.core.events import BaseEvent, EventType
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+
+class AGUIError(ValueError):
+    """
+    Raised when an event violates the Agent User Interaction Protocol.
+    """
+
+
+# Verifier states. Thinking steps and steps are tracked separately, since
+# they may overlap with any of the running states.
+_IDLE = 0
+_RUNNING = 1
+_IN_TEXT_MESSAGE = 2
+_IN_TOOL_CALL = 3
+_FINISHED = 4
+_ERRORED = 5
+
+# state -> event types that may be sent in that state
+_ALLOWED = (
+    frozenset({EventType.RUN_STARTED, EventType.RUN_ERROR}),
+    frozenset(EventType) - {EventType.RUN_STARTED},
+    frozenset({EventType.TEXT_MESSAGE_CONTENT, EventType.TEXT_MESSAGE_END, EventType.RAW}),
+    frozenset({EventType.TOOL_CALL_ARGS, EventType.TOOL_CALL_END, EventType.RAW}),
+    frozenset({EventType.RUN_ERROR}),
+    frozenset(),
+)
+
+
+class EventVerifier:
+    """
+    Verifies that a sequence of events follows the protocol.
+
+    Each event is checked against a precomputed table of the event types
+    allowed in the current state, followed by a constant-time check of the
+    message, tool call, step or thinking state it refers to. `verify` raises
+    `AGUIError` for an event that is out of order; the verifier should not
+    be used further after that, unless it is `reset`.
+    """
+
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self.reset()
+
+    def reset(self):
+        """
+        Resets the verifier to verify a new run.
+        """
+        self._state = _IDLE
+        self._message_id = None
+        self._tool_call_id = None
+        self._active_steps: Dict[str, bool] = {}
+        self._thinking = False
+        self._thinking_message = False
+
+    def verify(self, event: BaseEvent) -> BaseEvent:
+        """
+        Verifies an event and returns it.
+        """
+        event_type = event.type
+        if self.debug:
+            logger.debug("[VERIFY]: %r", event)
+        if event_type not in _ALLOWED[self._state]:
+            raise AGUIError(self._rejection(event_type))
+        handler = _HANDLERS.get(event_type)
+        if handler is not None:
+            handler(self, event)
+        return event
+
+    def _rejection(self, event_type: EventType) -> str:
+        """
+        Returns the error message for an event type not allowed in the current state.
+        """
+        state = self._state
+        name = event_type.value
+        if state == _ERRORED:
+            return (
+                f"Cannot send event type '{name}': The run has already errored with "
+                "'RUN_ERROR'. No further events can be sent."
+            )
+        if state == _FINISHED:
+            return (
+                f"Cannot send event type '{name}': The run has already finished with "
+                "'RUN_FINISHED'. Start a new run with 'RUN_STARTED'."
+            )
+        if state == _IN_TEXT_MESSAGE:
+            return (
+                f"Cannot send event type '{name}' after 'TEXT_MESSAGE_START': "
+                "Send 'TEXT_MESSAGE_END' first."
+            )
+        if state == _IN_TOOL_CALL:
+            if event_type == EventType.TOOL_CALL_START:
+                return (
+                    "Cannot send 'TOOL_CALL_START' event: A tool call is already in "
+                    "progress. Complete it with 'TOOL_CALL_END' first."
+                )
+            return (
+                f"Cannot send event type '{name}' after 'TOOL_CALL_START': "
+                "Send 'TOOL_CALL_END' first."
+            )
+        if state == _IDLE:
+            return "First event must be 'RUN_STARTED'"
+        return (
+            "Cannot send multiple 'RUN_STARTED' events: A 'RUN_STARTED' event was "
+            "already sent. Each run must have exactly one 'RUN_STARTED' event at "
+            "the beginning."
+        )
+
+    def _run_started(self, event):
+        self._state = _RUNNING
+
+    def _run_finished(self, event):
+        if self._active_steps:
+            unfinished_steps = ", ".join(self._active_steps)
+            raise AGUIError(
+                f"Cannot send 'RUN_FINISHED' while steps are still active: {unfinished_steps}"
+            )
+        self._state = _FINISHED
+
+    def _run_error(self, event):
+        self._state = _ERRORED
+
+    def _text_message_start(self, event):
+        self._message_id = event.message_id
+        self._state = _IN_TEXT_MESSAGE
+
+    def _text_message_content(self, event):
+        if self._state != _IN_TEXT_MESSAGE:
+            raise AGUIError(
+                "Cannot send 'TEXT_MESSAGE_CONTENT' event: No active text message found. "
+                "Start a text message with 'TEXT_MESSAGE_START' first."
+            )
+        if event.message_id != self._message_id:
+            raise AGUIError(
+                "Cannot send 'TEXT_MESSAGE_CONTENT' event: Message ID mismatch. "
+                f"The ID '{event.message_id}' doesn't match the active message ID "
+                f"'{self._message_id}'."
+            )
+
+    def _text_message_end(self, event):
+        if self._state != _IN_TEXT_MESSAGE:
+            raise AGUIError(
+                "Cannot send 'TEXT_MESSAGE_END' event: No active text message found. "
+                "A 'TEXT_MESSAGE_START' event must be sent first."
+            )
+        if event.message_id != self._message_id:
+            raise AGUIError(
+                "Cannot send 'TEXT_MESSAGE_END' event: Message ID mismatch. "
+                f"The ID '{event.message_id}' doesn't match the active message ID "
+                f"'{self._message_id}'."
+            )
+        self._message_id = None
+        self._state = _RUNNING
+
+    def _tool_call_start(self, event):
+        self._tool_call_id = event.tool_call_id
+        self._state = _IN_TOOL_CALL
+
+    def _tool_call_args(self, event):
+        if self._state != _IN_TOOL_CALL:
+            raise AGUIError(
+                "Cannot send 'TOOL_CALL_ARGS' event: No active tool call found. "
+                "Start a tool call with 'TOOL_CALL_START' first."
+            )
+        if event.tool_call_id != self._tool_call_id:
+            raise AGUIError(
+                "Cannot send 'TOOL_CALL_ARGS' event: Tool call ID mismatch. "
+                f"The ID '{event.tool_call_id}' doesn't match the active tool call ID "
+                f"'{self._tool_call_id}'."
+            )
+
+    def _tool_call_end(self, event):
+        if self._state != _IN_TOOL_CALL:
+            raise AGUIError(
+                "Cannot send 'TOOL_CALL_END' event: No active tool call found. "
+                "A 'TOOL_CALL_START' event must be sent first."
+            )
+        if event.tool_call_id != self._tool_call_id:
+            raise AGUIError(
+                "Cannot send 'TOOL_CALL_END' event: Tool call ID mismatch. "
+                f"The ID '{event.tool_call_id}' doesn't match the active tool call ID "
+                f"'{self._tool_call_id}'."
+            )
+        self._tool_call_id = None
+        self._state = _RUNNING
+
+    def _step_started(self, event):
+        if event.step_name in self._active_steps:
+            raise AGUIError(f"Step \"{event.step_name}\" is already active for 'STEP_STARTED'")
+        self._active_steps[event.step_name] = True
+
+    def _step_finished(self, event):
+        if self._active_steps.pop(event.step_name, None) is None:
+            raise AGUIError(
+                f"Cannot send 'STEP_FINISHED' for step \"{event.step_name}\" that was not started"
+            )
+
+    def _thinking_start(self, event):
+        if self._thinking:
+            raise AGUIError(
+                "Cannot send 'THINKING_START' event: A thinking step is already in progress. "
+                "End it with 'THINKING_END' first."
+            )
+        self._thinking = True
+
+    def _thinking_end(self, event):
+        if not self._thinking:
+            raise AGUIError(
+                "Cannot send 'THINKING_END' event: No active thinking step found. "
+                "A 'THINKING_START' event must be sent first."
+            )
+        self._thinking = False
+
+    def _thinking_text_message_start(self, event):
+        if not self._thinking:
+            raise AGUIError(
+                "Cannot send 'THINKING_TEXT_MESSAGE_START' event: A thinking step is not "
+                "in progress. Create one with 'THINKING_START' first."
+            )
+        if self._thinking_message:
+            raise AGUIError(
+                "Cannot send 'THINKING_TEXT_MESSAGE_START' event: A thinking message is "
+                "already in progress. Complete it with 'THINKING_TEXT_MESSAGE_END' first."
+            )
+        self._thinking_message = True
+
+    def _thinking_text_message_content(self, event):
+        if not self._thinking_message:
+            raise AGUIError(
+                "Cannot send 'THINKING_TEXT_MESSAGE_CONTENT' event: No active thinking "
+                "message found. Start a message with 'THINKING_TEXT_MESSAGE_START' first."
+            )
+
+    def _thinking_text_message_end(self, event):
+        if not self._thinking_message:
+            raise AGUIError(
+                "Cannot send 'THINKING_TEXT_MESSAGE_END' event: No active thinking message "
+                "found. A 'THINKING_TEXT_MESSAGE_START' event must be sent first."
+            )
+        self._thinking_message = False
+
+
+# event type -> state transition; event types not listed only need to be allowed
+_HANDLERS = {
+    EventType.RUN_STARTED: EventVerifier._run_started,
+    EventType.RUN_FINISHED: EventVerifier._run_finished,
+    EventType.RUN_ERROR: EventVerifier._run_error,
+    EventType.TEXT_MESSAGE_START: EventVerifier._text_message_start,
+    EventType.TEXT_MESSAGE_CONTENT: EventVerifier._text_message_content,
+    EventType.TEXT_MESSAGE_END: EventVerifier._text_message_end,
+    EventType.TOOL_CALL_START: EventVerifier._tool_call_start,
+    EventType.TOOL_CALL_ARGS: EventVerifier._tool_call_args,
+    EventType.TOOL_CALL_END: EventVerifier._tool_call_end,
+    EventType.STEP_STARTED: EventVerifier._step_started,
+    EventType.STEP_FINISHED: EventVerifier._step_finished,
+    EventType.THINKING_START: EventVerifier._thinking_start,
+    EventType.THINKING_END: EventVerifier._thinking_end,
+    EventType.THINKING_TEXT_MESSAGE_START: EventVerifier._thinking_text_message_start,
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: EventVerifier._thinking_text_message_content,
+    EventType.THINKING_TEXT_MESSAGE_END: EventVerifier._thinking_text_message_end,
+}
+
+
+def verify_events(events: Iterable[BaseEvent], debug: bool = False) -> Iterator[BaseEvent]:
+    """
+    Yields events from an iterable, raising `AGUIError` at the first event
+    that is out of order.
+    """
+    verify = EventVerifier(debug).verify
+    for event in events:
+        yield verify(event)
+
+
+async def verify_event_stream(
+    events: AsyncIterable[BaseEvent],
+    debug: bool = False,
+) -> AsyncIterator[BaseEvent]:
+    """
+    Yields events from an async iterable, raising `AGUIError` at the first
+    event that is out of order.
+    """
+    verify = EventVerifier(debug).verify
+    async for event in events:
+        yield verify(event)
+
+
+def verified(func: F = None, *, debug: bool = False) -> F:
+    """
+    Decorates a function returning an iterable or async iterable of events,
+    such as an agent's run generator, so that every stream it returns is
+    verified with a fresh `EventVerifier`.
+
+    Can be used as `@verified` or `@verified(debug=True)`.
+    """
+    if func is None:
+        return functools.partial(verified, debug=debug)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        events = func(*args, **kwargs)
+        if hasattr(events, "__aiter__"):
+            return verify_event_stream(events, debug)
+        return verify_events(events, debug)
+    return wrapper
@@ -9,10 +9,15 @@ from ag_ui.core.events import (
     TextMessageContentEvent,
     TextMessageEndEvent,
     TextMessageChunkEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
     ToolCallStartEvent,
     ToolCallArgsEvent,
     ToolCallEndEvent,
     ToolCallChunkEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
     StateSnapshotEvent,
     StateDeltaEvent,
     MessagesSnapshotEvent,
@@ -23,7 +28,9 @@ from ag_ui.core.events import (
     RunErrorEvent,
     StepStartedEvent,
     StepFinishedEvent,
-    Event
+    Event,
+    parse_event,
+    parse_events
 )
 
 from ag_ui.core.types import (
@@ -71,6 +78,8 @@ __all__ = [
     "StepStartedEvent",
     "StepFinishedEvent",
     "Event",
+    "parse_event",
+    "parse_events",
     # Types
     "FunctionCall",
     "ToolCall",
@@ -3,8 +3,10 @@ This module contains the event types for the Agent User Interaction Protocol Pyt
 """
 
 from enum import Enum
-from typing import Any, List, Literal, Optional, Union, Annotated
-from pydantic import Field
+from typing import (
+    Any, Dict, FrozenSet, Iterable, Iterator, List, Literal, Optional, Tuple, Union, Annotated, get_args
+)
+from pydantic import Field, TypeAdapter
 
 from .types import Message, State, ConfiguredBaseModel
 
@@ -46,6 +48,76 @@ class BaseEvent(ConfiguredBaseModel):
     timestamp: Optional[int] = None
     raw_event: Optional[Any] = None
 
+    @classmethod
+    def trusted(cls, **fields: Any):
+        """
+        Creates an event from trusted values without running pydantic validation.
+
+        Intended for servers emitting events built from their own values. Fields
+        are passed by name, `type` defaults to the type of the event class, and
+        the model's own invariants (such as non-empty deltas) are still checked.
+        Use the regular constructor or `model_validate` for untrusted input.
+        """
+        try:
+            defaults, names, required = _TRUSTED_FIELDS[cls]
+        except KeyError:
+            defaults, names, required = _TRUSTED_FIELDS[cls] = _trusted_fields(cls)
+        if not (names.issuperset(fields) and required.issubset(fields)):
+            raise ValueError(
+                f"Invalid fields for {cls.__name__}: unknown {sorted(set(fields) - names)}, "
+                f"missing {sorted(required - set(fields))}"
+            )
+
+        data = defaults.copy()
+        data.update(fields)
+        fields_set = set(fields)
+        fields_set.add("type")
+        event = _build(cls, data, fields_set)
+        if cls.__pydantic_post_init__:
+            event.model_post_init(None)
+        return event
+
+
+_new = object.__new__
+_setattr = object.__setattr__
+
+
+def _build(cls, data: Dict[str, Any], fields_set: set):
+    """
+    Creates a model instance from already valid field values, as `model_construct` does.
+    """
+    event = _new(cls)
+    _setattr(event, "__dict__", data)
+    _setattr(event, "__pydantic_fields_set__", fields_set)
+    _setattr(event, "__pydantic_extra__", None)
+    _setattr(event, "__pydantic_private__", None)
+    return event
+
+
+def _add_base_fields(fields_set: set, timestamp: Optional[int], raw_event: Any):
+    if timestamp is not None:
+        fields_set.add("timestamp")
+    if raw_event is not None:
+        fields_set.add("raw_event")
+
+
+# event class -> (defaults, field names, required field names) for BaseEvent.trusted
+_TRUSTED_FIELDS: Dict[type, Tuple[Dict[str, Any], FrozenSet[str], FrozenSet[str]]] = {}
+
+
+def _trusted_fields(cls) -> Tuple[Dict[str, Any], FrozenSet[str], FrozenSet[str]]:
+    defaults = {}
+    required = set()
+    for name, field in cls.model_fields.items():
+        if name == "type" and get_args(field.annotation):
+            defaults[name] = get_args(field.annotation)[0]
+        elif field.is_required() or field.default_factory is not None:
+            # default factories would have to run per event, so they are required here
+            required.add(name)
+        else:
+            defaults[name] = field.default
+    return defaults, frozenset(cls.model_fields), frozenset(required)
+
 
 class TextMessageStartEvent(BaseEvent):
     """
@@ -68,6 +140,30 @@ class TextMessageContentEvent(BaseEvent):
         if len(self.delta) == 0:
             raise ValueError("Delta must not be an empty string")
 
+    @classmethod
+    def trusted(
+        cls,
+        message_id: str,
+        delta: str,
+        timestamp: Optional[int] = None,
+        raw_event: Any = None,
+    ) -> "TextMessageContentEvent":
+        """
+        Creates the event from trusted values, see `BaseEvent.trusted`.
+        """
+        if not delta:
+            raise ValueError("Delta must not be an empty string")
+        fields_set = {"type", "message_id", "delta"}
+        if timestamp is not None or raw_event is not None:
+            _add_base_fields(fields_set, timestamp, raw_event)
+        return _build(cls, {
+            "type": EventType.TEXT_MESSAGE_CONTENT,
+            "timestamp": timestamp,
+            "raw_event": raw_event,
+            "message_id": message_id,
+            "delta": delta,
+        }, fields_set)
+
 
 class TextMessageEndEvent(BaseEvent):
     """
@@ -102,6 +198,28 @@ class ThinkingTextMessageContentEvent(BaseEvent):
         if len(self.delta) == 0:
             raise ValueError("Delta must not be an empty string")
 
+    @classmethod
+    def trusted(
+        cls,
+        delta: str,
+        timestamp: Optional[int] = None,
+        raw_event: Any = None,
+    ) -> "ThinkingTextMessageContentEvent":
+        """
+        Creates the event from trusted values, see `BaseEvent.trusted`.
+        """
+        if not delta:
+            raise ValueError("Delta must not be an empty string")
+        fields_set = {"type", "delta"}
+        if timestamp is not None or raw_event is not None:
+            _add_base_fields(fields_set, timestamp, raw_event)
+        return _build(cls, {
+            "type": EventType.THINKING_TEXT_MESSAGE_CONTENT,
+            "timestamp": timestamp,
+            "raw_event": raw_event,
+            "delta": delta,
+        }, fields_set)
+
 class ThinkingTextMessageEndEvent(BaseEvent):
     """
     Event indicating the end of a thinking text message.
@@ -126,6 +244,28 @@ class ToolCallArgsEvent(BaseEvent):
     tool_call_id: str
     delta: str
 
+    @classmethod
+    def trusted(
+        cls,
+        tool_call_id: str,
+        delta: str,
+        timestamp: Optional[int] = None,
+        raw_event: Any = None,
+    ) -> "ToolCallArgsEvent":
+        """
+        Creates the event from trusted values, see `BaseEvent.trusted`.
+        """
+        fields_set = {"type", "tool_call_id", "delta"}
+        if timestamp is not None or raw_event is not None:
+            _add_base_fields(fields_set, timestamp, raw_event)
+        return _build(cls, {
+            "type": EventType.TOOL_CALL_ARGS,
+            "timestamp": timestamp,
+            "raw_event": raw_event,
+            "tool_call_id": tool_call_id,
+            "delta": delta,
+        }, fields_set)
+
 
 class ToolCallEndEvent(BaseEvent):
     """
@@ -248,10 +388,15 @@ Event = Annotated[
         TextMessageContentEvent,
         TextMessageEndEvent,
         TextMessageChunkEvent,
+        ThinkingTextMessageStartEvent,
+        ThinkingTextMessageContentEvent,
+        ThinkingTextMessageEndEvent,
         ToolCallStartEvent,
         ToolCallArgsEvent,
         ToolCallEndEvent,
         ToolCallChunkEvent,
+        ThinkingStartEvent,
+        ThinkingEndEvent,
         StateSnapshotEvent,
         StateDeltaEvent,
         MessagesSnapshotEvent,
@@ -265,3 +410,26 @@ Event = Annotated[
     ],
     Field(discriminator="type")
 ]
+
+
+_EVENT_ADAPTER: TypeAdapter[Event] = TypeAdapter(Event)
+
+
+def parse_event(data: Union[str, bytes, bytearray, Dict[str, Any]]) -> Event:
+    """
+    Parses and validates an event from JSON, or from an already decoded dict.
+
+    The event class is selected by the `type` field. Raises
+    `pydantic.ValidationError` if the data is not a valid event.
+    """
+    if isinstance(data, dict):
+        return _EVENT_ADAPTER.validate_python(data)
+    return _EVENT_ADAPTER.validate_json(data)
+
+
+def parse_events(items: Iterable[Union[str, bytes, bytearray, Dict[str, Any]]]) -> Iterator[Event]:
+    """
+    Parses and validates a sequence of events, see `parse_event`.
+    """
+    for item in items:
+        yield parse_event(item)
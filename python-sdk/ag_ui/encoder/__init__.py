@@ -3,5 +3,17 @@ This module contains the EventEncoder class.
 """
 
 from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.encoder.media_type import SSE_MEDIA_TYPE, NDJSON_MEDIA_TYPE, negotiate_media_type
+from ag_ui.encoder.batch import encode_batched
+from ag_ui.encoder.cache import EncodedCache, encoded_cache
 
-__all__ = ["EventEncoder", "AGUI_MEDIA_TYPE"]
+__all__ = [
+    "EventEncoder",
+    "AGUI_MEDIA_TYPE",
+    "SSE_MEDIA_TYPE",
+    "NDJSON_MEDIA_TYPE",
+    "negotiate_media_type",
+    "encode_batched",
+    "EncodedCache",
+    "encoded_cache"
+]
@@ -0,0 +1,113 @@
+"""
+This module contains the time and size windowed batching of encoded events.
+"""
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Callable, List, Optional, TypeVar, Union
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.encoder.encoder import EventEncoder
+
+DEFAULT_MAX_DELAY = 0.01
+DEFAULT_MAX_BYTES = 64 * 1024
+
+T = TypeVar("T")
+
+# yielded by _with_deadline when the current window is over
+_DEADLINE = object()
+
+
+def encode_batched(
+    encoder: EventEncoder,
+    events: AsyncIterable[BaseEvent],
+    max_delay: float = DEFAULT_MAX_DELAY,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> AsyncIterator[bytes]:
+    """
+    Encodes a stream of events, coalescing them into chunks of bytes.
+
+    A chunk is emitted once `max_delay` seconds have passed since its first
+    event was received, once it holds at least `max_bytes` bytes, or when the
+    stream ends. Events are never held back for longer than `max_delay`, even
+    if the source is idle.
+    """
+    return _batch(events, encoder.encode_bytes, max_delay, max_bytes)
+
+
+async def _with_deadline(
+    items: AsyncIterable[T],
+    max_delay: float,
+    pending_count: Callable[[], int],
+) -> AsyncIterator[Union[T, object]]:
+    """
+    Yields the items of a stream, or `_DEADLINE` once `max_delay` seconds
+    have passed since a window was opened, even if the source is idle.
+
+    After each yield, `pending_count` returns how many items the caller holds
+    back: a count of 1 opens a new window and a count of 0 closes it, so the
+    caller must release everything it holds when it receives `_DEADLINE`.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = items.__aiter__()
+    deadline: Optional[float] = None
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait((pending,), timeout=timeout)
+            if not done:
+                yield _DEADLINE
+            else:
+                try:
+                    item = pending.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+                yield item
+
+            count = pending_count()
+            if count == 0:
+                deadline = None
+            elif count == 1:
+                deadline = loop.time() + max_delay
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def _batch(
+    items: AsyncIterable[T],
+    encode: Callable[[T], bytes],
+    max_delay: float,
+    max_bytes: int,
+) -> AsyncIterator[bytes]:
+    """
+    Encodes a stream of items with `encode`, coalescing them into chunks of
+    bytes as described in `encode_batched`.
+    """
+    parts: List[bytes] = []
+    size = 0
+    timed = _with_deadline(items, max_delay, lambda: len(parts))
+    try:
+        async for item in timed:
+            if item is _DEADLINE:
+                yield b"".join(parts)
+                parts = []
+                size = 0
+                continue
+
+            data = encode(item)
+            parts.append(data)
+            size += len(data)
+            if size >= max_bytes:
+                yield b"".join(parts)
+                parts = []
+                size = 0
+
+        if parts:
+            yield b"".join(parts)
+    finally:
+        await timed.aclose()
@@ -0,0 +1,77 @@
+"""
+This module contains the cache of encoded events, which lets several sinks
+of the same event share one encoding of it.
+"""
+
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from ag_ui.core.events import BaseEvent
+
+DEFAULT_MAX_EVENTS = 1024
+
+
+class EncodedCache:
+    """
+    Caches the encodings of events by event identity and format.
+
+    An event is cached while it is alive and among the last `max_events`
+    events encoded: entries hold a weak reference to their event and are
+    removed when it is garbage collected, so the cache does not keep events
+    alive. Events are compared by identity, not by value, so an event must
+    not be changed after it was encoded with a cache.
+    """
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        self.max_events = max_events
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Tuple[weakref.ref, Dict[str, bytes]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cached events.
+        """
+        return len(self._entries)
+
+    def get(self, event: BaseEvent, encoding: str, encode: Callable[[BaseEvent], bytes]) -> bytes:
+        """
+        Returns the encoding of an event in a format, calling `encode` if it
+        is not cached yet.
+        """
+        key = id(event)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is event:
+            encodings = entry[1]
+            data = encodings.get(encoding)
+            if data is not None:
+                self.hits += 1
+                return data
+        else:
+            encodings = {}
+            self._entries[key] = (weakref.ref(event, self._remover(key)), encodings)
+            if len(self._entries) > self.max_events:
+                self._entries.popitem(last=False)
+        self.misses += 1
+        data = encodings[encoding] = encode(event)
+        return data
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        self._entries.clear()
+
+    def _remover(self, key: int) -> Callable[[weakref.ref], None]:
+        entries = weakref.ref(self._entries)
+
+        def remove(ref: weakref.ref):
+            # the entry may have been evicted and replaced by one for a new event with the same id
+            current = entries()
+            if current is not None and current.get(key, (None,))[0] is ref:
+                del current[key]
+        return remove
+
+
+encoded_cache = EncodedCache()
@@ -2,31 +2,141 @@
 This module contains the EventEncoder class
 """
 
+from typing import Iterable, Optional, Union
+
 from ag_ui.core.events import BaseEvent
+from ag_ui.proto import AGUI_MEDIA_TYPE, encode_frame
+from ag_ui.encoder.cache import EncodedCache
+from ag_ui.encoder.media_type import NDJSON_MEDIA_TYPE, negotiate_media_type
+from ag_ui.encoder.serializers import serialize_event
+
+
+def _sse_bytes(event: BaseEvent) -> bytes:
+    return b"".join((b"data: ", serialize_event(event), b"\n\n"))
+
+
+def _ndjson_bytes(event: BaseEvent) -> bytes:
+    return serialize_event(event) + b"\n"
 
-AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
 
 class EventEncoder:
     """
     Encodes Agent User Interaction events.
+
+    If `cache` is given, `encode_bytes` looks up and stores the encoded
+    events in it, so that encoders sharing a cache, for example those of the
+    sinks of one run, only encode each event once per format.
     """
-    def __init__(self, accept: str = None):
-        pass
+    def __init__(self, accept: str = None, cache: Optional[EncodedCache] = None):
+        self.accept = accept
+        self.media_type = negotiate_media_type(accept)
+        self.accepts_protobuf = self.media_type == AGUI_MEDIA_TYPE
+        self.cache = cache
+        if self.accepts_protobuf:
+            self._encode_bytes = encode_frame
+        elif self.media_type == NDJSON_MEDIA_TYPE:
+            self._encode_bytes = _ndjson_bytes
+        else:
+            self._encode_bytes = _sse_bytes
 
     def get_content_type(self) -> str:
         """
         Returns the content type of the encoder.
         """
-        return "text/event-stream"
+        return self.media_type
 
-    def encode(self, event: BaseEvent) -> str:
+    def encode(self, event: BaseEvent, event_id: Optional[str] = None) -> Union[str, bytes]:
         """
         Encodes an event.
+
+        Returns a length-prefixed protocol buffer frame if AGUI_MEDIA_TYPE was
+        negotiated, otherwise an SSE or NDJSON string. `event_id` is sent as
+        the SSE `id` field, which clients send back in the Last-Event-ID
+        header when they reconnect; it is ignored by the other formats.
+        """
+        if self.accepts_protobuf:
+            return self._encode_protobuf(event)
+        if self.media_type == NDJSON_MEDIA_TYPE:
+            return self._encode_ndjson(event)
+        return self._encode_sse(event, event_id)
+
+    def encode_bytes(self, event: BaseEvent, event_id: Optional[str] = None) -> bytes:
+        """
+        Encodes an event to bytes.
+
+        Unlike `encode`, the JSON produced by pydantic is framed as bytes
+        directly, without decoding it to a string and encoding it back.
+        """
+        if self.cache is not None:
+            return self._encode_cached(event, event_id)
+        if self.accepts_protobuf:
+            return encode_frame(event)
+        json = serialize_event(event)
+        if self.media_type == NDJSON_MEDIA_TYPE:
+            return json + b"\n"
+        if event_id is not None:
+            return b"".join((b"id: ", event_id.encode("utf-8"), b"\ndata: ", json, b"\n\n"))
+        return b"".join((b"data: ", json, b"\n\n"))
+
+    def encode_many(self, events: Iterable[BaseEvent]) -> bytes:
+        """
+        Encodes several events into one chunk of bytes, so they can be sent
+        with a single write.
         """
-        return self._encode_sse(event)
+        return b"".join([self.encode_bytes(event) for event in events])
 
-    def _encode_sse(self, event: BaseEvent) -> str:
+    def encode_into(self, event: BaseEvent, buffer: bytearray) -> int:
+        """
+        Appends an encoded event to a buffer and returns the number of bytes written.
+
+        This allows reusing one buffer for many events, for example when
+        coalescing them into a single write.
+        """
+        if self.cache is not None:
+            data = self.encode_bytes(event)
+            buffer += data
+            return len(data)
+        start = len(buffer)
+        if self.accepts_protobuf:
+            buffer += encode_frame(event)
+        elif self.media_type == NDJSON_MEDIA_TYPE:
+            buffer += serialize_event(event)
+            buffer += b"\n"
+        else:
+            buffer += b"data: "
+            buffer += serialize_event(event)
+            buffer += b"\n\n"
+        return len(buffer) - start
+
+    def _encode_cached(self, event: BaseEvent, event_id: Optional[str]) -> bytes:
+        """
+        Encodes an event to bytes through the cache.
+
+        SSE events with an id are framed from the cached JSON, since the id
+        differs between the streams the event is sent in.
+        """
+        if event_id is not None and not self.accepts_protobuf and self.media_type != NDJSON_MEDIA_TYPE:
+            json = self.cache.get(event, "json", serialize_event)
+            return b"".join((b"id: ", event_id.encode("utf-8"), b"\ndata: ", json, b"\n\n"))
+        return self.cache.get(event, self.media_type, self._encode_bytes)
+
+    def _encode_sse(self, event: BaseEvent, event_id: Optional[str] = None) -> str:
         """
         Encodes an event into an SSE string.
         """
-        return f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+        if event_id is not None:
+            return f"id: {event_id}\ndata: {serialize_event(event).decode('utf-8')}\n\n"
+        return f"data: {serialize_event(event).decode('utf-8')}\n\n"
+
+    def _encode_ndjson(self, event: BaseEvent) -> str:
+        """
+        Encodes an event into a newline-terminated JSON line.
+        """
+        return f"{serialize_event(event).decode('utf-8')}\n"
+
+    def _encode_protobuf(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into a protocol buffer message prefixed with its
+        length as a 4-byte big-endian unsigned integer.
+        """
+        return encode_frame(event)
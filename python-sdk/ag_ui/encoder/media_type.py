@@ -0,0 +1,96 @@
+"""
+This module contains the media type negotiation for the EventEncoder.
+"""
+
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+from ag_ui.proto import AGUI_MEDIA_TYPE
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Supported media types, cheapest to encode first
+SUPPORTED_MEDIA_TYPES = (AGUI_MEDIA_TYPE, NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE)
+DEFAULT_MEDIA_TYPE = SSE_MEDIA_TYPE
+
+
+class MediaRange(NamedTuple):
+    """
+    A media range of an Accept header.
+    """
+    type: str
+    subtype: str
+    q: float
+
+
+def parse_accept(accept: str) -> List[MediaRange]:
+    """
+    Parses an Accept header into its media ranges. Malformed ranges are skipped.
+    """
+    ranges = []
+    for item in accept.split(","):
+        media_type, _, params = item.partition(";")
+        main_type, separator, subtype = media_type.strip().lower().partition("/")
+        if not separator or not main_type or not subtype:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value.strip().strip('"'))
+                except ValueError:
+                    q = -1.0
+                break
+        if 0.0 <= q <= 1.0:
+            ranges.append(MediaRange(main_type, subtype, q))
+    return ranges
+
+
+def _specificity(media_type: str, media_range: MediaRange) -> int:
+    main_type, _, subtype = media_type.partition("/")
+    if media_range.type == main_type:
+        if media_range.subtype == subtype:
+            return 2
+        if media_range.subtype == "*":
+            return 1
+    elif media_range.type == "*" and media_range.subtype == "*":
+        return 0
+    return -1
+
+
+@lru_cache(maxsize=256)
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Returns the supported media type that best matches an Accept header.
+
+    Media types are ranked by the q-value of their most specific matching range,
+    then by specificity, then by encoding cost. NDJSON and protobuf are only
+    chosen if they are named exactly, since clients accepting them through a
+    wildcard such as `application/*` cannot be assumed to decode them; a
+    wildcard only matches SSE. Falls back to SSE if nothing matches.
+    """
+    if not accept:
+        return DEFAULT_MEDIA_TYPE
+    ranges = parse_accept(accept)
+
+    best = DEFAULT_MEDIA_TYPE
+    best_rank = None
+    for cost, media_type in enumerate(SUPPORTED_MEDIA_TYPES):
+        specificity = -1
+        q = 0.0
+        for media_range in ranges:
+            range_specificity = _specificity(media_type, media_range)
+            if range_specificity > specificity:
+                specificity, q = range_specificity, media_range.q
+            elif range_specificity == specificity and media_range.q > q:
+                q = media_range.q
+        if specificity < 0 or q <= 0.0:
+            continue
+        if specificity < 2 and media_type != DEFAULT_MEDIA_TYPE:
+            continue
+        rank = (q, specificity, -cost)
+        if best_rank is None or rank > best_rank:
+            best, best_rank = media_type, rank
+    return best
@@ -0,0 +1,98 @@
+"""
+This module contains specialized JSON serializers for high-frequency events.
+
+They produce the same bytes as `model_dump_json(by_alias=True, exclude_none=True)`
+but format the fixed schema of an event directly instead of going through
+pydantic's generic alias and None-exclusion handling.
+"""
+
+from json.encoder import encode_basestring
+from typing import Callable, Dict, Optional, Type
+
+from pydantic_core import to_json
+
+from ag_ui.core.events import (
+    BaseEvent,
+    TextMessageContentEvent,
+    ThinkingTextMessageContentEvent,
+    ToolCallArgsEvent,
+    StateDeltaEvent,
+)
+
+
+def _header(event_type: str, fields: dict) -> Optional[str]:
+    """
+    Returns the opening of the JSON object up to the base event fields, or None
+    if the event carries a raw event, which needs generic serialization.
+    """
+    if fields["raw_event"] is not None:
+        return None
+    timestamp = fields["timestamp"]
+    if timestamp is None:
+        return f'{{"type":"{event_type}"'
+    return f'{{"type":"{event_type}","timestamp":{int(timestamp)}'
+
+
+def _serialize_text_message_content(event: TextMessageContentEvent) -> Optional[bytes]:
+    fields = event.__dict__
+    header = _header("TEXT_MESSAGE_CONTENT", fields)
+    if header is None:
+        return None
+    return (
+        f'{header},"messageId":{encode_basestring(fields["message_id"])}'
+        f',"delta":{encode_basestring(fields["delta"])}}}'
+    ).encode("utf-8")
+
+
+def _serialize_tool_call_args(event: ToolCallArgsEvent) -> Optional[bytes]:
+    fields = event.__dict__
+    header = _header("TOOL_CALL_ARGS", fields)
+    if header is None:
+        return None
+    return (
+        f'{header},"toolCallId":{encode_basestring(fields["tool_call_id"])}'
+        f',"delta":{encode_basestring(fields["delta"])}}}'
+    ).encode("utf-8")
+
+
+def _serialize_thinking_text_message_content(event: ThinkingTextMessageContentEvent) -> Optional[bytes]:
+    fields = event.__dict__
+    header = _header("THINKING_TEXT_MESSAGE_CONTENT", fields)
+    if header is None:
+        return None
+    return f'{header},"delta":{encode_basestring(fields["delta"])}}}'.encode("utf-8")
+
+
+def _serialize_state_delta(event: StateDeltaEvent) -> Optional[bytes]:
+    fields = event.__dict__
+    header = _header("STATE_DELTA", fields)
+    if header is None:
+        return None
+    # the patch is untyped, so it is serialized by inference like the model would
+    delta = to_json(fields["delta"], by_alias=True, exclude_none=True, inf_nan_mode="null")
+    return b"".join((header.encode("utf-8"), b',"delta":', delta, b"}"))
+
+
+_SERIALIZERS: Dict[Type[BaseEvent], Callable[[BaseEvent], Optional[bytes]]] = {
+    TextMessageContentEvent: _serialize_text_message_content,
+    ToolCallArgsEvent: _serialize_tool_call_args,
+    ThinkingTextMessageContentEvent: _serialize_thinking_text_message_content,
+    StateDeltaEvent: _serialize_state_delta,
+}
+
+
+def serialize_event(event: BaseEvent) -> bytes:
+    """
+    Serializes an event to JSON bytes, as `model_dump_json(by_alias=True,
+    exclude_none=True)` would to a string.
+    """
+    serializer = _SERIALIZERS.get(type(event))
+    if serializer is not None:
+        try:
+            data = serializer(event)
+        except UnicodeEncodeError:
+            # let pydantic report strings that are not valid unicode
+            data = None
+        if data is not None:
+            return data
+    return event.__pydantic_serializer__.to_json(event, by_alias=True, exclude_none=True)
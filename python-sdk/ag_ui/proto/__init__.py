@@ -0,0 +1,15 @@
+"""
+This module contains the protocol buffer encoding for the Agent User Interaction Protocol.
+"""
+
+from ag_ui.proto.proto import encode, encode_frame, decode, AGUI_MEDIA_TYPE
+from ag_ui.proto.stream import ProtoStreamParser, parse_proto_stream
+
+__all__ = [
+    "encode",
+    "encode_frame",
+    "decode",
+    "ProtoStreamParser",
+    "parse_proto_stream",
+    "AGUI_MEDIA_TYPE"
+]
@@ -0,0 +1,582 @@
+"""
+This module contains the protocol buffer encoding for Agent User Interaction events.
+
+The wire format matches typescript-sdk/packages/proto/src/proto/events.proto. It is
+written by hand so that the SDK does not depend on generated code or the protobuf runtime.
+"""
+
+import struct
+from typing import Any, Dict, Iterator, Tuple, Union
+
+from pydantic_core import to_jsonable_python
+
+from ag_ui.core.events import (
+    EventType,
+    BaseEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
+)
+
+AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
+
+# Wire types
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_LEN = 2
+_WIRE_FIXED32 = 5
+
+# Field kinds
+_STRING = 0
+_VALUE = 1
+_MESSAGES = 2
+_PATCH = 3
+
+_DOUBLE = struct.Struct("<d")
+_FRAME_HEADER = struct.Struct(">I")
+
+_SMALL_VARINTS = [bytes((i,)) for i in range(128)]
+
+# Largest integer a double represents exactly, used to restore JSON integers
+_MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+# EventType enum of events.proto. Chunk events have no enum value and are
+# identified by their oneof field only.
+_PROTO_EVENT_TYPES = {
+    EventType.TEXT_MESSAGE_START: 0,
+    EventType.TEXT_MESSAGE_CONTENT: 1,
+    EventType.TEXT_MESSAGE_END: 2,
+    EventType.TOOL_CALL_START: 3,
+    EventType.TOOL_CALL_ARGS: 4,
+    EventType.TOOL_CALL_END: 5,
+    EventType.STATE_SNAPSHOT: 6,
+    EventType.STATE_DELTA: 7,
+    EventType.MESSAGES_SNAPSHOT: 8,
+    EventType.RAW: 9,
+    EventType.CUSTOM: 10,
+    EventType.RUN_STARTED: 11,
+    EventType.RUN_FINISHED: 12,
+    EventType.RUN_ERROR: 13,
+    EventType.STEP_STARTED: 14,
+    EventType.STEP_FINISHED: 15,
+    EventType.THINKING_TEXT_MESSAGE_START: 16,
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: 17,
+    EventType.THINKING_TEXT_MESSAGE_END: 18,
+    EventType.THINKING_START: 19,
+    EventType.THINKING_END: 20,
+}
+
+# Field number of each event in the `Event.event` oneof
+_ONEOF_FIELDS = {
+    EventType.TEXT_MESSAGE_START: 1,
+    EventType.TEXT_MESSAGE_CONTENT: 2,
+    EventType.TEXT_MESSAGE_END: 3,
+    EventType.TOOL_CALL_START: 4,
+    EventType.TOOL_CALL_ARGS: 5,
+    EventType.TOOL_CALL_END: 6,
+    EventType.STATE_SNAPSHOT: 7,
+    EventType.STATE_DELTA: 8,
+    EventType.MESSAGES_SNAPSHOT: 9,
+    EventType.RAW: 10,
+    EventType.CUSTOM: 11,
+    EventType.RUN_STARTED: 12,
+    EventType.RUN_FINISHED: 13,
+    EventType.RUN_ERROR: 14,
+    EventType.STEP_STARTED: 15,
+    EventType.STEP_FINISHED: 16,
+    EventType.TEXT_MESSAGE_CHUNK: 17,
+    EventType.TOOL_CALL_CHUNK: 18,
+    EventType.THINKING_TEXT_MESSAGE_START: 19,
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: 20,
+    EventType.THINKING_TEXT_MESSAGE_END: 21,
+    EventType.THINKING_START: 22,
+    EventType.THINKING_END: 23,
+}
+
+# (field number, attribute, kind, optional) for the fields following `base_event`
+_EVENT_FIELDS: Dict[EventType, Tuple[Tuple[int, str, int, bool], ...]] = {
+    EventType.TEXT_MESSAGE_START: (
+        (2, "message_id", _STRING, False),
+        (3, "role", _STRING, True),
+    ),
+    EventType.TEXT_MESSAGE_CONTENT: (
+        (2, "message_id", _STRING, False),
+        (3, "delta", _STRING, False),
+    ),
+    EventType.TEXT_MESSAGE_END: (
+        (2, "message_id", _STRING, False),
+    ),
+    EventType.TOOL_CALL_START: (
+        (2, "tool_call_id", _STRING, False),
+        (3, "tool_call_name", _STRING, False),
+        (4, "parent_message_id", _STRING, True),
+    ),
+    EventType.TOOL_CALL_ARGS: (
+        (2, "tool_call_id", _STRING, False),
+        (3, "delta", _STRING, False),
+    ),
+    EventType.TOOL_CALL_END: (
+        (2, "tool_call_id", _STRING, False),
+    ),
+    EventType.STATE_SNAPSHOT: (
+        (2, "snapshot", _VALUE, False),
+    ),
+    EventType.STATE_DELTA: (
+        (2, "delta", _PATCH, False),
+    ),
+    EventType.MESSAGES_SNAPSHOT: (
+        (2, "messages", _MESSAGES, False),
+    ),
+    EventType.RAW: (
+        (2, "event", _VALUE, False),
+        (3, "source", _STRING, True),
+    ),
+    EventType.CUSTOM: (
+        (2, "name", _STRING, False),
+        (3, "value", _VALUE, True),
+    ),
+    EventType.RUN_STARTED: (
+        (2, "thread_id", _STRING, False),
+        (3, "run_id", _STRING, False),
+    ),
+    EventType.RUN_FINISHED: (
+        (2, "thread_id", _STRING, False),
+        (3, "run_id", _STRING, False),
+    ),
+    EventType.RUN_ERROR: (
+        (2, "code", _STRING, True),
+        (3, "message", _STRING, False),
+    ),
+    EventType.STEP_STARTED: (
+        (2, "step_name", _STRING, False),
+    ),
+    EventType.STEP_FINISHED: (
+        (2, "step_name", _STRING, False),
+    ),
+    EventType.TEXT_MESSAGE_CHUNK: (
+        (2, "message_id", _STRING, True),
+        (3, "role", _STRING, True),
+        (4, "delta", _STRING, True),
+    ),
+    EventType.TOOL_CALL_CHUNK: (
+        (2, "tool_call_id", _STRING, True),
+        (3, "tool_call_name", _STRING, True),
+        (4, "parent_message_id", _STRING, True),
+        (5, "delta", _STRING, True),
+    ),
+    EventType.THINKING_TEXT_MESSAGE_START: (),
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: (
+        (2, "delta", _STRING, False),
+    ),
+    EventType.THINKING_TEXT_MESSAGE_END: (),
+    EventType.THINKING_START: (
+        (2, "title", _STRING, True),
+    ),
+    EventType.THINKING_END: (),
+}
+
+_EVENT_CLASSES = {
+    EventType.TEXT_MESSAGE_START: TextMessageStartEvent,
+    EventType.TEXT_MESSAGE_CONTENT: TextMessageContentEvent,
+    EventType.TEXT_MESSAGE_END: TextMessageEndEvent,
+    EventType.TOOL_CALL_START: ToolCallStartEvent,
+    EventType.TOOL_CALL_ARGS: ToolCallArgsEvent,
+    EventType.TOOL_CALL_END: ToolCallEndEvent,
+    EventType.STATE_SNAPSHOT: StateSnapshotEvent,
+    EventType.STATE_DELTA: StateDeltaEvent,
+    EventType.MESSAGES_SNAPSHOT: MessagesSnapshotEvent,
+    EventType.RAW: RawEvent,
+    EventType.CUSTOM: CustomEvent,
+    EventType.RUN_STARTED: RunStartedEvent,
+    EventType.RUN_FINISHED: RunFinishedEvent,
+    EventType.RUN_ERROR: RunErrorEvent,
+    EventType.STEP_STARTED: StepStartedEvent,
+    EventType.STEP_FINISHED: StepFinishedEvent,
+    EventType.TEXT_MESSAGE_CHUNK: TextMessageChunkEvent,
+    EventType.TOOL_CALL_CHUNK: ToolCallChunkEvent,
+    EventType.THINKING_TEXT_MESSAGE_START: ThinkingTextMessageStartEvent,
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: ThinkingTextMessageContentEvent,
+    EventType.THINKING_TEXT_MESSAGE_END: ThinkingTextMessageEndEvent,
+    EventType.THINKING_START: ThinkingStartEvent,
+    EventType.THINKING_END: ThinkingEndEvent,
+}
+
+_ONEOF_EVENT_TYPES = {field_number: event_type for event_type, field_number in _ONEOF_FIELDS.items()}
+
+# field number -> (attribute, kind) for decoding
+_EVENT_FIELDS_BY_NUMBER = {
+    event_type: {field_number: (attribute, kind) for field_number, attribute, kind, _ in fields}
+    for event_type, fields in _EVENT_FIELDS.items()
+}
+
+_PATCH_OPERATIONS = {"add": 0, "remove": 1, "replace": 2, "move": 3, "copy": 4, "test": 5}
+_PATCH_OPERATION_NAMES = {number: name for name, number in _PATCH_OPERATIONS.items()}
+
+
+def _varint(value: int) -> bytes:
+    if 0 <= value < 128:
+        return _SMALL_VARINTS[value]
+    if value < 0:
+        value += 1 << 64
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _len_tag(field_number: int) -> bytes:
+    return _varint((field_number << 3) | _WIRE_LEN)
+
+
+def _varint_tag(field_number: int) -> bytes:
+    return _varint((field_number << 3) | _WIRE_VARINT)
+
+
+_LEN_TAGS = [_len_tag(i) for i in range(32)]
+_VARINT_TAGS = [_varint_tag(i) for i in range(32)]
+
+_NULL_VALUE = b"\x08\x00"
+_TRUE_VALUE = b"\x20\x01"
+_FALSE_VALUE = b"\x20\x00"
+_NUMBER_VALUE_TAG = bytes(((2 << 3) | _WIRE_FIXED64,))
+
+
+def _len_field(field_number: int, payload: bytes) -> bytes:
+    return b"".join((_LEN_TAGS[field_number], _varint(len(payload)), payload))
+
+
+def _string_field(field_number: int, value: str) -> bytes:
+    return _len_field(field_number, value.encode("utf-8"))
+
+
+def _encode_value(value: Any) -> bytes:
+    """
+    Encodes a JSON-compatible value as a `google.protobuf.Value` message body.
+    """
+    if value is None:
+        return _NULL_VALUE
+    if value is True:
+        return _TRUE_VALUE
+    if value is False:
+        return _FALSE_VALUE
+    if isinstance(value, str):
+        return _string_field(3, value)
+    if isinstance(value, (int, float)):
+        return _NUMBER_VALUE_TAG + _DOUBLE.pack(value)
+    if isinstance(value, dict):
+        entries = []
+        for key, item in value.items():
+            entry = b"".join((_string_field(1, str(key)), _len_field(2, _encode_value(item))))
+            entries.append(_len_field(1, entry))
+        return _len_field(5, b"".join(entries))
+    if isinstance(value, (list, tuple)):
+        return _len_field(6, b"".join([_len_field(1, _encode_value(item)) for item in value]))
+    return _encode_value(to_jsonable_python(value, by_alias=True, exclude_none=True))
+
+
+def _encode_message(message: Any) -> bytes:
+    parts = [_string_field(1, message.id), _string_field(2, message.role)]
+    content = getattr(message, "content", None)
+    if content is not None:
+        parts.append(_string_field(3, content))
+    name = getattr(message, "name", None)
+    if name is not None:
+        parts.append(_string_field(4, name))
+    for tool_call in getattr(message, "tool_calls", None) or ():
+        function = b"".join((
+            _string_field(1, tool_call.function.name),
+            _string_field(2, tool_call.function.arguments),
+        ))
+        tool_call_body = b"".join((
+            _string_field(1, tool_call.id),
+            _string_field(2, tool_call.type),
+            _len_field(3, function),
+        ))
+        parts.append(_len_field(5, tool_call_body))
+    tool_call_id = getattr(message, "tool_call_id", None)
+    if tool_call_id is not None:
+        parts.append(_string_field(6, tool_call_id))
+    return b"".join(parts)
+
+
+def _encode_patch_operation(operation: Dict[str, Any]) -> bytes:
+    parts = []
+    op = _PATCH_OPERATIONS[operation["op"].lower()]
+    if op:
+        parts.append(_VARINT_TAGS[1] + _varint(op))
+    if operation.get("path"):
+        parts.append(_string_field(2, operation["path"]))
+    if operation.get("from") is not None:
+        parts.append(_string_field(3, operation["from"]))
+    if "value" in operation:
+        parts.append(_len_field(4, _encode_value(operation["value"])))
+    return b"".join(parts)
+
+
+def _encode_body(event: BaseEvent) -> Tuple[int, bytes]:
+    """
+    Encodes the event-specific message and returns it with its oneof field number.
+    """
+    try:
+        oneof_field = _ONEOF_FIELDS[event.type]
+    except KeyError:
+        raise ValueError(f"Event type {event.type} is not supported by the protobuf encoding") from None
+
+    base = []
+    proto_type = _PROTO_EVENT_TYPES.get(event.type, 0)
+    if proto_type:
+        base.append(_VARINT_TAGS[1] + _varint(proto_type))
+    if event.timestamp is not None:
+        base.append(_VARINT_TAGS[2] + _varint(event.timestamp))
+    if event.raw_event is not None:
+        base.append(_len_field(3, _encode_value(event.raw_event)))
+    parts = [_len_field(1, b"".join(base))]
+
+    for field_number, attribute, kind, optional in _EVENT_FIELDS[event.type]:
+        value = getattr(event, attribute)
+        if kind == _STRING:
+            if value is None if optional else not value:
+                continue
+            parts.append(_string_field(field_number, value))
+        elif kind == _VALUE:
+            if optional and value is None:
+                continue
+            parts.append(_len_field(field_number, _encode_value(value)))
+        elif kind == _MESSAGES:
+            for message in value:
+                parts.append(_len_field(field_number, _encode_message(message)))
+        else:
+            for operation in value:
+                parts.append(_len_field(field_number, _encode_patch_operation(operation)))
+    return oneof_field, b"".join(parts)
+
+
+def encode(event: BaseEvent) -> bytes:
+    """
+    Encodes an event to the protocol buffer binary format.
+    """
+    oneof_field, body = _encode_body(event)
+    return b"".join((_LEN_TAGS[oneof_field], _varint(len(body)), body))
+
+
+def encode_frame(event: BaseEvent) -> bytes:
+    """
+    Encodes an event to the protocol buffer binary format, prefixed with its
+    length as a 4-byte big-endian unsigned integer.
+    """
+    oneof_field, body = _encode_body(event)
+    tag = _LEN_TAGS[oneof_field]
+    length = _varint(len(body))
+    header = _FRAME_HEADER.pack(len(tag) + len(length) + len(body))
+    return b"".join((header, tag, length, body))
+
+
+def _read_varint(data: memoryview, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        try:
+            byte = data[pos]
+        except IndexError:
+            raise ValueError("Truncated varint") from None
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 70:
+            raise ValueError("Invalid varint")
+
+
+def _fields(data: memoryview) -> Iterator[Tuple[int, int, Union[int, memoryview]]]:
+    """
+    Yields (field number, wire type, value) for each field of a message. Length
+    delimited and fixed-size values are returned as views into `data`.
+    """
+    pos = 0
+    end = len(data)
+    while pos < end:
+        key, pos = _read_varint(data, pos)
+        wire_type = key & 0x07
+        if wire_type == _WIRE_VARINT:
+            value, pos = _read_varint(data, pos)
+        else:
+            if wire_type == _WIRE_LEN:
+                size, pos = _read_varint(data, pos)
+            elif wire_type == _WIRE_FIXED64:
+                size = 8
+            elif wire_type == _WIRE_FIXED32:
+                size = 4
+            else:
+                raise ValueError(f"Unsupported wire type {wire_type}")
+            if pos + size > end:
+                raise ValueError("Truncated field")
+            value = data[pos:pos + size]
+            pos += size
+        yield key >> 3, wire_type, value
+
+
+def _decode_value(data: memoryview) -> Any:
+    """
+    Decodes a `google.protobuf.Value` message body to a JSON-compatible value.
+    """
+    result = None
+    for field_number, _, value in _fields(data):
+        if field_number == 1:
+            result = None
+        elif field_number == 2:
+            number = _DOUBLE.unpack(value)[0]
+            if number.is_integer() and abs(number) <= _MAX_SAFE_INTEGER:
+                result = int(number)
+            else:
+                result = number
+        elif field_number == 3:
+            result = str(value, "utf-8")
+        elif field_number == 4:
+            result = bool(value)
+        elif field_number == 5:
+            result = {}
+            for entry_field, _, entry in _fields(value):
+                if entry_field != 1:
+                    continue
+                key = ""
+                item = None
+                for item_field, _, item_value in _fields(entry):
+                    if item_field == 1:
+                        key = str(item_value, "utf-8")
+                    elif item_field == 2:
+                        item = _decode_value(item_value)
+                result[key] = item
+        elif field_number == 6:
+            result = [_decode_value(item) for item_field, _, item in _fields(value) if item_field == 1]
+    return result
+
+
+def _decode_message(data: memoryview) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"id": "", "role": ""}
+    tool_calls = []
+    for field_number, _, value in _fields(data):
+        if field_number == 1:
+            message["id"] = str(value, "utf-8")
+        elif field_number == 2:
+            message["role"] = str(value, "utf-8")
+        elif field_number == 3:
+            message["content"] = str(value, "utf-8")
+        elif field_number == 4:
+            message["name"] = str(value, "utf-8")
+        elif field_number == 5:
+            tool_call: Dict[str, Any] = {"id": "", "type": "", "function": {"name": "", "arguments": ""}}
+            for tool_call_field, _, tool_call_value in _fields(value):
+                if tool_call_field == 1:
+                    tool_call["id"] = str(tool_call_value, "utf-8")
+                elif tool_call_field == 2:
+                    tool_call["type"] = str(tool_call_value, "utf-8")
+                elif tool_call_field == 3:
+                    for function_field, _, function_value in _fields(tool_call_value):
+                        if function_field == 1:
+                            tool_call["function"]["name"] = str(function_value, "utf-8")
+                        elif function_field == 2:
+                            tool_call["function"]["arguments"] = str(function_value, "utf-8")
+            tool_calls.append(tool_call)
+        elif field_number == 6:
+            message["tool_call_id"] = str(value, "utf-8")
+    # tool calls are optional, an empty repeated field means they were not set
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return message
+
+
+def _decode_patch_operation(data: memoryview) -> Dict[str, Any]:
+    operation: Dict[str, Any] = {"op": "add", "path": ""}
+    for field_number, _, value in _fields(data):
+        if field_number == 1:
+            try:
+                operation["op"] = _PATCH_OPERATION_NAMES[value]
+            except KeyError:
+                raise ValueError(f"Invalid JSON patch operation {value}") from None
+        elif field_number == 2:
+            operation["path"] = str(value, "utf-8")
+        elif field_number == 3:
+            operation["from"] = str(value, "utf-8")
+        elif field_number == 4:
+            operation["value"] = _decode_value(value)
+    return operation
+
+
+def decode(data: Union[bytes, bytearray, memoryview]) -> BaseEvent:
+    """
+    Decodes an event from the protocol buffer binary format, without the
+    4-byte length prefix.
+
+    Raises ValueError if the data is not a valid event.
+    """
+    try:
+        return _decode_event(data)
+    except ValueError:
+        raise
+    except (struct.error, TypeError, IndexError, KeyError, AttributeError, OverflowError, RecursionError) as error:
+        # fields with an unexpected wire type or size end up here
+        raise ValueError(f"Invalid event: {error!r}") from error
+
+
+def _decode_event(data: Union[bytes, bytearray, memoryview]) -> BaseEvent:
+    event_type = None
+    body = None
+    for field_number, wire_type, value in _fields(memoryview(data)):
+        if wire_type == _WIRE_LEN and field_number in _ONEOF_EVENT_TYPES:
+            event_type = _ONEOF_EVENT_TYPES[field_number]
+            body = value
+    if event_type is None:
+        raise ValueError("Invalid event")
+
+    fields = _EVENT_FIELDS_BY_NUMBER[event_type]
+    decoded: Dict[str, Any] = {"type": event_type}
+    for _, attribute, kind, optional in _EVENT_FIELDS[event_type]:
+        # a value is only left out when it is null, which also holds for the optional `CustomEvent.value`
+        if not optional or kind == _VALUE:
+            decoded[attribute] = "" if kind == _STRING else [] if kind in (_MESSAGES, _PATCH) else None
+
+    for field_number, _, value in _fields(body):
+        if field_number == 1:
+            for base_field, _, base_value in _fields(value):
+                if base_field == 2:
+                    decoded["timestamp"] = base_value - (1 << 64) if base_value >= 1 << 63 else base_value
+                elif base_field == 3:
+                    decoded["raw_event"] = _decode_value(base_value)
+            continue
+        try:
+            attribute, kind = fields[field_number]
+        except KeyError:
+            continue
+        if kind == _STRING:
+            decoded[attribute] = str(value, "utf-8")
+        elif kind == _VALUE:
+            decoded[attribute] = _decode_value(value)
+        elif kind == _MESSAGES:
+            decoded[attribute].append(_decode_message(value))
+        else:
+            decoded[attribute].append(_decode_patch_operation(value))
+
+    return _EVENT_CLASSES[event_type].model_validate(decoded)
@@ -0,0 +1,94 @@
+"""
+This module contains the streaming parser for length-prefixed protocol buffer frames.
+"""
+
+from typing import AsyncIterable, AsyncIterator, List
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.proto.proto import decode, _FRAME_HEADER
+
+DEFAULT_MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+class ProtoStreamParser:
+    """
+    Incrementally parses a stream of protocol buffer frames, each prefixed with
+    its length as a 4-byte big-endian unsigned integer.
+
+    Chunks may split frames at arbitrary positions. Complete frames are decoded
+    from views into the received data; only an incomplete trailing frame is kept
+    between calls to `feed`. A frame longer than `max_frame_size` bytes is
+    rejected before its data is buffered.
+    """
+
+    def __init__(self, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE):
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[BaseEvent]:
+        """
+        Adds a chunk of data and returns the events of all frames it completes.
+        """
+        if self._buffer:
+            self._buffer += chunk
+            data = self._buffer
+        else:
+            data = chunk
+
+        events = []
+        offset = 0
+        size = len(data)
+        view = memoryview(data)
+        try:
+            while size - offset >= 4:
+                length = _FRAME_HEADER.unpack_from(view, offset)[0]
+                if length > self.max_frame_size:
+                    break
+                end = offset + 4 + length
+                if end > size:
+                    break
+                events.append(decode(view[offset + 4:end]))
+                offset = end
+        except Exception as error:
+            # the buffer may still be exported by views held by the traceback,
+            # and the remaining data cannot be resynchronized with frame boundaries
+            self._buffer = bytearray()
+            raise ValueError(f"Failed to decode protocol buffer message: {error}") from error
+        finally:
+            view.release()
+
+        if size - offset >= 4 and length > self.max_frame_size:
+            # the frame is never read, so the data after it cannot be resynchronized either
+            self._buffer = bytearray()
+            raise ValueError(
+                f"Protocol buffer frame of {length} bytes exceeds the maximum of {self.max_frame_size} bytes"
+            )
+        if data is self._buffer:
+            del self._buffer[:offset]
+        elif offset < size:
+            self._buffer += data[offset:]
+        return events
+
+    def close(self):
+        """
+        Signals the end of the stream.
+
+        Raises ValueError if the stream ended within a frame.
+        """
+        if self._buffer:
+            self._buffer = bytearray()
+            raise ValueError("Incomplete protocol buffer frame at end of stream")
+
+
+async def parse_proto_stream(
+    chunks: AsyncIterable[bytes],
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+) -> AsyncIterator[BaseEvent]:
+    """
+    Parses an asynchronous stream of byte chunks into events.
+    """
+    parser = ProtoStreamParser(max_frame_size)
+    async for chunk in chunks:
+        for event in parser.feed(chunk):
+            yield event
+    parser.close()
@@ -0,0 +1,49 @@
+"""
+This module contains the server side of the Agent User Interaction Protocol.
+"""
+
+from ag_ui.server.compact import EventCompactor, compact_events, merge_deltas
+from ag_ui.server.event_log import EventLog, EventLogGapError, MemoryEventLog, FileEventLog
+from ag_ui.server.resumable import ResumableRuns, parse_last_event_id
+from ag_ui.server.recorder import RecordedRun, RunRecorder, RunReader
+from ag_ui.server.context import (
+    CancellationStats,
+    RunContext,
+    cancellation_stats,
+    current_run_context,
+    run_error_event,
+)
+from ag_ui.server.event_queue import EventQueue, OverflowPolicy, QueueMetrics, buffer_events
+from ag_ui.server.broadcast import Broadcaster, SlowSubscriberPolicy, Subscription
+from ag_ui.server.asgi import AGUIResponse, AGUIEndpoint, agui_endpoint, with_lifecycle
+
+__all__ = [
+    "EventCompactor",
+    "compact_events",
+    "merge_deltas",
+    "EventLog",
+    "EventLogGapError",
+    "MemoryEventLog",
+    "FileEventLog",
+    "ResumableRuns",
+    "parse_last_event_id",
+    "RecordedRun",
+    "RunRecorder",
+    "RunReader",
+    "AGUIResponse",
+    "AGUIEndpoint",
+    "agui_endpoint",
+    "with_lifecycle",
+    "CancellationStats",
+    "RunContext",
+    "cancellation_stats",
+    "current_run_context",
+    "run_error_event",
+    "EventQueue",
+    "OverflowPolicy",
+    "QueueMetrics",
+    "buffer_events",
+    "Broadcaster",
+    "SlowSubscriberPolicy",
+    "Subscription"
+]
@@ -0,0 +1,307 @@
+"""
+This module contains the ASGI response and endpoint, which stream the events
+of a run to a client without going through a framework's streaming response.
+"""
+
+import functools
+import logging
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
+
+from pydantic import ValidationError
+
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    RunErrorEvent,
+    RunFinishedEvent,
+    RunStartedEvent,
+)
+from ag_ui.core.types import RunAgentInput
+from ag_ui.encoder.batch import DEFAULT_MAX_BYTES, DEFAULT_MAX_DELAY, _batch, encode_batched
+from ag_ui.encoder.cache import EncodedCache
+from ag_ui.encoder.encoder import EventEncoder
+from ag_ui.server.context import CancellationStats, RunContext, run_error_event
+from ag_ui.server.event_log import EventLogGapError
+from ag_ui.server.event_queue import EventQueue, buffer_events
+from ag_ui.server.resumable import ResumableRuns
+
+logger = logging.getLogger(__name__)
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+Handler = Callable[[RunAgentInput], AsyncIterable[BaseEvent]]
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _read_body(receive: Receive) -> Optional[bytes]:
+    """
+    Returns the body of a request, or None if the client disconnected.
+    """
+    parts = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        parts.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(parts)
+
+
+async def with_lifecycle(
+    events: AsyncIterable[BaseEvent],
+    thread_id: str,
+    run_id: str,
+    expose_errors: bool = False,
+) -> AsyncIterator[BaseEvent]:
+    """
+    Wraps the events of a run with its lifecycle events.
+
+    A RUN_STARTED event is sent first unless the stream starts with one, and
+    a RUN_FINISHED event is sent last unless the stream ends with a
+    RUN_FINISHED or RUN_ERROR event. If the stream raises an exception, it
+    is logged and a RUN_ERROR event is sent instead, whose message is generic
+    unless `expose_errors` is set, see `run_error_event`.
+    """
+    started = False
+    finished = False
+    try:
+        async for event in events:
+            event_type = event.type
+            if not started and event_type != EventType.RUN_STARTED:
+                yield RunStartedEvent.trusted(thread_id=thread_id, run_id=run_id)
+            started = True
+            if event_type == EventType.RUN_STARTED:
+                finished = False
+            elif event_type in (EventType.RUN_FINISHED, EventType.RUN_ERROR):
+                finished = True
+            yield event
+    except Exception as error:
+        logger.exception("Run %s failed", run_id)
+        if not started:
+            yield RunStartedEvent.trusted(thread_id=thread_id, run_id=run_id)
+        yield run_error_event(error, expose_errors)
+        return
+    if not started:
+        yield RunStartedEvent.trusted(thread_id=thread_id, run_id=run_id)
+    if not finished:
+        yield RunFinishedEvent.trusted(thread_id=thread_id, run_id=run_id)
+
+
+class AGUIResponse:
+    """
+    An ASGI application that sends a stream of events as the response to a
+    request, in the format negotiated from its Accept header.
+
+    Events are encoded and coalesced into chunks with `encode_batched`, and
+    each chunk is sent with a single ASGI message. The next events are only
+    pulled from the stream once the server accepted the previous chunk, so
+    a slow client slows down the agent instead of growing a buffer. The
+    stream is consumed in a `RunContext`, so if the client disconnects, it
+    is cancelled right away, at the point the agent is awaiting, and the
+    cancellation is counted in `stats`.
+
+    If `thread_id` and `run_id` are given, the events are wrapped with
+    `with_lifecycle`, which sends the message of an exception raised by the
+    stream only if `expose_errors` is set. If `queue` is given, the agent runs ahead of the
+    writer through it, see `buffer_events`. If `cache` is given, the events
+    are encoded through it, see `EventEncoder`.
+
+    If `runs` is given, the run is started in it under `run_id` and keeps
+    running if the client disconnects; the events are sent with their
+    sequence numbers as SSE ids. If the run is already known, only its
+    events after `last_event_id` are sent, see `ResumableRuns`. If these
+    are no longer retained, a RUN_ERROR event is sent instead.
+
+    Starlette and FastAPI routes added with `add_route` can return it, as
+    any other ASGI response.
+    """
+
+    def __init__(
+        self,
+        events: AsyncIterable[BaseEvent],
+        accept: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        stats: Optional[CancellationStats] = None,
+        queue: Optional[EventQueue] = None,
+        cache: Optional[EncodedCache] = None,
+        runs: Optional[ResumableRuns] = None,
+        last_event_id: Optional[str] = None,
+        expose_errors: bool = False,
+    ):
+        if runs is not None and run_id is None:
+            raise ValueError("A run_id is required to stream a run through ResumableRuns")
+        self.events = events
+        self.accept = accept
+        self.thread_id = thread_id
+        self.run_id = run_id
+        self.headers = headers
+        self.max_delay = max_delay
+        self.max_bytes = max_bytes
+        self.stats = stats
+        self.queue = queue
+        self.cache = cache
+        self.runs = runs
+        self.last_event_id = last_event_id
+        self.expose_errors = expose_errors
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        accept = self.accept if self.accept is not None else _header(scope, b"accept")
+        encoder = EventEncoder(accept=accept, cache=self.cache)
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": self._headers(encoder),
+        })
+        async with RunContext(receive, self.stats) as context:
+            await context.run(self._stream(encoder, send, context))
+
+    def _headers(self, encoder: EventEncoder) -> List[Tuple[bytes, bytes]]:
+        headers = [
+            (b"content-type", encoder.get_content_type().encode("latin-1")),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+        ]
+        if self.headers:
+            headers.extend(
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in self.headers.items()
+            )
+        return headers
+
+    async def _stream(self, encoder: EventEncoder, send: Send, context: RunContext):
+        events = self.events
+        if self.thread_id is not None and self.run_id is not None:
+            events = with_lifecycle(events, self.thread_id, self.run_id, self.expose_errors)
+        if self.runs is not None:
+            encode_bytes = encoder.encode_bytes
+
+            def encode(item: Tuple[int, BaseEvent]) -> bytes:
+                return encode_bytes(item[1], str(item[0]))
+
+            logged = self.runs.follow(self.run_id, lambda: events, self.last_event_id)
+            chunks = _batch(logged, encode, self.max_delay, self.max_bytes)
+        else:
+            if self.queue is not None:
+                events = buffer_events(events, self.queue)
+            chunks = encode_batched(encoder, events, self.max_delay, self.max_bytes)
+        try:
+            async for chunk in chunks:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            context.finish()
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        except EventLogGapError as error:
+            logger.info("Cannot resume run %s: %s", self.run_id, error)
+            event = RunErrorEvent.trusted(message="The run cannot be resumed", code="RESUME_FAILED")
+            context.finish()
+            await send({"type": "http.response.body", "body": encoder.encode_bytes(event), "more_body": False})
+        except OSError:
+            # the server failed to write to the client, which disconnected
+            logger.debug("Client disconnected while sending the response")
+
+
+class AGUIEndpoint:
+    """
+    An ASGI application that runs an agent for each request.
+
+    The body of the request is parsed as a RunAgentInput and passed to
+    `handler`, which returns the events of the run, for example as an async
+    generator. The events are sent with an `AGUIResponse`. A request with an
+    invalid body gets a 422 response with the validation errors.
+
+    If `runs` is given, runs are served through it: a client that reconnects
+    with a Last-Event-ID header and the same run id is sent the events it
+    missed, instead of the agent being run again.
+
+    A run that raises an exception ends with a RUN_ERROR event with a generic
+    message, unless `expose_errors` is set; see `with_lifecycle`.
+
+    With FastAPI or Starlette, the endpoint is added with
+    `app.add_route(path, endpoint, methods=["POST"])`.
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        runs: Optional[ResumableRuns] = None,
+        expose_errors: bool = False,
+    ):
+        self.handler = handler
+        self.max_delay = max_delay
+        self.max_bytes = max_bytes
+        self.runs = runs
+        self.expose_errors = expose_errors
+        functools.update_wrapper(self, handler)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        body = await _read_body(receive)
+        if body is None:
+            return
+        try:
+            input_data = RunAgentInput.model_validate_json(body)
+        except ValidationError as error:
+            detail = error.json(include_url=False).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 422,
+                "headers": [(b"content-type", b"application/json")],
+            })
+            await send({"type": "http.response.body", "body": b'{"detail":' + detail + b"}"})
+            return
+        response = AGUIResponse(
+            self.handler(input_data),
+            thread_id=input_data.thread_id,
+            run_id=input_data.run_id,
+            max_delay=self.max_delay,
+            max_bytes=self.max_bytes,
+            runs=self.runs,
+            last_event_id=_header(scope, b"last-event-id") if self.runs is not None else None,
+            expose_errors=self.expose_errors,
+        )
+        await response(scope, receive, send)
+
+
+def agui_endpoint(
+    handler: Optional[Handler] = None,
+    *,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    runs: Optional[ResumableRuns] = None,
+    expose_errors: bool = False,
+):
+    """
+    Decorates a function taking a RunAgentInput and returning the events of
+    the run, turning it into an `AGUIEndpoint`.
+
+    Can be used as `@agui_endpoint` or `@agui_endpoint(max_delay=0.05)`.
+    """
+    if handler is None:
+        return functools.partial(
+            agui_endpoint, max_delay=max_delay, max_bytes=max_bytes, runs=runs, expose_errors=expose_errors
+        )
+    return AGUIEndpoint(handler, max_delay, max_bytes, runs, expose_errors)
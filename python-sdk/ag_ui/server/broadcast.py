@@ -0,0 +1,358 @@
+"""
+This module contains the broadcaster, which streams the events of one run
+to many subscribers.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from enum import Enum
+from typing import AsyncIterable, AsyncIterator, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from ag_ui.client.apply import EventApplier
+from ag_ui.client.chunks import ChunkTransformer
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    MessagesSnapshotEvent,
+    StateSnapshotEvent,
+    StepFinishedEvent,
+    TextMessageEndEvent,
+    ThinkingEndEvent,
+    ThinkingTextMessageEndEvent,
+    ToolCallEndEvent,
+)
+from ag_ui.encoder.cache import EncodedCache
+from ag_ui.encoder.encoder import EventEncoder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LAG = 256
+
+
+class _Progress(NamedTuple):
+    """
+    Where a run stands: the events that started the run and the steps,
+    thinking and messages in progress, and the event that ended the run.
+    """
+    run_started: Optional[BaseEvent] = None
+    run_ended: Optional[BaseEvent] = None
+    message_id: Optional[str] = None
+    tool_call_id: Optional[str] = None
+    thinking: Optional[BaseEvent] = None
+    thinking_message: Optional[BaseEvent] = None
+    steps: Tuple[BaseEvent, ...] = ()
+
+
+_NOT_STARTED = _Progress()
+
+# event type -> how an event of that type changes the progress of the run
+_PROGRESS_UPDATES: Dict[EventType, Callable[[_Progress, BaseEvent], _Progress]] = {
+    EventType.RUN_STARTED: lambda progress, event: _Progress(run_started=event),
+    EventType.RUN_FINISHED: lambda progress, event: progress._replace(run_ended=event),
+    EventType.RUN_ERROR: lambda progress, event: progress._replace(run_ended=event),
+    EventType.TEXT_MESSAGE_START: lambda progress, event: progress._replace(message_id=event.message_id),
+    EventType.TEXT_MESSAGE_END: lambda progress, event: progress._replace(message_id=None),
+    EventType.TOOL_CALL_START: lambda progress, event: progress._replace(tool_call_id=event.tool_call_id),
+    EventType.TOOL_CALL_END: lambda progress, event: progress._replace(tool_call_id=None),
+    EventType.THINKING_START: lambda progress, event: progress._replace(thinking=event),
+    EventType.THINKING_END: lambda progress, event: progress._replace(thinking=None),
+    EventType.THINKING_TEXT_MESSAGE_START: lambda progress, event: progress._replace(thinking_message=event),
+    EventType.THINKING_TEXT_MESSAGE_END: lambda progress, event: progress._replace(thinking_message=None),
+    EventType.STEP_STARTED: lambda progress, event: progress._replace(steps=progress.steps + (event,)),
+    EventType.STEP_FINISHED: lambda progress, event: progress._replace(steps=tuple(
+        step for step in progress.steps if step.step_name != event.step_name
+    )),
+}
+
+
+class SlowSubscriberPolicy(str, Enum):
+    """
+    What a `Broadcaster` does with a subscriber that fell too far behind.
+    """
+    DISCONNECT = "disconnect"
+    RESYNC = "resync"
+
+
+class Subscription:
+    """
+    A subscriber of a `Broadcaster`, iterated as an async iterator of chunks
+    of encoded events in the format negotiated from its Accept header.
+
+    Each chunk holds all events published since the previous one, so a
+    subscriber that reads less often than events are published makes fewer,
+    larger writes. The iteration ends when the broadcaster is closed, or
+    right away if the subscriber is disconnected for lagging, which sets
+    `lagged`.
+    """
+
+    def __init__(self, broadcaster: "Broadcaster", encoder: EventEncoder):
+        self.encoder = encoder
+        self.media_type = encoder.get_content_type()
+        self.closed = False
+        self.lagged = False
+        self.resyncs = 0
+        self._broadcaster = broadcaster
+        self._chunks: Deque[bytes] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        # the progress of the run as of the events this subscriber has read
+        self._progress = _NOT_STARTED
+
+    def __len__(self) -> int:
+        """
+        Returns the number of encoded events waiting to be read; the
+        snapshots of a resync count as one.
+        """
+        return len(self._chunks)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> bytes:
+        while not self._chunks:
+            if self.closed:
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        chunk = b"".join(self._chunks)
+        self._chunks.clear()
+        self._progress = self._broadcaster._progress
+        return chunk
+
+    def close(self):
+        """
+        Unsubscribes, ending the iteration once the waiting events were read.
+        """
+        self._broadcaster._unsubscribe(self)
+        self.closed = True
+        self._wake()
+
+    def _push(self, data: bytes):
+        self._chunks.append(data)
+        self._wake()
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+
+class Broadcaster:
+    """
+    Streams the events of one run to any number of subscribers.
+
+    Each published event is encoded once per wire format in use, and the
+    encoded bytes are shared by all subscribers of that format. Every
+    subscriber has its own buffer of up to `max_lag` events, so publishing
+    never waits for a subscriber. A subscriber whose buffer is full is
+    handled according to `policy`:
+
+    - DISCONNECT closes its subscription, with `lagged` set.
+    - RESYNC drops its buffer and sends it the current messages and state
+      as MESSAGES_SNAPSHOT and STATE_SNAPSHOT events instead.
+
+    The broadcaster applies the events to keep the messages and state
+    current, so that subscribers joining during the run are also sent the
+    RUN_STARTED event and the snapshots first.
+
+    A resync keeps the events a subscriber reads in protocol order. While a
+    text message or tool call is open, the subscriber is held back until it
+    ends, since the snapshots cannot be sent within it. The events it missed
+    are then replaced by the end events of what it saw start and what ended
+    since, the snapshots, and the start events of the steps and thinking
+    still in progress; RUN_STARTED is only sent if it did not read it yet.
+
+    If `cache` is given, the events are encoded through it, so the other
+    sinks of the run can reuse the encodings.
+    """
+
+    def __init__(
+        self,
+        max_lag: int = DEFAULT_MAX_LAG,
+        policy: Union[SlowSubscriberPolicy, str] = SlowSubscriberPolicy.RESYNC,
+        cache: Optional[EncodedCache] = None,
+    ):
+        self.max_lag = max_lag
+        self.cache = cache
+        self.policy = SlowSubscriberPolicy(policy)
+        self.closed = False
+        self.disconnected_subscribers = 0
+        self.resyncs = 0
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._held: List[Subscription] = []
+        self._applier = EventApplier()
+        self._chunks = ChunkTransformer()
+        self._progress = _NOT_STARTED
+
+    @property
+    def subscriber_count(self) -> int:
+        """
+        Returns the number of subscribers.
+        """
+        return sum(len(subscribers) for subscribers in self._subscribers.values()) + len(self._held)
+
+    def subscribe(self, accept: Optional[str] = None) -> Subscription:
+        """
+        Adds a subscriber for the format negotiated from an Accept header.
+
+        A subscriber joining a closed broadcaster is sent the final messages
+        and state.
+        """
+        subscription = Subscription(self, EventEncoder(accept=accept, cache=self.cache))
+        if self.closed:
+            self._send_resync(subscription)
+            subscription.closed = True
+        else:
+            self._resync(subscription)
+        return subscription
+
+    def publish(self, event: BaseEvent):
+        """
+        Sends an event to all subscribers.
+        """
+        if self.closed:
+            raise ValueError("Cannot publish to a closed broadcaster")
+        self._track(event)
+        max_lag = self.max_lag
+        for subscribers in self._subscribers.values():
+            if not subscribers:
+                continue
+            data = subscribers[0].encoder.encode_bytes(event)
+            for subscription in list(subscribers):
+                if len(subscription._chunks) < max_lag:
+                    subscription._push(data)
+                else:
+                    self._overflow(subscription)
+        if self._held and not self._in_message():
+            held = self._held
+            self._held = []
+            for subscription in held:
+                self._resync(subscription)
+
+    def close(self):
+        """
+        Ends the subscriptions once their waiting events were read.
+        """
+        self.closed = True
+        for subscription in self._held:
+            self._send_resync(subscription)
+            subscription.closed = True
+            subscription._wake()
+        self._held.clear()
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.closed = True
+                subscription._wake()
+        self._subscribers.clear()
+
+    async def relay(self, events: AsyncIterable[BaseEvent]) -> AsyncIterator[BaseEvent]:
+        """
+        Publishes the events of a stream while passing them through, and
+        closes the broadcaster at its end.
+
+        This allows the client that started the run to be sent its events
+        directly while others subscribe to it.
+        """
+        try:
+            async for event in events:
+                self.publish(event)
+                yield event
+        finally:
+            self.close()
+
+    def _unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.media_type)
+        if subscribers and subscription in subscribers:
+            subscribers.remove(subscription)
+        elif subscription in self._held:
+            self._held.remove(subscription)
+
+    def _track(self, event: BaseEvent):
+        update = _PROGRESS_UPDATES.get(event.type)
+        if update is not None:
+            self._progress = update(self._progress, event)
+        apply = self._applier.apply
+        for transformed in self._chunks.transform(event):
+            apply(transformed)
+
+    def _in_message(self) -> bool:
+        """
+        Returns whether a text message or tool call is open, within which
+        the snapshots of a resync cannot be sent.
+        """
+        progress = self._progress
+        return progress.message_id is not None or progress.tool_call_id is not None or self._chunks.is_open
+
+    def _resync(self, subscription: Subscription):
+        """
+        Sends the resync events to a subscriber, or holds it back until the
+        open text message or tool call ends.
+        """
+        if self._in_message():
+            self._held.append(subscription)
+            return
+        self._send_resync(subscription)
+        self._subscribers.setdefault(subscription.media_type, []).append(subscription)
+
+    def _resync_events(self, read: _Progress) -> List[BaseEvent]:
+        """
+        Returns the events that bring a subscriber up to date, given the
+        progress of the run as of the events it has read.
+        """
+        progress = self._progress
+        events = []
+        if progress.run_started is not None and progress.run_started is read.run_started:
+            # end what the subscriber saw start and what ended since
+            if read.message_id is not None and read.message_id != progress.message_id:
+                events.append(TextMessageEndEvent.trusted(message_id=read.message_id))
+            if read.tool_call_id is not None and read.tool_call_id != progress.tool_call_id:
+                events.append(ToolCallEndEvent.trusted(tool_call_id=read.tool_call_id))
+            if read.thinking_message is not None and read.thinking_message is not progress.thinking_message:
+                events.append(ThinkingTextMessageEndEvent.trusted())
+            if read.thinking is not None and read.thinking is not progress.thinking:
+                events.append(ThinkingEndEvent.trusted())
+            for step in read.steps:
+                if step not in progress.steps:
+                    events.append(StepFinishedEvent.trusted(step_name=step.step_name))
+        else:
+            read = _NOT_STARTED
+            if progress.run_started is not None:
+                events.append(progress.run_started)
+        messages = self._applier.messages
+        if messages:
+            events.append(MessagesSnapshotEvent.trusted(messages=messages))
+        state = self._applier.state
+        if state is not None:
+            events.append(StateSnapshotEvent.trusted(snapshot=state))
+        for step in progress.steps:
+            if step not in read.steps:
+                events.append(step)
+        if progress.thinking is not None and progress.thinking is not read.thinking:
+            events.append(progress.thinking)
+        if progress.thinking_message is not None and progress.thinking_message is not read.thinking_message:
+            events.append(progress.thinking_message)
+        if progress.run_ended is not None and progress.run_ended is not read.run_ended:
+            events.append(progress.run_ended)
+        return events
+
+    def _send_resync(self, subscription: Subscription):
+        events = self._resync_events(subscription._progress)
+        if events:
+            subscription._push(subscription.encoder.encode_many(events))
+
+    def _overflow(self, subscription: Subscription):
+        subscription._chunks.clear()
+        if self.policy == SlowSubscriberPolicy.DISCONNECT:
+            logger.info("Disconnecting a subscriber lagging %d events behind", self.max_lag)
+            self.disconnected_subscribers += 1
+            subscription.lagged = True
+            subscription.close()
+            return
+        logger.debug("Resyncing a subscriber lagging %d events behind", self.max_lag)
+        self.resyncs += 1
+        subscription.resyncs += 1
+        self._unsubscribe(subscription)
+        self._resync(subscription)
@@ -0,0 +1,151 @@
+"""
+This module contains the compaction of consecutive content deltas.
+"""
+
+from typing import AsyncIterable, AsyncIterator, List, Optional
+
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    TextMessageContentEvent,
+    ThinkingTextMessageContentEvent,
+    ToolCallArgsEvent,
+)
+from ag_ui.encoder.batch import _DEADLINE, _with_deadline
+
+DEFAULT_MAX_DELAY = 0.01
+DEFAULT_MAX_SIZE = 4 * 1024
+
+# event type -> name of the field identifying the message or tool call, if any
+_ID_FIELDS = {
+    EventType.TEXT_MESSAGE_CONTENT: "message_id",
+    EventType.TOOL_CALL_ARGS: "tool_call_id",
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: None,
+}
+
+
+def _content(event_type: EventType, event_id: Optional[str], delta: str, timestamp: Optional[int]) -> BaseEvent:
+    if event_type == EventType.TEXT_MESSAGE_CONTENT:
+        return TextMessageContentEvent.trusted(message_id=event_id, delta=delta, timestamp=timestamp)
+    if event_type == EventType.TOOL_CALL_ARGS:
+        return ToolCallArgsEvent.trusted(tool_call_id=event_id, delta=delta, timestamp=timestamp)
+    return ThinkingTextMessageContentEvent.trusted(delta=delta, timestamp=timestamp)
+
+
+def merge_deltas(first: BaseEvent, second: BaseEvent, max_size: int = DEFAULT_MAX_SIZE) -> Optional[BaseEvent]:
+    """
+    Returns an event merging two consecutive content deltas for the same
+    message or tool call, or None if they cannot be merged or the delta of
+    the first one already holds `max_size` characters.
+    """
+    event_type = first.type
+    id_field = _ID_FIELDS.get(event_type, False)
+    if id_field is False or second.type != event_type:
+        return None
+    if first.raw_event is not None or second.raw_event is not None or len(first.delta) >= max_size:
+        return None
+    event_id = getattr(first, id_field) if id_field else None
+    if id_field and getattr(second, id_field) != event_id:
+        return None
+    return _content(event_type, event_id, first.delta + second.delta, first.timestamp)
+
+
+class EventCompactor:
+    """
+    Merges consecutive TEXT_MESSAGE_CONTENT, TOOL_CALL_ARGS and
+    THINKING_TEXT_MESSAGE_CONTENT events for the same message or tool call
+    into one event.
+
+    Events of other types, and events carrying a raw event, are never merged
+    and pass through in order; a pending merged event is emitted before them.
+    A merged event keeps the timestamp of its first event and is emitted at
+    the latest once its delta holds `max_size` characters.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._first: Optional[BaseEvent] = None
+        self._type: Optional[EventType] = None
+        self._id: Optional[str] = None
+        self._deltas: List[str] = []
+        self._size = 0
+
+    @property
+    def pending_count(self) -> int:
+        """
+        Returns the number of events merged into the pending event.
+        """
+        return len(self._deltas)
+
+    def add(self, event: BaseEvent) -> List[BaseEvent]:
+        """
+        Adds an event and returns the events that are ready to be sent.
+        """
+        event_type = event.type
+        id_field = _ID_FIELDS.get(event_type, False)
+        if id_field is False or event.raw_event is not None:
+            events = self.flush()
+            events.append(event)
+            return events
+
+        event_id = getattr(event, id_field) if id_field else None
+        if event_type == self._type and event_id == self._id:
+            self._deltas.append(event.delta)
+            self._size += len(event.delta)
+            if self._size >= self.max_size:
+                return self.flush()
+            return []
+
+        events = self.flush()
+        self._first = event
+        self._type = event_type
+        self._id = event_id
+        self._deltas.append(event.delta)
+        self._size = len(event.delta)
+        if self._size >= self.max_size:
+            events.extend(self.flush())
+        return events
+
+    def flush(self) -> List[BaseEvent]:
+        """
+        Returns the pending merged event, if any.
+        """
+        deltas = self._deltas
+        if not deltas:
+            return []
+        event = self._first
+        if len(deltas) > 1:
+            event = _content(self._type, self._id, "".join(deltas), event.timestamp)
+        self._first = None
+        self._type = None
+        self._id = None
+        self._deltas = []
+        self._size = 0
+        return [event]
+
+
+async def compact_events(
+    events: AsyncIterable[BaseEvent],
+    max_delay: float = DEFAULT_MAX_DELAY,
+    max_size: int = DEFAULT_MAX_SIZE,
+) -> AsyncIterator[BaseEvent]:
+    """
+    Merges consecutive content deltas of a stream of events with an
+    `EventCompactor`.
+
+    A merged event is emitted at the latest `max_delay` seconds after its
+    first delta was received, even if the source is idle, so compaction
+    never adds more than `max_delay` of latency.
+    """
+    compactor = EventCompactor(max_size)
+    timed = _with_deadline(events, max_delay, lambda: compactor.pending_count)
+    try:
+        async for event in timed:
+            ready = compactor.flush() if event is _DEADLINE else compactor.add(event)
+            for item in ready:
+                yield item
+
+        for event in compactor.flush():
+            yield event
+    finally:
+        await timed.aclose()
@@ -0,0 +1,179 @@
+"""
+This module contains the run context, which cancels the work of a run as
+soon as its client disconnects.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Any, Awaitable, Callable, Coroutine, MutableMapping, Optional, Set, TypeVar
+
+from ag_ui.core.events import RunErrorEvent
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+Receive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+
+_current: contextvars.ContextVar = contextvars.ContextVar("ag_ui_run_context", default=None)
+
+RUN_ERROR_MESSAGE = "The run failed"
+RUN_ERROR_CODE = "RUN_FAILED"
+
+
+def run_error_event(error: Exception, expose_errors: bool = False) -> RunErrorEvent:
+    """
+    Returns the RUN_ERROR event sent to the client when a run raised an
+    exception. Its message is generic, so that internal details do not leak
+    to clients, unless `expose_errors` is set, in which case it is the
+    message of the exception.
+    """
+    message = str(error) if expose_errors else RUN_ERROR_MESSAGE
+    return RunErrorEvent.trusted(message=message, code=RUN_ERROR_CODE)
+
+
+class CancellationStats:
+    """
+    Counts the runs that were cancelled because their client disconnected.
+
+    The compute saved by a cancellation is estimated as the time the run
+    would have kept running, assuming it would have taken as long as the
+    average run that completed.
+    """
+
+    def __init__(self):
+        self.completed_runs = 0
+        self.cancelled_runs = 0
+        self.cancelled_tasks = 0
+        self.run_seconds = 0.0
+        self.abandoned_seconds = 0.0
+
+    @property
+    def estimated_seconds_saved(self) -> float:
+        """
+        Returns the estimated run time saved by the cancellations.
+        """
+        if not self.completed_runs:
+            return 0.0
+        average = self.run_seconds / self.completed_runs
+        return max(0.0, average * self.cancelled_runs - self.abandoned_seconds)
+
+    def _completed(self, seconds: float):
+        self.completed_runs += 1
+        self.run_seconds += seconds
+
+    def _cancelled(self, seconds: float, tasks: int):
+        self.cancelled_runs += 1
+        self.cancelled_tasks += tasks
+        self.abandoned_seconds += seconds
+
+
+cancellation_stats = CancellationStats()
+
+
+def current_run_context() -> Optional["RunContext"]:
+    """
+    Returns the context of the run the caller is part of, if any.
+    """
+    return _current.get()
+
+
+class RunContext:
+    """
+    Groups the tasks doing the work of a run and cancels them when the
+    client of the run disconnects.
+
+    Used as an async context manager around the run, it watches the ASGI
+    `receive` channel for an `http.disconnect` message. The tasks started
+    with `create_task` or `run` are cancelled as soon as it arrives, so an
+    LLM call or sleep in flight is interrupted instead of running to
+    completion. Code of the run can get its context with
+    `current_run_context`, for example to check `disconnected` or to start
+    work that should be cancelled with the run.
+
+    A disconnect only cancels the run if its work is still in progress: once
+    the tasks are done, or once `finish` was called when the response was
+    complete, the run counts as completed, and `cancelled` stays False.
+
+    Runs and cancellations are counted in `stats`, `cancellation_stats` by
+    default.
+    """
+
+    def __init__(self, receive: Receive, stats: Optional[CancellationStats] = None):
+        self.receive = receive
+        self.stats = stats if stats is not None else cancellation_stats
+        self.disconnected = False
+        self.cancelled = False
+        self.cancelled_tasks = 0
+        self._finished = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._watcher: Optional[asyncio.Task] = None
+        self._token: Optional[contextvars.Token] = None
+        self._started = 0.0
+
+    async def __aenter__(self) -> "RunContext":
+        self._started = time.monotonic()
+        self._token = _current.set(self)
+        self._watcher = asyncio.ensure_future(self._watch())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._watcher.cancel()
+        _current.reset(self._token)
+        for task in self._tasks:
+            task.cancel()
+        if not self.cancelled:
+            self.stats._completed(time.monotonic() - self._started)
+
+    def create_task(self, coro: Coroutine[Any, Any, T]) -> "asyncio.Task[T]":
+        """
+        Starts a task that is cancelled if the client disconnects.
+        """
+        task = asyncio.ensure_future(coro)
+        if self.cancelled:
+            task.cancel()
+            return task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def run(self, coro: Coroutine[Any, Any, T]) -> Optional[T]:
+        """
+        Runs a coroutine in a task that is cancelled if the client
+        disconnects, and returns its result, or None if it was cancelled.
+        """
+        task = self.create_task(coro)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if self.cancelled:
+                return None
+            raise
+
+    def finish(self):
+        """
+        Marks the response as complete once its last message is about to be
+        sent, so that a disconnect from then on does not cancel the tasks
+        that are still winding down.
+        """
+        self._finished = True
+
+    async def _watch(self):
+        while True:
+            message = await self.receive()
+            if message["type"] == "http.disconnect":
+                break
+        self.disconnected = True
+        elapsed = time.monotonic() - self._started
+        tasks = [task for task in self._tasks if not task.done()]
+        if self._finished or not tasks:
+            logger.debug("Client disconnected after the run completed")
+            return
+        self.cancelled = True
+        for task in tasks:
+            task.cancel()
+        self.cancelled_tasks = len(tasks)
+        self.stats._cancelled(elapsed, len(tasks))
+        logger.info("Client disconnected after %.3fs, cancelled %d tasks", elapsed, len(tasks))
@@ -0,0 +1,251 @@
+"""
+This module contains bounded logs of the events of a run, which allow
+clients to resume a stream after reconnecting.
+"""
+
+import asyncio
+import itertools
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import AsyncIterator, Deque, List, Tuple
+
+from ag_ui.core.events import BaseEvent, parse_event
+from ag_ui.encoder.serializers import serialize_event
+
+
+class EventLogGapError(LookupError):
+    """
+    Raised when events requested from a log are no longer retained.
+    """
+
+
+class EventLog(ABC):
+    """
+    Base class of the event logs.
+
+    Events are numbered with consecutive sequence numbers starting at 1.
+    Only the last events are retained, up to the limit of the log.
+    Subclasses store the events by implementing `first_sequence`, `_store`
+    and `_load`.
+    """
+
+    def __init__(self):
+        self.last_sequence = 0
+        self.closed = False
+        self._waiters: List[asyncio.Future] = []
+
+    @property
+    @abstractmethod
+    def first_sequence(self) -> int:
+        """
+        Returns the sequence number of the oldest retained event.
+        """
+
+    def append(self, event: BaseEvent) -> int:
+        """
+        Appends an event and returns its sequence number.
+        """
+        if self.closed:
+            raise ValueError("Cannot append to a closed event log")
+        self.last_sequence += 1
+        self._store(self.last_sequence, event)
+        self._wake()
+        return self.last_sequence
+
+    def close(self):
+        """
+        Marks the log as complete, ending all `follow` iterators once they
+        have read all events.
+        """
+        self.closed = True
+        self._wake()
+
+    def delete(self):
+        """
+        Closes the log and releases the storage of its events, which can no
+        longer be read afterwards.
+        """
+        if not self.closed:
+            self.close()
+
+    def read(self, after: int = 0) -> List[Tuple[int, BaseEvent]]:
+        """
+        Returns the retained events with a sequence number greater than
+        `after`, with their sequence numbers.
+
+        Raises EventLogGapError if some of these events are no longer retained.
+        """
+        after = max(after, 0)
+        if after >= self.last_sequence:
+            return []
+        if after < self.first_sequence - 1:
+            raise EventLogGapError(
+                f"Events after {after} are no longer retained, "
+                f"the oldest retained event is {self.first_sequence}"
+            )
+        return self._load(after)
+
+    async def follow(self, after: int = 0) -> AsyncIterator[Tuple[int, BaseEvent]]:
+        """
+        Yields the events after `after` and then the events appended later,
+        until the log is closed.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            for sequence, event in self.read(after):
+                after = sequence
+                yield sequence, event
+            if self.closed and after >= self.last_sequence:
+                return
+            if after < self.last_sequence:
+                continue
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def _wake(self):
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    @abstractmethod
+    def _store(self, sequence: int, event: BaseEvent):
+        """
+        Stores an event.
+        """
+
+    @abstractmethod
+    def _load(self, after: int) -> List[Tuple[int, BaseEvent]]:
+        """
+        Returns the retained events after `after`, which is at least
+        `first_sequence - 1`.
+        """
+
+
+class MemoryEventLog(EventLog):
+    """
+    An event log that keeps the last `max_events` events in a ring buffer.
+    """
+
+    def __init__(self, max_events: int = 10_000):
+        super().__init__()
+        self._events: Deque[BaseEvent] = deque(maxlen=max_events)
+
+    @property
+    def first_sequence(self) -> int:
+        return self.last_sequence - len(self._events) + 1
+
+    def delete(self):
+        super().delete()
+        self._events.clear()
+
+    def _store(self, sequence: int, event: BaseEvent):
+        self._events.append(event)
+
+    def _load(self, after: int) -> List[Tuple[int, BaseEvent]]:
+        start = after - self.first_sequence + 1
+        return list(zip(
+            itertools.count(after + 1),
+            itertools.islice(self._events, start, None),
+        ))
+
+
+class FileEventLog(EventLog):
+    """
+    An event log that appends events to a file, one JSON line per event
+    prefixed with its sequence number, and retains the last `max_events`.
+
+    Only the offsets of the retained events are kept in memory. Once the
+    file holds twice as many events as are retained, it is rewritten with
+    the retained events only, so it does not grow without bounds.
+
+    Appending an event only writes it to the file's buffer, so it does not
+    block the event loop on a system call. The buffer is flushed when events
+    are read from the file and by `flush`, which also syncs the file to disk
+    if `fsync` is set. The file is removed by `delete`.
+    """
+
+    def __init__(self, path: str, max_events: int = 100_000, fsync: bool = False):
+        super().__init__()
+        self.path = path
+        self.max_events = max_events
+        self.fsync = fsync
+        self._file = open(path, "wb")
+        self._offsets: Deque[int] = deque()
+        self._lines = 0
+        self._size = 0
+
+    @property
+    def first_sequence(self) -> int:
+        return self.last_sequence - len(self._offsets) + 1
+
+    def flush(self):
+        """
+        Writes the buffered events to the file.
+        """
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        super().close()
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def delete(self):
+        super().delete()
+        self._file.close()
+        self._offsets.clear()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _store(self, sequence: int, event: BaseEvent):
+        if self._lines >= 2 * self.max_events:
+            self._compact()
+        line = b"%d %s\n" % (sequence, serialize_event(event))
+        self._file.write(line)
+        self._offsets.append(self._size)
+        self._size += len(line)
+        self._lines += 1
+        if len(self._offsets) > self.max_events:
+            self._offsets.popleft()
+
+    def _load(self, after: int) -> List[Tuple[int, BaseEvent]]:
+        start = self._offsets[after - self.first_sequence + 1]
+        if not self._file.closed:
+            self._file.flush()
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            data = file.read(self._size - start)
+        events = []
+        for line in data.splitlines():
+            sequence, _, json = line.partition(b" ")
+            events.append((int(sequence), parse_event(json)))
+        return events
+
+    def _compact(self):
+        """
+        Rewrites the file with the retained events only.
+        """
+        start = self._offsets[0]
+        self._file.close()
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            data = file.read()
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, self.path)
+        self._file = open(self.path, "ab")
+        self._offsets = deque(offset - start for offset in self._offsets)
+        self._size -= start
+        self._lines = len(self._offsets)
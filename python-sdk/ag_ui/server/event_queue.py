@@ -0,0 +1,217 @@
+"""
+This module contains the bounded event queue, which decouples the agent
+producing the events of a run from the writer sending them to the client.
+"""
+
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import AsyncIterable, AsyncIterator, Deque, List, Optional, Union
+
+from ag_ui.core.events import BaseEvent, EventType
+from ag_ui.server.compact import DEFAULT_MAX_SIZE, merge_deltas
+from ag_ui.server.context import current_run_context
+
+DEFAULT_MAX_EVENTS = 1024
+
+
+class OverflowPolicy(str, Enum):
+    """
+    How an `EventQueue` reduces its backlog while the writer is behind.
+    """
+    BLOCK = "block"
+    COALESCE = "coalesce"
+    DROP_SNAPSHOTS = "drop_snapshots"
+
+
+class QueueMetrics:
+    """
+    Counters of an `EventQueue`.
+
+    The producer is paused when the queue reaches its high watermark and
+    resumed once the writer drained it to its low watermark; `pauses` and
+    `paused_seconds` tell how often and how long the client held up the
+    agent, and `peak_size` how close the backlog came to the limit.
+    """
+
+    def __init__(self):
+        self.put_events = 0
+        self.got_events = 0
+        self.coalesced_events = 0
+        self.dropped_events = 0
+        self.peak_size = 0
+        self.pauses = 0
+        self.paused_seconds = 0.0
+
+
+class EventQueue:
+    """
+    A bounded queue of events between one producer and one consumer.
+
+    `put` waits once the queue holds `max_events` events (the high
+    watermark) until the consumer got it down to `low_watermark` events,
+    which defaults to half of `max_events`. Before that, the backlog is
+    reduced according to `policy`:
+
+    - BLOCK keeps every event.
+    - COALESCE merges a content delta into the last queued event if it is a
+      delta for the same message or tool call, up to `max_merge_size`
+      characters.
+    - DROP_SNAPSHOTS drops the queued STATE_SNAPSHOT and STATE_DELTA events
+      when a STATE_SNAPSHOT is put, since the new snapshot supersedes them.
+
+    Events are only merged or dropped while they are waiting in the queue,
+    so a writer that keeps up receives every event unchanged.
+    """
+
+    def __init__(
+        self,
+        max_events: int = DEFAULT_MAX_EVENTS,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        low_watermark: Optional[int] = None,
+        max_merge_size: int = DEFAULT_MAX_SIZE,
+    ):
+        if max_events < 1:
+            raise ValueError("max_events must be at least 1")
+        self.max_events = max_events
+        self.low_watermark = max_events // 2 if low_watermark is None else min(low_watermark, max_events - 1)
+        self.policy = OverflowPolicy(policy)
+        self.max_merge_size = max_merge_size
+        self.metrics = QueueMetrics()
+        self.closed = False
+        self._events: Deque[BaseEvent] = deque()
+        self._paused = False
+        self._getters: List[asyncio.Future] = []
+        self._putters: List[asyncio.Future] = []
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    async def put(self, event: BaseEvent):
+        """
+        Adds an event, waiting while the queue is full.
+        """
+        if self.closed:
+            raise ValueError("Cannot put events into a closed queue")
+        metrics = self.metrics
+        metrics.put_events += 1
+        if self._events and self._reduce(event):
+            return
+        if self._paused or len(self._events) >= self.max_events:
+            if not self._paused:
+                self._paused = True
+                metrics.pauses += 1
+            started = time.monotonic()
+            try:
+                while self._paused and not self.closed:
+                    await self._wait(self._putters)
+            finally:
+                metrics.paused_seconds += time.monotonic() - started
+            if self.closed:
+                raise ValueError("Cannot put events into a closed queue")
+        self._events.append(event)
+        if len(self._events) > metrics.peak_size:
+            metrics.peak_size = len(self._events)
+        self._wake(self._getters)
+
+    async def get(self) -> Optional[BaseEvent]:
+        """
+        Removes and returns the next event, waiting while the queue is empty,
+        or returns None once the queue is closed and empty.
+        """
+        while not self._events:
+            if self.closed:
+                return None
+            await self._wait(self._getters)
+        event = self._events.popleft()
+        self.metrics.got_events += 1
+        if self._paused and len(self._events) <= self.low_watermark:
+            self._paused = False
+            self._wake(self._putters)
+        return event
+
+    def close(self):
+        """
+        Closes the queue. The consumer gets the remaining events, and a
+        producer waiting in `put` gets a ValueError.
+        """
+        self.closed = True
+        self._wake(self._getters)
+        self._wake(self._putters)
+
+    def __aiter__(self) -> AsyncIterator[BaseEvent]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[BaseEvent]:
+        while True:
+            event = await self.get()
+            if event is None:
+                return
+            yield event
+
+    def _reduce(self, event: BaseEvent) -> bool:
+        """
+        Applies the policy to the queued events, and returns whether the event
+        was merged into them.
+        """
+        policy = self.policy
+        if policy == OverflowPolicy.COALESCE:
+            merged = merge_deltas(self._events[-1], event, self.max_merge_size)
+            if merged is not None:
+                self._events[-1] = merged
+                self.metrics.coalesced_events += 1
+                return True
+        elif policy == OverflowPolicy.DROP_SNAPSHOTS and event.type == EventType.STATE_SNAPSHOT:
+            kept = deque(
+                queued for queued in self._events
+                if queued.type not in (EventType.STATE_SNAPSHOT, EventType.STATE_DELTA)
+            )
+            self.metrics.dropped_events += len(self._events) - len(kept)
+            self._events = kept
+            if self._paused and len(kept) <= self.low_watermark:
+                self._paused = False
+                self._wake(self._putters)
+        return False
+
+    async def _wait(self, waiters: List[asyncio.Future]):
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+
+    def _wake(self, waiters: List[asyncio.Future]):
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        waiters.clear()
+
+
+async def buffer_events(events: AsyncIterable[BaseEvent], queue: EventQueue) -> AsyncIterator[BaseEvent]:
+    """
+    Yields the events of a stream through a queue, which a background task
+    fills from the stream, so the stream is consumed while the events are
+    being written.
+
+    The task is started in the current `RunContext`, if any, and is cancelled
+    when the iteration stops. An exception raised by the stream is raised
+    once the events before it were yielded.
+    """
+    async def produce():
+        try:
+            async for event in events:
+                await queue.put(event)
+        finally:
+            queue.close()
+
+    context = current_run_context()
+    producer = context.create_task(produce()) if context is not None else asyncio.ensure_future(produce())
+    try:
+        async for event in queue:
+            yield event
+        await producer
+    finally:
+        producer.cancel()
@@ -0,0 +1,288 @@
+"""
+This module contains the run recorder, which archives the events of runs in
+append-only segment files, and the reader for the recorded runs.
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import AsyncIterable, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from ag_ui.core.events import BaseEvent, EventType, RunStartedEvent, parse_event
+from ag_ui.encoder.cache import EncodedCache
+
+# Record header: payload length, run number
+_RECORD_HEADER = struct.Struct(">II")
+
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".agui"
+_INDEX_FILE = "index.jsonl"
+
+DEFAULT_MAX_SEGMENT_SIZE = 64 * 1024 * 1024
+
+
+def _segment_name(number: int) -> str:
+    return f"{_SEGMENT_PREFIX}{number:06d}{_SEGMENT_SUFFIX}"
+
+
+def _serialize_record(event: BaseEvent) -> bytes:
+    """
+    Returns the JSON encoding of an event that is recorded, with its None
+    fields, so it is parsed back as an equal event.
+    """
+    return event.model_dump_json(by_alias=True).encode("utf-8")
+
+
+def _segment_numbers(directory: str) -> List[int]:
+    numbers = []
+    for name in os.listdir(directory):
+        if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+            numbers.append(int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)]))
+    return sorted(numbers)
+
+
+class RecordedRun(NamedTuple):
+    """
+    A run in the index of a recording: where its RUN_STARTED event is stored.
+    """
+    run: int
+    run_id: str
+    thread_id: str
+    segment: int
+    offset: int
+
+
+class RunRecorder:
+    """
+    Appends the events of runs to segment files in a directory.
+
+    Each event is stored as a record holding its JSON encoding, tagged with
+    the number of its run, so it is read back exactly as it was recorded;
+    unlike the protocol buffer encoding, JSON keeps integers and floats in
+    JSON values apart and does not drop None values. A RUN_STARTED event starts a
+    new run and adds it to the offset index, so a `RunReader` can seek to
+    it by run or thread id. A new segment is started once a segment reaches
+    `max_segment_size` bytes, and whenever a recorder is opened. If `cache`
+    is given, the events are encoded through it.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_size: int = DEFAULT_MAX_SEGMENT_SIZE,
+        fsync: bool = False,
+        cache: Optional[EncodedCache] = None,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_segment_size = max_segment_size
+        self.fsync = fsync
+        self.cache = cache
+        numbers = _segment_numbers(directory)
+        self._segment = numbers[-1] + 1 if numbers else 0
+        self._file = open(os.path.join(directory, _segment_name(self._segment)), "ab")
+        self._offset = 0
+        self._last_run = 0
+        index_path = os.path.join(directory, _INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as index:
+                for line in index:
+                    if line.strip():
+                        self._last_run = max(self._last_run, json.loads(line)["run"])
+        self._index = open(index_path, "ab")
+        self._current_run = 0
+
+    def record(self, event: BaseEvent) -> int:
+        """
+        Records an event and returns the number of its run.
+
+        Events are assigned to the run started by the last RUN_STARTED event
+        recorded with this method; use `record_stream` to record concurrent
+        runs.
+        """
+        if event.type == EventType.RUN_STARTED:
+            self._current_run = self._start_run(event)
+        self._write(self._current_run, event)
+        return self._current_run
+
+    async def record_stream(self, events: AsyncIterable[BaseEvent]) -> AsyncIterator[BaseEvent]:
+        """
+        Records the events of a stream while passing them through.
+
+        The runs of each stream are tracked separately, so several streams
+        can be recorded concurrently.
+        """
+        run = 0
+        async for event in events:
+            if event.type == EventType.RUN_STARTED:
+                run = self._start_run(event)
+            self._write(run, event)
+            yield event
+
+    def flush(self):
+        """
+        Writes buffered records to the files.
+        """
+        self._file.flush()
+        self._index.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+            os.fsync(self._index.fileno())
+
+    def close(self):
+        """
+        Flushes and closes the files.
+        """
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self) -> "RunRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _start_run(self, event: RunStartedEvent) -> int:
+        if self._offset >= self.max_segment_size:
+            self._next_segment()
+        self._last_run += 1
+        entry = {
+            "run": self._last_run,
+            "runId": event.run_id,
+            "threadId": event.thread_id,
+            "segment": self._segment,
+            "offset": self._offset,
+        }
+        self._index.write(json.dumps(entry).encode("utf-8") + b"\n")
+        return self._last_run
+
+    def _write(self, run: int, event: BaseEvent):
+        cache = self.cache
+        payload = _serialize_record(event) if cache is None else cache.get(event, "record", _serialize_record)
+        if self._offset >= self.max_segment_size and event.type != EventType.RUN_STARTED:
+            self._next_segment()
+        self._file.write(_RECORD_HEADER.pack(len(payload), run))
+        self._file.write(payload)
+        self._offset += _RECORD_HEADER.size + len(payload)
+
+    def _next_segment(self):
+        self.flush()
+        self._file.close()
+        self._segment += 1
+        self._file = open(os.path.join(self.directory, _segment_name(self._segment)), "ab")
+        self._offset = 0
+
+
+class RunReader:
+    """
+    Reads recorded runs by memory-mapping the segment files, so events are
+    decoded directly from the mapped pages without loading whole files.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._segments = _segment_numbers(directory)
+        self._maps: Dict[int, Optional[mmap.mmap]] = {}
+        self.runs: List[RecordedRun] = []
+        index_path = os.path.join(directory, _INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as index:
+                for line in index:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.runs.append(RecordedRun(
+                            entry["run"], entry["runId"], entry["threadId"], entry["segment"], entry["offset"]
+                        ))
+
+    def find(self, run_id: Optional[str] = None, thread_id: Optional[str] = None) -> List[RecordedRun]:
+        """
+        Returns the recorded runs with the given run id and/or thread id.
+        """
+        return [
+            run for run in self.runs
+            if (run_id is None or run.run_id == run_id) and (thread_id is None or run.thread_id == thread_id)
+        ]
+
+    def events(self, run_id: Optional[str] = None, thread_id: Optional[str] = None) -> Iterator[BaseEvent]:
+        """
+        Yields the events of the runs with the given run id and/or thread id,
+        run by run.
+
+        Reading a run starts at its RUN_STARTED event and ends at its
+        RUN_FINISHED or RUN_ERROR event; records of other runs stored in
+        between are skipped without being decoded.
+        """
+        for run in self.find(run_id, thread_id):
+            yield from self.run_events(run)
+
+    def run_events(self, run: RecordedRun) -> Iterator[BaseEvent]:
+        """
+        Yields the events of a recorded run.
+        """
+        for record_run, event in self._records(run.segment, run.offset, run.run):
+            yield event
+            if record_run == run.run and event.type in (EventType.RUN_FINISHED, EventType.RUN_ERROR):
+                return
+
+    def __iter__(self) -> Iterator[BaseEvent]:
+        """
+        Yields all recorded events in the order they were recorded.
+        """
+        if self._segments:
+            for _, event in self._records(self._segments[0], 0, None):
+                yield event
+
+    def close(self):
+        """
+        Unmaps the segment files.
+        """
+        for mapped in self._maps.values():
+            if mapped is not None:
+                mapped.close()
+        self._maps.clear()
+
+    def __enter__(self) -> "RunReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _map(self, segment: int) -> Optional[mmap.mmap]:
+        try:
+            return self._maps[segment]
+        except KeyError:
+            pass
+        path = os.path.join(self.directory, _segment_name(segment))
+        mapped = None
+        if os.path.getsize(path) > 0:
+            with open(path, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[segment] = mapped
+        return mapped
+
+    def _records(self, segment: int, offset: int, run: Optional[int]) -> Iterator[Tuple[int, BaseEvent]]:
+        """
+        Yields the (run number, event) records from a position to the end of
+        the recording, only decoding the events of `run` if it is given.
+        """
+        header_size = _RECORD_HEADER.size
+        for number in self._segments:
+            if number < segment:
+                continue
+            mapped = self._map(number)
+            if mapped is None:
+                continue
+            position = offset if number == segment else 0
+            end = len(mapped)
+            while position + header_size <= end:
+                length, record_run = _RECORD_HEADER.unpack_from(mapped, position)
+                start = position + header_size
+                position = start + length
+                if position > end:
+                    break  # incomplete record at the end of a segment being written
+                if run is not None and record_run != run:
+                    continue
+                event = parse_event(mapped[start:position])
+                yield record_run, event
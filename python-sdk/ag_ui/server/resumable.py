@@ -0,0 +1,141 @@
+"""
+This module contains the resumable runs, which replay the events a client
+missed when it reconnects with a Last-Event-ID header.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import AsyncIterable, AsyncIterator, Callable, Optional, Set, Tuple
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.encoder.encoder import EventEncoder
+from ag_ui.server.context import _current, run_error_event
+from ag_ui.server.event_log import EventLog, MemoryEventLog
+
+logger = logging.getLogger(__name__)
+
+
+def _memory_log(run_id: str) -> EventLog:
+    return MemoryEventLog()
+
+
+def parse_last_event_id(last_event_id: Optional[str]) -> int:
+    """
+    Returns the sequence number in a Last-Event-ID header, or 0 if there is none.
+    """
+    if not last_event_id:
+        return 0
+    try:
+        return max(int(last_event_id), 0)
+    except ValueError:
+        return 0
+
+
+class ResumableRuns:
+    """
+    Runs agents in background tasks that write their events to an event
+    log, and streams the logs to clients.
+
+    The events are sent with their sequence numbers as SSE ids. A client
+    that reconnects to a run with a Last-Event-ID header is sent the events
+    it missed from the log, followed by the events still to come, instead
+    of the agent being run again. The logs of up to `max_runs` finished
+    runs are kept; the logs are created by `log_factory` from the run id,
+    and deleted when they are evicted.
+
+    If an agent raises an exception, it is logged and the log ends with a
+    RUN_ERROR event, whose message is generic unless `expose_errors` is set,
+    see `run_error_event`.
+
+    `AGUIEndpoint` serves runs through it when it is given `runs`.
+    """
+
+    def __init__(
+        self,
+        log_factory: Callable[[str], EventLog] = _memory_log,
+        max_runs: int = 100,
+        expose_errors: bool = False,
+    ):
+        self.log_factory = log_factory
+        self.max_runs = max_runs
+        self.expose_errors = expose_errors
+        self._logs: "OrderedDict[str, EventLog]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def get_log(self, run_id: str) -> Optional[EventLog]:
+        """
+        Returns the event log of a run, if it is kept.
+        """
+        return self._logs.get(run_id)
+
+    def start(self, run_id: str, events: AsyncIterable[BaseEvent]) -> EventLog:
+        """
+        Starts writing the events of a run to a new event log in a background
+        task, and returns the log.
+        """
+        log = self.log_factory(run_id)
+        self._logs[run_id] = log
+        self._evict()
+        task = asyncio.ensure_future(self._produce(log, events))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return log
+
+    def follow(
+        self,
+        run_id: str,
+        events: Callable[[], AsyncIterable[BaseEvent]],
+        last_event_id: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[int, BaseEvent]]:
+        """
+        Yields the events of a run with their sequence numbers.
+
+        If the run is not known yet, `events` is called to start it. If it is,
+        the events after `last_event_id` are replayed from its log. Raises
+        EventLogGapError if some of these are no longer retained.
+        """
+        log = self._logs.get(run_id)
+        if log is None:
+            log = self.start(run_id, events())
+            after = 0
+        else:
+            self._logs.move_to_end(run_id)
+            after = parse_last_event_id(last_event_id)
+        return log.follow(after)
+
+    async def stream(
+        self,
+        run_id: str,
+        events: Callable[[], AsyncIterable[BaseEvent]],
+        encoder: EventEncoder,
+        last_event_id: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams the encoded events of a run, see `follow`.
+        """
+        async for sequence, event in self.follow(run_id, events, last_event_id):
+            yield encoder.encode_bytes(event, str(sequence))
+
+    async def _produce(self, log: EventLog, events: AsyncIterable[BaseEvent]):
+        # the run outlives the request that started it, so its work must not
+        # be cancelled with the request's RunContext
+        _current.set(None)
+        try:
+            async for event in events:
+                log.append(event)
+        except Exception as error:
+            logger.exception("Run failed")
+            log.append(run_error_event(error, self.expose_errors))
+        finally:
+            log.close()
+
+    def _evict(self):
+        """
+        Removes the logs of the least recently used finished runs beyond `max_runs`.
+        """
+        excess = len(self._logs) - self.max_runs
+        if excess <= 0:
+            return
+        for run_id in [run_id for run_id, log in self._logs.items() if log.closed][:excess]:
+            self._logs.pop(run_id).delete()
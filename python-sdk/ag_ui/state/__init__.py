@@ -0,0 +1,21 @@
+"""
+This module contains utilities for working with agent state.
+"""
+
+from ag_ui.state.patch import JsonPatchError, apply_patch, parse_pointer
+from ag_ui.state.diff import create_state_delta, diff_state, escape_token
+from ag_ui.state.tracked import TrackedState, TrackedDict, TrackedList
+from ag_ui.state.emitter import StateEmitter
+
+__all__ = [
+    "JsonPatchError",
+    "apply_patch",
+    "parse_pointer",
+    "create_state_delta",
+    "diff_state",
+    "escape_token",
+    "TrackedState",
+    "TrackedDict",
+    "TrackedList",
+    "StateEmitter"
+]
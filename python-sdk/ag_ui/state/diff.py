@@ -0,0 +1,106 @@
+"""
+This module contains the state differ, which computes the JSON Patch
+(RFC 6902) between two versions of a state.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from ag_ui.core.events import StateDeltaEvent
+from ag_ui.state.patch import _equal
+
+
+def escape_token(key: str) -> str:
+    """
+    Escapes a key for use as a JSON Pointer (RFC 6901) reference token.
+    """
+    if "~" in key or "/" in key:
+        return key.replace("~", "~0").replace("/", "~1")
+    return key
+
+
+def diff_state(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """
+    Returns the JSON Patch that turns `old` into `new`.
+
+    Values are compared by identity first, so subtrees shared between the
+    two versions are skipped without being traversed. This makes diffing
+    cheap when a new state is derived from the previous one by replacing
+    only the containers that changed, instead of by copying and mutating
+    the whole state. Elements added to or removed from the start or end of
+    a list are emitted as single `add` and `remove` operations.
+
+    The operations refer to values of `new` rather than copies of them.
+    """
+    operations: List[Dict[str, Any]] = []
+    _diff(old, new, "", operations)
+    return operations
+
+
+def create_state_delta(old: Any, new: Any) -> Optional[StateDeltaEvent]:
+    """
+    Returns a StateDeltaEvent that turns `old` into `new`, or None if the
+    states are equal.
+    """
+    operations = diff_state(old, new)
+    if not operations:
+        return None
+    return StateDeltaEvent.trusted(delta=operations)
+
+
+def _diff(old: Any, new: Any, path: str, operations: List[Dict[str, Any]]):
+    if old is new:
+        return
+    old_type = type(old)
+    if old_type is type(new):
+        if old_type is dict:
+            _diff_dicts(old, new, path, operations)
+            return
+        if old_type is list:
+            _diff_lists(old, new, path, operations)
+            return
+        if old == new:
+            return
+    operations.append({"op": "replace", "path": path, "value": new})
+
+
+def _diff_dicts(old: dict, new: dict, path: str, operations: List[Dict[str, Any]]):
+    shared = 0
+    for key, old_value in old.items():
+        if key in new:
+            shared += 1
+            new_value = new[key]
+            if old_value is not new_value:
+                _diff(old_value, new_value, f"{path}/{escape_token(key)}", operations)
+        else:
+            operations.append({"op": "remove", "path": f"{path}/{escape_token(key)}"})
+    if len(new) > shared:
+        for key, new_value in new.items():
+            if key not in old:
+                operations.append({"op": "add", "path": f"{path}/{escape_token(key)}", "value": new_value})
+
+
+def _diff_lists(old: list, new: list, path: str, operations: List[Dict[str, Any]]):
+    old_length = len(old)
+    new_length = len(new)
+    shortest = min(old_length, new_length)
+
+    start = 0
+    while start < shortest and _equal(old[start], new[start], strict=True):
+        start += 1
+    end = 0
+    while end < shortest - start and _equal(old[old_length - 1 - end], new[new_length - 1 - end], strict=True):
+        end += 1
+
+    old_end = old_length - end
+    new_end = new_length - end
+    common = min(old_end, new_end)
+    for index in range(start, common):
+        _diff(old[index], new[index], f"{path}/{index}", operations)
+    if old_end > common:
+        # removing from the back keeps the indices of the remaining elements valid
+        for index in range(old_end - 1, common - 1, -1):
+            operations.append({"op": "remove", "path": f"{path}/{index}"})
+    elif new_end > common:
+        for index in range(common, new_end):
+            token = "-" if end == 0 else str(index)
+            operations.append({"op": "add", "path": f"{path}/{token}", "value": new[index]})
@@ -0,0 +1,122 @@
+"""
+This module contains the state emitter, which chooses between sending a
+state snapshot and a state delta for each change of the state.
+"""
+
+from typing import Any, List, Optional, Union
+
+from pydantic_core import to_json
+
+from ag_ui.core.events import StateDeltaEvent, StateSnapshotEvent
+from ag_ui.encoder.serializers import serialize_event
+from ag_ui.state.diff import diff_state
+from ag_ui.state.tracked import TrackedState
+
+# Length of the JSON of a StateSnapshotEvent without the snapshot itself
+_SNAPSHOT_OVERHEAD = len('{"type":"STATE_SNAPSHOT","snapshot":}')
+
+# Stands for a previous state the emitter did not keep
+_UNKNOWN = object()
+
+
+class StateEmitter:
+    """
+    Emits the changes of a state as whichever of a StateSnapshotEvent and a
+    StateDeltaEvent encodes smaller.
+
+    The size of the snapshot is only measured again when the delta is at
+    least half as large as the last measured snapshot, so small deltas to a
+    large state do not cost a serialization of the whole state. A snapshot
+    is also forced after `snapshot_interval` deltas, or once the deltas sent
+    since the last snapshot add up to `max_delta_ratio` times its size, so
+    that clients joining late or reconnecting can resync cheaply.
+
+    To compute deltas, the emitter keeps the state passed to `emit` without
+    copying it, so a state must not be changed in place once it was emitted.
+    Build each version from the previous one by replacing the containers
+    that change instead, which also lets `diff_state` skip the subtrees they
+    share, or use a TrackedState to change the state in place. No state is
+    kept when the delta is known, from a TrackedState or given to `emit`; a
+    later call that needs a diff sends a snapshot instead.
+    """
+
+    def __init__(self, snapshot_interval: Optional[int] = 100, max_delta_ratio: float = 1.0):
+        self.snapshot_interval = snapshot_interval
+        self.max_delta_ratio = max_delta_ratio
+        self._state: Any = _UNKNOWN
+        self._snapshot_size: Optional[int] = None
+        self._deltas_since_snapshot = 0
+        self._delta_bytes_since_snapshot = 0
+
+    def emit(
+        self,
+        state: Union[Any, TrackedState],
+        delta: Optional[List[Any]] = None,
+    ) -> Optional[Union[StateSnapshotEvent, StateDeltaEvent]]:
+        """
+        Returns the event to send for a new version of the state, or None if
+        it did not change.
+
+        The delta is computed with `diff_state` against the state passed to
+        the previous call, unless it is given. For a TrackedState, the
+        operations it recorded are used.
+        """
+        if isinstance(state, TrackedState):
+            tracked = state.flush()
+            state = state.data
+            if delta is None:
+                delta = tracked.delta if tracked is not None else []
+            self._state = _UNKNOWN
+        elif delta is not None:
+            self._state = _UNKNOWN
+        else:
+            previous, self._state = self._state, state
+            if previous is _UNKNOWN:
+                return self._snapshot(state)
+            delta = diff_state(previous, state)
+
+        if self._snapshot_size is None:
+            return self._snapshot(state)
+        if not delta:
+            return None
+        if self._snapshot_due():
+            return self._snapshot(state)
+
+        event = StateDeltaEvent.trusted(delta=delta)
+        delta_size = len(serialize_event(event))
+        if delta_size * 2 >= self._snapshot_size:
+            self._snapshot_size = self._measure(state)
+            if self._snapshot_size <= delta_size:
+                return self._snapshot(state, self._snapshot_size)
+        self._deltas_since_snapshot += 1
+        self._delta_bytes_since_snapshot += delta_size
+        return event
+
+    def snapshot(self, state: Union[Any, TrackedState]) -> StateSnapshotEvent:
+        """
+        Returns a StateSnapshotEvent for a state, regardless of its size.
+        """
+        if isinstance(state, TrackedState):
+            state.flush()
+            state = state.data
+            self._state = _UNKNOWN
+        else:
+            self._state = state
+        return self._snapshot(state)
+
+    def _snapshot_due(self) -> bool:
+        if self.snapshot_interval is not None and self._deltas_since_snapshot >= self.snapshot_interval:
+            return True
+        return self._delta_bytes_since_snapshot >= self._snapshot_size * self.max_delta_ratio
+
+    def _snapshot(self, state: Any, size: Optional[int] = None) -> StateSnapshotEvent:
+        self._snapshot_size = self._measure(state) if size is None else size
+        self._deltas_since_snapshot = 0
+        self._delta_bytes_since_snapshot = 0
+        return StateSnapshotEvent.trusted(snapshot=state)
+
+    def _measure(self, state: Any) -> int:
+        """
+        Returns the length of the JSON encoding of a snapshot of the state.
+        """
+        return _SNAPSHOT_OVERHEAD + len(to_json(state, inf_nan_mode="null"))
@@ -0,0 +1,279 @@
+"""
+This module contains a JSON Patch (RFC 6902) implementation for applying
+the `delta` of a StateDeltaEvent.
+"""
+
+import copy
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+# Types that are immutable and can be inserted into a document without copying
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+# bool is a subclass of int, but not a number in JSON
+_NUMBER_TYPES = (int, float)
+
+# Undo log entries: (action, container, key[, value[, position]])
+_SET = 0
+_DELETE = 1
+_INSERT = 2
+_RESTORE = 3
+
+
+class JsonPatchError(ValueError):
+    """
+    Raised when a JSON Patch cannot be applied to a document.
+    """
+
+
+def parse_pointer(pointer: str) -> Tuple[str, ...]:
+    """
+    Splits a JSON Pointer (RFC 6901) into its unescaped reference tokens.
+
+    Results are cached, since patches for a state typically target the same
+    paths over and over.
+    """
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"Invalid JSON Pointer: {pointer!r}")
+    return _parse_pointer(pointer)
+
+
+@lru_cache(maxsize=1024)
+def _parse_pointer(pointer: str) -> Tuple[str, ...]:
+    if pointer == "":
+        return ()
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON Pointer: {pointer!r}")
+    if "~" not in pointer:
+        return tuple(pointer[1:].split("/"))
+    return tuple(token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/"))
+
+
+def apply_patch(document: Any, patch: List[Any], in_place: bool = False) -> Any:
+    """
+    Applies a JSON Patch to a document and returns the result.
+
+    By default the patch is applied to a copy of the document. With
+    `in_place=True` the document is modified directly, which avoids copying
+    it; if an operation fails, the operations already applied are undone
+    before `JsonPatchError` is raised, so the document is left unchanged
+    either way. The result must be used instead of the document, as the
+    patch may replace the whole document.
+    """
+    if not in_place:
+        document = copy.deepcopy(document)
+        for operation in patch:
+            document = _apply_operation(document, operation, None)
+        return document
+
+    undo: List[tuple] = []
+    try:
+        for operation in patch:
+            document = _apply_operation(document, operation, undo)
+    except BaseException:
+        _rollback(undo)
+        raise
+    return document
+
+
+def _rollback(undo: List[tuple]):
+    """
+    Reverts the changes recorded in an undo log, most recent first.
+    """
+    for entry in reversed(undo):
+        action, container, key = entry[0], entry[1], entry[2]
+        if action == _SET:
+            container[key] = entry[3]
+        elif action == _DELETE:
+            del container[key]
+        elif action == _INSERT:
+            container.insert(key, entry[3])
+        else:
+            # puts a removed key back at its position rather than at the end
+            items = list(container.items())
+            items.insert(entry[4], (key, entry[3]))
+            container.clear()
+            container.update(items)
+
+
+def _apply_operation(document: Any, operation: Any, undo: List[tuple]) -> Any:
+    """
+    Applies a single operation and returns the new root of the document.
+    """
+    try:
+        op = operation["op"]
+        path = parse_pointer(operation["path"])
+    except (KeyError, TypeError):
+        raise JsonPatchError(f"Invalid operation: {operation!r}") from None
+
+    if op == "replace":
+        return _replace(document, path, _copy(_value(operation)), undo)
+    if op == "add":
+        return _add(document, path, _copy(_value(operation)), undo)
+    if op == "remove":
+        _remove(document, path, undo)
+        return document
+    if op == "move":
+        source = parse_pointer(_from(operation))
+        if path[:len(source)] == source and path != source:
+            raise JsonPatchError(f"Cannot move a value into itself: {operation!r}")
+        if path == source:
+            return document
+        return _add(document, path, _remove(document, source, undo), undo)
+    if op == "copy":
+        value = _get(document, parse_pointer(_from(operation)))
+        return _add(document, path, copy.deepcopy(value), undo)
+    if op == "test":
+        if not _equal(_get(document, path), _value(operation)):
+            raise JsonPatchError(f"Test operation failed: {operation!r}")
+        return document
+    raise JsonPatchError(f"Unknown operation: {op!r}")
+
+
+def _equal(first: Any, second: Any, strict: bool = False) -> bool:
+    """
+    Compares two JSON values at any depth like the test operation of RFC
+    6902: numbers are equal if their values are, so `1` equals `1.0`, but
+    booleans never equal numbers. With `strict`, integers and floats are
+    told apart as well.
+    """
+    if first is second:
+        return True
+    value_type = type(first)
+    if value_type is not type(second):
+        if strict or value_type not in _NUMBER_TYPES or type(second) not in _NUMBER_TYPES:
+            return False
+        return first == second
+    if value_type is dict:
+        if len(first) != len(second):
+            return False
+        for key, value in first.items():
+            if key not in second or not _equal(value, second[key], strict):
+                return False
+        return True
+    if value_type is list:
+        if len(first) != len(second):
+            return False
+        for value, other in zip(first, second):
+            if not _equal(value, other, strict):
+                return False
+        return True
+    return first == second
+
+
+def _copy(value: Any) -> Any:
+    """
+    Copies a value taken from a patch, so the document does not share it.
+    """
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    return copy.deepcopy(value)
+
+
+def _value(operation: Any) -> Any:
+    try:
+        return operation["value"]
+    except KeyError:
+        raise JsonPatchError(f"Missing value: {operation!r}") from None
+
+
+def _from(operation: Any) -> str:
+    try:
+        return operation["from"]
+    except KeyError:
+        raise JsonPatchError(f"Missing from: {operation!r}") from None
+
+
+def _index(container: list, token: str, allow_end: bool) -> int:
+    """
+    Converts a reference token to a list index.
+    """
+    if token == "-" and allow_end:
+        return len(container)
+    # isdigit alone also accepts non-ASCII digits, which int() rejects or converts
+    if not (token.isascii() and token.isdigit()) or (token[0] == "0" and token != "0"):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {token!r}")
+    return index
+
+
+def _get(document: Any, path: Tuple[str, ...]) -> Any:
+    """
+    Returns the value a path refers to.
+    """
+    for token in path:
+        if isinstance(document, dict):
+            try:
+                document = document[token]
+            except KeyError:
+                raise JsonPatchError(f"Path not found: {token!r}") from None
+        elif isinstance(document, list):
+            document = document[_index(document, token, False)]
+        else:
+            raise JsonPatchError(f"Cannot traverse a {type(document).__name__}: {token!r}")
+    return document
+
+
+def _add(document: Any, path: Tuple[str, ...], value: Any, undo: List[tuple]) -> Any:
+    if not path:
+        return value
+    parent = _get(document, path[:-1])
+    token = path[-1]
+    if isinstance(parent, dict):
+        if undo is not None:
+            if token in parent:
+                undo.append((_SET, parent, token, parent[token]))
+            else:
+                undo.append((_DELETE, parent, token))
+        parent[token] = value
+    elif isinstance(parent, list):
+        index = _index(parent, token, True)
+        parent.insert(index, value)
+        if undo is not None:
+            undo.append((_DELETE, parent, index))
+    else:
+        raise JsonPatchError(f"Cannot add to a {type(parent).__name__}: {token!r}")
+    return document
+
+
+def _replace(document: Any, path: Tuple[str, ...], value: Any, undo: List[tuple]) -> Any:
+    if not path:
+        return value
+    parent = _get(document, path[:-1])
+    token = path[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {token!r}")
+    elif isinstance(parent, list):
+        token = _index(parent, token, False)
+    else:
+        raise JsonPatchError(f"Cannot replace in a {type(parent).__name__}: {token!r}")
+    if undo is not None:
+        undo.append((_SET, parent, token, parent[token]))
+    parent[token] = value
+    return document
+
+
+def _remove(document: Any, path: Tuple[str, ...], undo: List[tuple]) -> Any:
+    if not path:
+        raise JsonPatchError("Cannot remove the root of a document")
+    parent = _get(document, path[:-1])
+    token = path[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {token!r}")
+        if undo is not None:
+            for position, key in enumerate(parent):
+                if key == token:
+                    break
+            undo.append((_RESTORE, parent, token, parent[token], position))
+        return parent.pop(token)
+    if isinstance(parent, list):
+        index = _index(parent, token, False)
+        value = parent.pop(index)
+        if undo is not None:
+            undo.append((_INSERT, parent, index, value))
+        return value
+    raise JsonPatchError(f"Cannot remove from a {type(parent).__name__}: {token!r}")
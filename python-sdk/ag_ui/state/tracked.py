@@ -0,0 +1,342 @@
+"""
+This module contains the tracked state container, which records JSON Patch
+(RFC 6902) operations as the state is mutated.
+"""
+
+import copy
+from collections.abc import MutableMapping, MutableSequence
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from ag_ui.core.events import StateDeltaEvent, StateSnapshotEvent
+from ag_ui.state.diff import escape_token
+
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _unwrap(value: Any) -> Any:
+    """
+    Returns a value to store in the state: proxies are replaced by a copy of
+    the data they wrap, and containers are copied so that the state stays a
+    tree that is only modified through proxies.
+    """
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, _TrackedContainer):
+        value = value._data
+    return copy.deepcopy(value)
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    return copy.deepcopy(value)
+
+
+class _TrackedContainer:
+    """
+    Base class of the proxies for the dicts and lists of a tracked state.
+
+    A proxy knows its parent proxy and its key in the parent, and resolves
+    its JSON Pointer when an operation is recorded, so proxies obtained
+    before elements were inserted into or removed from a list stay valid.
+    """
+
+    __slots__ = ("_data", "_state", "_parent", "_key")
+
+    def __init__(self, data, state: "TrackedState", parent: Optional["_TrackedContainer"], key):
+        self._data = data
+        self._state = state
+        self._parent = parent
+        self._key = key
+
+    def _path(self) -> str:
+        parent = self._parent
+        if parent is None:
+            return ""
+        container = parent._data
+        key = self._key
+        if type(container) is list:
+            if not (key < len(container) and container[key] is self._data):
+                for index, value in enumerate(container):
+                    if value is self._data:
+                        self._key = key = index
+                        break
+                else:
+                    raise ValueError("Cannot modify a value that was removed from the state")
+            return f"{parent._path()}/{key}"
+        if container.get(key) is not self._data:
+            raise ValueError("Cannot modify a value that was removed from the state")
+        return f"{parent._path()}/{escape_token(key)}"
+
+    def _wrap(self, key, value):
+        if type(value) is dict:
+            return TrackedDict(value, self._state, self, key)
+        if type(value) is list:
+            return TrackedList(value, self._state, self, key)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _TrackedContainer):
+            other = other._data
+        return self._data == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+    __hash__ = None
+
+
+class TrackedDict(_TrackedContainer, MutableMapping):
+    """
+    A dict of a tracked state.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        return self._wrap(key, self._data[key])
+
+    def __setitem__(self, key: str, value: Any):
+        op = "replace" if key in self._data else "add"
+        value = _unwrap(value)
+        self._state._record(op, f"{self._path()}/{escape_token(key)}", value)
+        self._data[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self._data:
+            raise KeyError(key)
+        self._state._record("remove", f"{self._path()}/{escape_token(key)}")
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def pop(self, key: str, *default) -> Any:
+        """
+        Removes a key and returns its value.
+        """
+        if key not in self._data:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        self._state._record("remove", f"{self._path()}/{escape_token(key)}")
+        return self._data.pop(key)
+
+    def popitem(self):
+        """
+        Removes the last inserted key and returns it with its value.
+        """
+        if not self._data:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self._data))
+        return key, self.pop(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        """
+        Sets a key to a default value if it is missing, and returns its value.
+        """
+        if key not in self._data:
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        """
+        Removes all keys.
+        """
+        if self._data:
+            self._state._record("replace", self._path(), {})
+            self._data.clear()
+
+
+class TrackedList(_TrackedContainer, MutableSequence):
+    """
+    A list of a tracked state.
+    """
+
+    __slots__ = ()
+
+    def _index(self, index: int, allow_end: bool = False) -> int:
+        length = len(self._data)
+        if index < 0:
+            index += length
+        if not (0 <= index < length or (allow_end and index == length)):
+            raise IndexError("list index out of range")
+        return index
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self._data))[index]]
+        index = self._index(index)
+        return self._wrap(index, self._data[index])
+
+    def __setitem__(self, index: int, value: Any):
+        if isinstance(index, slice):
+            raise TypeError("Slice assignment is not supported by tracked lists")
+        index = self._index(index)
+        value = _unwrap(value)
+        self._state._record("replace", f"{self._path()}/{index}", value)
+        self._data[index] = value
+
+    def __delitem__(self, index: int):
+        if isinstance(index, slice):
+            raise TypeError("Slice deletion is not supported by tracked lists")
+        index = self._index(index)
+        self._state._record("remove", f"{self._path()}/{index}")
+        del self._data[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self._data)):
+            yield self[index]
+
+    def __contains__(self, value) -> bool:
+        if isinstance(value, _TrackedContainer):
+            value = value._data
+        return value in self._data
+
+    def insert(self, index: int, value: Any):
+        """
+        Inserts a value before an index.
+        """
+        length = len(self._data)
+        index = min(max(index + length if index < 0 else index, 0), length)
+        value = _unwrap(value)
+        token = "-" if index == length else str(index)
+        self._state._record("add", f"{self._path()}/{token}", value)
+        self._data.insert(index, value)
+
+    def append(self, value: Any):
+        """
+        Appends a value.
+        """
+        value = _unwrap(value)
+        self._state._record("add", f"{self._path()}/-", value)
+        self._data.append(value)
+
+    def pop(self, index: int = -1) -> Any:
+        """
+        Removes the value at an index and returns it.
+        """
+        index = self._index(index)
+        self._state._record("remove", f"{self._path()}/{index}")
+        return self._data.pop(index)
+
+    def clear(self):
+        """
+        Removes all values.
+        """
+        if self._data:
+            self._state._record("replace", self._path(), [])
+            self._data.clear()
+
+    def sort(self, **kwargs):
+        """
+        Sorts the list in place.
+        """
+        self._data.sort(**kwargs)
+        self._state._record("replace", self._path(), copy.deepcopy(self._data))
+
+    def reverse(self):
+        """
+        Reverses the list in place.
+        """
+        self._data.reverse()
+        self._state._record("replace", self._path(), copy.deepcopy(self._data))
+
+
+class TrackedState:
+    """
+    Wraps a state and records the JSON Patch operations that describe how it
+    is changed, so deltas can be emitted without copying and diffing the
+    state.
+
+    The state is read and changed through item access as usual, e.g.
+    `state["steps"][i]["status"] = "completed"`; nested dicts and lists are
+    returned as tracked proxies. `flush` returns the operations recorded
+    since the previous call as a StateDeltaEvent.
+
+    Changes made to the wrapped data directly instead of through the tracked
+    state are not recorded.
+    """
+
+    def __init__(self, data: Union[Dict[str, Any], List[Any]]):
+        if type(data) not in (dict, list):
+            raise TypeError("The tracked state must be a dict or a list")
+        self._operations: List[Dict[str, Any]] = []
+        self._root = TrackedDict(data, self, None, None) if type(data) is dict else TrackedList(data, self, None, None)
+
+    @property
+    def data(self) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Returns the wrapped data. It should not be modified directly.
+        """
+        return self._root._data
+
+    @property
+    def root(self) -> Union[TrackedDict, TrackedList]:
+        """
+        Returns the tracked proxy of the whole state.
+        """
+        return self._root
+
+    def __getitem__(self, key):
+        return self._root[key]
+
+    def __setitem__(self, key, value):
+        self._root[key] = value
+
+    def __delitem__(self, key):
+        del self._root[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._root
+
+    def __len__(self) -> int:
+        return len(self._root)
+
+    def __iter__(self):
+        return iter(self._root)
+
+    @property
+    def has_changes(self) -> bool:
+        """
+        Returns whether operations were recorded since the last flush.
+        """
+        return bool(self._operations)
+
+    def _record(self, op: str, path: str, value: Any = None):
+        operations = self._operations
+        if op == "remove":
+            operations.append({"op": op, "path": path})
+            return
+        value = _copy(value)
+        if op == "replace" and operations:
+            # repeated assignments to the same location only keep the last value
+            last = operations[-1]
+            if last["path"] == path and last["op"] != "remove":
+                last["value"] = value
+                return
+        operations.append({"op": op, "path": path, "value": value})
+
+    def flush(self) -> Optional[StateDeltaEvent]:
+        """
+        Returns the operations recorded since the last flush as a
+        StateDeltaEvent, or None if nothing changed.
+        """
+        if not self._operations:
+            return None
+        operations, self._operations = self._operations, []
+        return StateDeltaEvent.trusted(delta=operations)
+
+    def snapshot(self) -> StateSnapshotEvent:
+        """
+        Returns a StateSnapshotEvent with a copy of the state and discards
+        the operations recorded since the last flush, which it includes.
+        """
+        self._operations = []
+        return StateSnapshotEvent.trusted(snapshot=copy.deepcopy(self._root._data))
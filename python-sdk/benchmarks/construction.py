@@ -0,0 +1,52 @@
+"""
+Compares validated event construction with `trusted` construction.
+
+Run with `python -m benchmarks.construction` from the python-sdk directory.
+"""
+
+import timeit
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageContentEvent,
+    ToolCallArgsEvent,
+    MessagesSnapshotEvent,
+)
+from ag_ui.core.types import UserMessage
+
+NUMBER = 100_000
+
+MESSAGES = [UserMessage(id=str(i), role="user", content="hello " * 20) for i in range(100)]
+
+CASES = {
+    "TEXT_MESSAGE_CONTENT": (
+        lambda: TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta=" token"
+        ),
+        lambda: TextMessageContentEvent.trusted(message_id="msg_1", delta=" token"),
+    ),
+    "TOOL_CALL_ARGS": (
+        lambda: ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="call_1", delta='{"a"'),
+        lambda: ToolCallArgsEvent.trusted(tool_call_id="call_1", delta='{"a"'),
+    ),
+    "MESSAGES_SNAPSHOT (100 messages)": (
+        lambda: MessagesSnapshotEvent(type=EventType.MESSAGES_SNAPSHOT, messages=MESSAGES),
+        lambda: MessagesSnapshotEvent.trusted(messages=MESSAGES),
+    ),
+}
+
+
+def main():
+    print(f"{'event':34} {'validated':>12} {'trusted':>12} {'speedup':>8}")
+    for name, (validated, trusted) in CASES.items():
+        number = NUMBER // 100 if "SNAPSHOT" in name else NUMBER
+        baseline = min(timeit.repeat(validated, number=number, repeat=3))
+        fast = min(timeit.repeat(trusted, number=number, repeat=3))
+        print(
+            f"{name:34} {baseline / number * 1e9:>10.0f}ns {fast / number * 1e9:>10.0f}ns "
+            f"{baseline / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
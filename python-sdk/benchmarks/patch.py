@@ -0,0 +1,36 @@
+"""
+Compares applying a JSON Patch to a copy of a large state with applying it
+in place.
+
+Run with `python -m benchmarks.patch` from the python-sdk directory.
+"""
+
+import timeit
+
+from ag_ui.state import apply_patch
+
+NUMBER = 1_000
+
+STATE = {
+    "recipe": {
+        "title": "Soup",
+        "ingredients": [{"name": f"ingredient {i}", "amount": str(i)} for i in range(200)],
+        "instructions": [f"step {i}" for i in range(200)],
+    },
+    "steps": [{"description": f"step {i}", "status": "pending"} for i in range(500)],
+}
+
+PATCH = [{"op": "replace", "path": "/steps/250/status", "value": "completed"}]
+
+
+def main():
+    copied = min(timeit.repeat(lambda: apply_patch(STATE, PATCH), number=NUMBER // 10, repeat=3))
+    copied /= NUMBER // 10
+    in_place = min(timeit.repeat(lambda: apply_patch(STATE, PATCH, in_place=True), number=NUMBER, repeat=3))
+    in_place /= NUMBER
+    print(f"{'copy':10} {copied * 1e6:>10.1f}us")
+    print(f"{'in place':10} {in_place * 1e6:>10.1f}us {copied / in_place:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
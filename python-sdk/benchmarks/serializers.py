@@ -0,0 +1,57 @@
+"""
+Compares the specialized event serializers with pydantic's model_dump_json.
+
+Run with `python -m benchmarks.serializers` from the python-sdk directory.
+"""
+
+import timeit
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageContentEvent,
+    ThinkingTextMessageContentEvent,
+    ToolCallArgsEvent,
+    StateDeltaEvent,
+)
+from ag_ui.encoder.serializers import serialize_event
+
+NUMBER = 100_000
+
+EVENTS = {
+    "TEXT_MESSAGE_CONTENT": TextMessageContentEvent(
+        type=EventType.TEXT_MESSAGE_CONTENT,
+        message_id="9a2f0c1e-5b7d-4c8e-a3f6-2d1b0e9c8a7f",
+        delta=" token",
+        timestamp=1648214400000
+    ),
+    "TOOL_CALL_ARGS": ToolCallArgsEvent(
+        type=EventType.TOOL_CALL_ARGS,
+        tool_call_id="call_8b3d",
+        delta='{"city": "San'
+    ),
+    "THINKING_TEXT_MESSAGE_CONTENT": ThinkingTextMessageContentEvent(
+        type=EventType.THINKING_TEXT_MESSAGE_CONTENT,
+        delta=" hmm"
+    ),
+    "STATE_DELTA": StateDeltaEvent(
+        type=EventType.STATE_DELTA,
+        delta=[{"op": "replace", "path": "/steps/3/status", "value": "completed"}]
+    ),
+}
+
+
+def main():
+    print(f"{'event':32} {'pydantic':>12} {'specialized':>12} {'speedup':>8}")
+    for name, event in EVENTS.items():
+        baseline = timeit.timeit(
+            lambda: event.model_dump_json(by_alias=True, exclude_none=True), number=NUMBER
+        )
+        specialized = timeit.timeit(lambda: serialize_event(event), number=NUMBER)
+        print(
+            f"{name:32} {baseline / NUMBER * 1e9:>10.0f}ns {specialized / NUMBER * 1e9:>10.0f}ns "
+            f"{baseline / specialized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import os
 import sys
-import json
 import requests
+from pydantic import ValidationError
+
+from ag_ui.client import SSEParser
+from ag_ui.core import parse_event
 
 
 def main() -> None:
@@ -16,17 +19,17 @@ def main() -> None:
         ]
     }
 
+    parser = SSEParser()
     with requests.post(url, json=payload, stream=True, headers={"Accept": "text/event-stream"}) as resp:
         resp.raise_for_status()
-        for line in resp.iter_lines():
-            if not line:
-                continue
-            try:
-                data = json.loads(line.decode("utf-8"))
-            except json.JSONDecodeError:
-                print(line.decode("utf-8"))
-                continue
-            print(json.dumps(data, indent=2))
+        for chunk in resp.iter_content(chunk_size=None):
+            for message in parser.feed(chunk):
+                try:
+                    event = parse_event(message.data)
+                except ValidationError:
+                    print(message.data.decode("utf-8"))
+                    continue
+                print(event.model_dump_json(by_alias=True, exclude_none=True, indent=2))
 
 
 if __name__ == "__main__":
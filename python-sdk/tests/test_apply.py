@@ -0,0 +1,115 @@
+import unittest
+
+from ag_ui.client import EventApplier
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+)
+from ag_ui.core.types import AssistantMessage, UserMessage
+
+
+class TestEventApplier(unittest.TestCase):
+    """Test suite for the event applier"""
+
+    def test_text_messages(self):
+        """Test that text message deltas are accumulated"""
+        applier = EventApplier(messages=[UserMessage(id="u1", role="user", content="Hi")])
+        applier.apply(RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t1", run_id="r1"))
+        applier.apply(TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant"))
+        for delta in ["Hel", "lo", "!"]:
+            self.assertTrue(applier.apply(TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta=delta)))
+        self.assertFalse(applier.apply(TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m1")))
+
+        messages = applier.messages
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[1], AssistantMessage(id="m1", role="assistant", content="Hello!"))
+
+    def test_copy_on_read(self):
+        """Test that reads return copies that do not change as events are applied"""
+        applier = EventApplier()
+        applier.apply(TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant"))
+        applier.apply(TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta="a"))
+        first = applier.messages
+        applier.apply(TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta="b"))
+        self.assertEqual(first[0].content, "a")
+        self.assertEqual(applier.messages[0].content, "ab")
+
+        first[0].content = "changed"
+        self.assertEqual(applier.messages[0].content, "ab")
+
+    def test_tool_calls(self):
+        """Test that tool calls are attached to their parent message"""
+        applier = EventApplier()
+        applier.apply_events([
+            TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant"),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta="Looking"),
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m1"),
+            ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="c1",
+                               tool_call_name="search", parent_message_id="m1"),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta='{"q":'),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta='"x"}'),
+            ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id="c1"),
+            ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="c2", tool_call_name="fetch"),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c2", delta="{}"),
+        ])
+        messages = applier.messages
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[0].content, "Looking")
+        self.assertEqual(messages[0].tool_calls[0].function.arguments, '{"q":"x"}')
+        self.assertEqual(messages[1].id, "c2")
+        self.assertEqual(messages[1].tool_calls[0].function.name, "fetch")
+        self.assertEqual(messages[1].tool_calls[0].function.arguments, "{}")
+
+    def test_state(self):
+        """Test state snapshots and deltas"""
+        snapshot = {"steps": [{"status": "pending"}]}
+        applier = EventApplier(state={"old": True})
+        applier.apply(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=snapshot))
+        self.assertTrue(applier.apply(StateDeltaEvent(type=EventType.STATE_DELTA, delta=[
+            {"op": "replace", "path": "/steps/0/status", "value": "completed"},
+            {"op": "add", "path": "/steps/-", "value": {"status": "pending"}},
+        ])))
+        self.assertEqual(applier.state, {"steps": [{"status": "completed"}, {"status": "pending"}]})
+        self.assertEqual(snapshot, {"steps": [{"status": "pending"}]})
+
+    def test_failed_state_delta_keeps_state(self):
+        """Test that a delta that cannot be applied leaves the state unchanged"""
+        applier = EventApplier(state={"a": 1})
+        with self.assertLogs("ag_ui.client.apply", level="WARNING"):
+            changed = applier.apply(StateDeltaEvent(type=EventType.STATE_DELTA, delta=[
+                {"op": "replace", "path": "/a", "value": 2},
+                {"op": "remove", "path": "/missing"},
+            ]))
+        self.assertFalse(changed)
+        self.assertEqual(applier.state, {"a": 1})
+
+    def test_messages_snapshot(self):
+        """Test that a messages snapshot replaces the messages"""
+        applier = EventApplier()
+        applier.apply(TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant"))
+        applier.apply(TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta="a"))
+        snapshot = [AssistantMessage(id="m2", role="assistant", content="x")]
+        applier.apply(MessagesSnapshotEvent(type=EventType.MESSAGES_SNAPSHOT, messages=snapshot))
+        applier.apply(TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m2", delta="y"))
+        self.assertEqual([m.content for m in applier.messages], ["xy"])
+        self.assertEqual(snapshot[0].content, "x")
+
+    def test_chunk_events_are_rejected(self):
+        """Test that chunk events must be transformed first"""
+        with self.assertRaises(ValueError):
+            EventApplier().apply(TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="x"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import unittest
+
+from ag_ui.client import SSEParser
+from ag_ui.core.events import EventType, TextMessageContentEvent, RunFinishedEvent
+from ag_ui.server import AGUIResponse, CancellationStats, MemoryEventLog, ResumableRuns, agui_endpoint, with_lifecycle
+
+_INPUT = {
+    "threadId": "t1",
+    "runId": "r1",
+    "state": None,
+    "messages": [],
+    "tools": [],
+    "context": [],
+    "forwardedProps": None,
+}
+
+
+def _content_event(delta):
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta=delta)
+
+
+def _scope(accept=b"text/event-stream", headers=()):
+    return {"type": "http", "method": "POST", "headers": [(b"accept", accept), *headers]}
+
+
+async def _call(app, body=b"", disconnect=None, headers=()):
+    """Calls an ASGI app and returns the messages it sent"""
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if requests:
+            return requests.pop(0)
+        if disconnect is not None:
+            await disconnect.wait()
+        else:
+            await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(_scope(headers=headers), receive, send)
+    return sent
+
+
+def _lines(sent):
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    return [json.loads(line[len("data: "):]) for line in body.decode("utf-8").split("\n\n") if line]
+
+
+def _messages(sent):
+    parser = SSEParser()
+    return [message for item in sent[1:] for message in parser.feed(item.get("body", b""))]
+
+
+class TestASGI(unittest.TestCase):
+    """Test suite for the ASGI response and endpoint"""
+
+    def test_response_encodes_events(self):
+        """Test that the events are sent in the negotiated format with the final message"""
+        async def events():
+            yield _content_event("a")
+            yield _content_event("b")
+
+        sent = asyncio.run(_call(AGUIResponse(events())))
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), sent[0]["headers"])
+        self.assertEqual([line["delta"] for line in _lines(sent)], ["a", "b"])
+        self.assertEqual(sent[-1], {"type": "http.response.body", "body": b"", "more_body": False})
+
+    def test_lifecycle(self):
+        """Test that runs are wrapped with lifecycle events unless they send them"""
+        async def collect(events):
+            return [event.type for event in [e async for e in with_lifecycle(events, "t", "r")]]
+
+        async def content():
+            yield _content_event("a")
+
+        async def finished():
+            yield _content_event("a")
+            yield RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r")
+
+        async def failing():
+            yield _content_event("a")
+            raise RuntimeError("boom")
+
+        self.assertEqual(asyncio.run(collect(content())), [
+            EventType.RUN_STARTED, EventType.TEXT_MESSAGE_CONTENT, EventType.RUN_FINISHED,
+        ])
+        self.assertEqual(asyncio.run(collect(finished())), [
+            EventType.RUN_STARTED, EventType.TEXT_MESSAGE_CONTENT, EventType.RUN_FINISHED,
+        ])
+        with self.assertLogs("ag_ui.server.asgi", "ERROR") as logs:
+            self.assertEqual(asyncio.run(collect(failing())), [
+                EventType.RUN_STARTED, EventType.TEXT_MESSAGE_CONTENT, EventType.RUN_ERROR,
+            ])
+        self.assertIn("RuntimeError: boom", logs.output[0])
+
+    def test_lifecycle_error_message(self):
+        """Test that the message of an exception is only sent if errors are exposed"""
+        async def failing():
+            yield _content_event("a")
+            raise RuntimeError("secret")
+
+        async def last_event(expose_errors):
+            events = [event async for event in with_lifecycle(failing(), "t", "r", expose_errors)]
+            return events[-1]
+
+        with self.assertLogs("ag_ui.server.asgi", "ERROR"):
+            error = asyncio.run(last_event(False))
+            exposed = asyncio.run(last_event(True))
+        self.assertEqual((error.message, error.code), ("The run failed", "RUN_FAILED"))
+        self.assertEqual((exposed.message, exposed.code), ("secret", "RUN_FAILED"))
+
+    def test_endpoint(self):
+        """Test that the endpoint parses the input and wraps the run"""
+        @agui_endpoint
+        async def endpoint(input_data):
+            """Endpoint docstring"""
+            yield _content_event(input_data.run_id)
+
+        self.assertEqual(endpoint.__doc__, "Endpoint docstring")
+        sent = asyncio.run(_call(endpoint, json.dumps(_INPUT).encode("utf-8")))
+        lines = _lines(sent)
+        self.assertEqual([line["type"] for line in lines], ["RUN_STARTED", "TEXT_MESSAGE_CONTENT", "RUN_FINISHED"])
+        self.assertEqual(lines[0]["threadId"], "t1")
+        self.assertEqual(lines[1]["delta"], "r1")
+
+        sent = asyncio.run(_call(endpoint, b'{"threadId": "t1"}'))
+        self.assertEqual(sent[0]["status"], 422)
+        self.assertIn("detail", json.loads(sent[1]["body"]))
+
+    def test_disconnect_cancels_run(self):
+        """Test that the run is cancelled as soon as the client disconnects"""
+        cancelled = []
+
+        async def events():
+            yield _content_event("a")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            yield _content_event("b")
+
+        async def run():
+            disconnect = asyncio.Event()
+            task = asyncio.ensure_future(_call(AGUIResponse(events(), max_delay=0), disconnect=disconnect))
+            await asyncio.sleep(0.05)
+            disconnect.set()
+            return await asyncio.wait_for(task, 1)
+
+        sent = asyncio.run(run())
+        self.assertEqual(cancelled, [True])
+        self.assertEqual([line["delta"] for line in _lines(sent)], ["a"])
+        self.assertTrue(sent[-1]["more_body"])
+
+    def test_disconnect_after_response(self):
+        """Test that a client disconnecting once the response is complete does not cancel the run"""
+        stats = CancellationStats()
+
+        async def events():
+            yield _content_event("a")
+
+        async def run():
+            disconnect = asyncio.Event()
+            response = AGUIResponse(events(), max_delay=0, stats=stats)
+
+            async def receive():
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if not message.get("more_body", True):
+                    disconnect.set()
+                    await asyncio.sleep(0.01)
+
+            await response(_scope(), receive, send)
+
+        asyncio.run(run())
+        self.assertEqual(stats.completed_runs, 1)
+        self.assertEqual(stats.cancelled_runs, 0)
+
+    def test_endpoint_resumes_run(self):
+        """Test that a client reconnecting with Last-Event-ID is sent the events it missed"""
+        runs_started = []
+
+        async def run():
+            resumed = asyncio.Event()
+
+            @agui_endpoint(max_delay=0, runs=ResumableRuns())
+            async def endpoint(input_data):
+                runs_started.append(True)
+                yield _content_event("a")
+                await resumed.wait()
+                yield _content_event("b")
+                yield _content_event("c")
+
+            body = json.dumps(_INPUT).encode("utf-8")
+            disconnect = asyncio.Event()
+            task = asyncio.ensure_future(_call(endpoint, body, disconnect=disconnect))
+            await asyncio.sleep(0.05)
+            disconnect.set()
+            first = await asyncio.wait_for(task, 1)
+            resumed.set()
+            last_event_id = _messages(first)[-1].id.encode("ascii")
+            second = await asyncio.wait_for(_call(endpoint, body, headers=[(b"last-event-id", last_event_id)]), 1)
+            return _messages(first), _messages(second)
+
+        first, second = asyncio.run(run())
+        self.assertEqual(len(runs_started), 1)
+        self.assertEqual([message.id for message in first], ["1", "2"])
+        self.assertEqual([message.id for message in second], ["3", "4", "5"])
+        self.assertEqual(
+            [json.loads(message.data)["type"] for message in second],
+            ["TEXT_MESSAGE_CONTENT", "TEXT_MESSAGE_CONTENT", "RUN_FINISHED"],
+        )
+
+    def test_resume_after_events_expired(self):
+        """Test that resuming from events no longer retained sends a RUN_ERROR event"""
+        async def events():
+            for delta in "abcd":
+                yield _content_event(delta)
+
+        async def run():
+            runs = ResumableRuns(log_factory=lambda run_id: MemoryEventLog(max_events=2))
+            await _call(AGUIResponse(events(), thread_id="t1", run_id="r1", runs=runs))
+            return await _call(AGUIResponse(events(), thread_id="t1", run_id="r1", runs=runs, last_event_id="1"))
+
+        with self.assertLogs("ag_ui.server.asgi", level="INFO"):
+            lines = _lines(asyncio.run(run()))
+        self.assertEqual([line["type"] for line in lines], ["RUN_ERROR"])
+        self.assertEqual(lines[0]["code"], "RESUME_FAILED")
+
+
+if __name__ == "__main__":
+    unittest.main()
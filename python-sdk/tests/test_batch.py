@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+
+from ag_ui.core.events import EventType, TextMessageContentEvent
+from ag_ui.encoder import EventEncoder, encode_batched
+
+
+def _content_event(delta):
+    return TextMessageContentEvent(
+        type=EventType.TEXT_MESSAGE_CONTENT,
+        message_id="msg_1",
+        delta=delta
+    )
+
+
+class TestBatchEncoding(unittest.TestCase):
+    """Test suite for encode_many and encode_batched"""
+
+    def test_encode_many(self):
+        """Test that encode_many concatenates encoded events"""
+        encoder = EventEncoder()
+        events = [_content_event(delta) for delta in "abc"]
+        self.assertEqual(
+            encoder.encode_many(events),
+            b"".join(encoder.encode_bytes(event) for event in events)
+        )
+
+    def _collect(self, source, **kwargs):
+        async def collect():
+            return [chunk async for chunk in encode_batched(EventEncoder(), source(), **kwargs)]
+        return asyncio.run(collect())
+
+    def test_coalesces_fast_events(self):
+        """Test that events arriving within the window share a chunk"""
+        events = [_content_event(delta) for delta in "abcde"]
+
+        async def source():
+            for event in events:
+                yield event
+
+        chunks = self._collect(source, max_delay=1.0)
+        self.assertEqual(chunks, [EventEncoder().encode_many(events)])
+
+    def test_flushes_at_size_limit(self):
+        """Test that a chunk is emitted once it reaches max_bytes"""
+        encoder = EventEncoder()
+        events = [_content_event(delta) for delta in "abcd"]
+        size = len(encoder.encode_bytes(events[0]))
+
+        async def source():
+            for event in events:
+                yield event
+
+        chunks = self._collect(source, max_delay=1.0, max_bytes=2 * size)
+        self.assertEqual(chunks, [encoder.encode_many(events[:2]), encoder.encode_many(events[2:])])
+
+    def test_flushes_when_window_elapses(self):
+        """Test that an idle source does not hold back buffered events"""
+        encoder = EventEncoder()
+        first, second = _content_event("a"), _content_event("b")
+        received = []
+
+        async def source():
+            yield first
+            await asyncio.sleep(0.2)
+            # the first event was flushed while the source was sleeping
+            received.append(len(chunks))
+            yield second
+
+        chunks = []
+
+        async def collect():
+            async for chunk in encode_batched(encoder, source(), max_delay=0.01):
+                chunks.append(chunk)
+
+        asyncio.run(collect())
+        self.assertEqual(received, [1])
+        self.assertEqual(chunks, [encoder.encode_bytes(first), encoder.encode_bytes(second)])
+
+    def test_propagates_source_errors(self):
+        """Test that errors raised by the source are propagated"""
+        async def source():
+            yield _content_event("a")
+            raise RuntimeError("agent failed")
+
+        with self.assertRaises(RuntimeError):
+            self._collect(source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import unittest
+
+from ag_ui.client import EventApplier, transform_chunks, verify_events
+from ag_ui.core.events import (
+    EventType,
+    RunFinishedEvent,
+    RunStartedEvent,
+    StateSnapshotEvent,
+    StepFinishedEvent,
+    StepStartedEvent,
+    TextMessageChunkEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ThinkingEndEvent,
+    ThinkingStartEvent,
+    parse_event,
+)
+from ag_ui.server import Broadcaster, SlowSubscriberPolicy
+
+
+def _run():
+    return [
+        RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r"),
+        StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"count": 1}),
+        TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m", role="assistant"),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="Hi"),
+        TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m"),
+        RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"),
+    ]
+
+
+def _types(chunk):
+    return [json.loads(line[len("data: "):])["type"] for line in chunk.decode("utf-8").split("\n\n") if line]
+
+
+async def _read(subscription):
+    return b"".join([chunk async for chunk in subscription])
+
+
+class TestBroadcaster(unittest.TestCase):
+    """Test suite for the broadcaster"""
+
+    def test_encodes_once_per_format(self):
+        """Test that subscribers of one format share the encoded bytes"""
+        broadcaster = Broadcaster()
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+        ndjson = broadcaster.subscribe("application/x-ndjson")
+        self.assertEqual(broadcaster.subscriber_count, 3)
+        events = _run()
+        broadcaster.publish(events[0])
+        self.assertIs(first._chunks[0], second._chunks[0])
+        for event in events[1:]:
+            broadcaster.publish(event)
+        broadcaster.close()
+
+        chunks = asyncio.run(_read(first))
+        self.assertEqual(chunks, asyncio.run(_read(second)))
+        self.assertEqual(_types(chunks), [event.type.value for event in events])
+        lines = asyncio.run(_read(ndjson)).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["type"] for line in lines], [event.type.value for event in events])
+
+    def test_late_subscriber(self):
+        """Test that a subscriber joining during the run is sent the snapshots first"""
+        broadcaster = Broadcaster()
+        for event in _run()[:5]:
+            broadcaster.publish(event)
+        late = broadcaster.subscribe()
+        broadcaster.publish(_run()[5])
+        broadcaster.close()
+        self.assertEqual(_types(asyncio.run(_read(late))), [
+            "RUN_STARTED", "MESSAGES_SNAPSHOT", "STATE_SNAPSHOT", "RUN_FINISHED",
+        ])
+
+    def test_slow_subscribers(self):
+        """Test that lagging subscribers are resynced or disconnected"""
+        resynced = Broadcaster(max_lag=2)
+        subscription = resynced.subscribe()
+        for event in _run()[:4]:
+            resynced.publish(event)
+        self.assertEqual(subscription.resyncs, 1)
+        # held back until the open message ends
+        self.assertEqual(len(subscription), 0)
+        resynced.publish(_run()[4])
+        self.assertEqual(_types(subscription._chunks[0]), ["RUN_STARTED", "MESSAGES_SNAPSHOT", "STATE_SNAPSHOT"])
+
+        disconnecting = Broadcaster(max_lag=2, policy="disconnect")
+        self.assertEqual(disconnecting.policy, SlowSubscriberPolicy.DISCONNECT)
+        slow = disconnecting.subscribe()
+        fast = disconnecting.subscribe()
+        for event in _run():
+            disconnecting.publish(event)
+            if len(fast) == 2:
+                fast._chunks.clear()
+        self.assertTrue(slow.lagged)
+        self.assertEqual(asyncio.run(_read(slow)), b"")
+        self.assertFalse(fast.lagged)
+        self.assertEqual(disconnecting.subscriber_count, 1)
+        self.assertEqual(disconnecting.disconnected_subscribers, 1)
+
+    def test_resync_keeps_protocol_order(self):
+        """Test that subscribers resynced or joining mid-message read a valid event sequence"""
+        events = [
+            RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r"),
+            StepStartedEvent(type=EventType.STEP_STARTED, step_name="answer"),
+            ThinkingStartEvent(type=EventType.THINKING_START, title="plan"),
+            TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant"),
+            *[
+                TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta=delta)
+                for delta in "abcdef"
+            ],
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m1"),
+            ThinkingEndEvent(type=EventType.THINKING_END),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m2", delta="x"),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m2", delta="y"),
+            StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"count": 1}),
+            StepFinishedEvent(type=EventType.STEP_FINISHED, step_name="answer"),
+            RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"),
+        ]
+
+        async def run():
+            broadcaster = Broadcaster(max_lag=2)
+            lagging = broadcaster.subscribe()
+            chunks = []
+            late = None
+            for index, event in enumerate(events):
+                broadcaster.publish(event)
+                if index == 3:
+                    # reads the start of the run, then falls behind within the message
+                    chunks.append(await lagging.__anext__())
+                    late = broadcaster.subscribe()
+            broadcaster.close()
+            chunks.append(await _read(lagging))
+            return broadcaster, b"".join(chunks), await _read(late)
+
+        broadcaster, lagging, late = asyncio.run(run())
+        self.assertGreater(broadcaster.resyncs, 0)
+        for chunk in (lagging, late):
+            received = [parse_event(line[len("data: "):]) for line in chunk.decode("utf-8").split("\n\n") if line]
+            self.assertEqual(sum(event.type == EventType.RUN_STARTED for event in received), 1)
+            list(verify_events(received))
+            applier = EventApplier()
+            applier.apply_events(transform_chunks(received))
+            self.assertEqual(applier.messages, broadcaster._applier.messages)
+            self.assertEqual(applier.state, {"count": 1})
+
+    def test_relay(self):
+        """Test that a stream is passed through while it is published"""
+        async def events():
+            for event in _run():
+                yield event
+
+        async def run():
+            broadcaster = Broadcaster()
+            subscription = broadcaster.subscribe()
+            reader = asyncio.ensure_future(_read(subscription))
+            relayed = [event async for event in broadcaster.relay(events())]
+            return relayed, await reader
+
+        relayed, chunks = asyncio.run(run())
+        self.assertEqual(relayed, _run())
+        self.assertEqual(_types(chunks), [event.type.value for event in _run()])
+
+
+if __name__ == "__main__":
+    unittest.main()
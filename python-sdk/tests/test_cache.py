@@ -0,0 +1,58 @@
+import gc
+import unittest
+
+from ag_ui.core.events import EventType, StateSnapshotEvent, TextMessageContentEvent
+from ag_ui.encoder import AGUI_MEDIA_TYPE, EncodedCache, EventEncoder
+
+
+def _content_event(delta):
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta=delta)
+
+
+class TestEncodedCache(unittest.TestCase):
+    """Test suite for the cache of encoded events"""
+
+    def test_shared_between_encoders(self):
+        """Test that encoders sharing a cache encode an event once per format"""
+        cache = EncodedCache()
+        event = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"items": list(range(100))})
+        first = EventEncoder(cache=cache)
+        second = EventEncoder(cache=cache)
+        proto = EventEncoder(AGUI_MEDIA_TYPE, cache=cache)
+
+        data = first.encode_bytes(event)
+        self.assertEqual(data, EventEncoder().encode_bytes(event))
+        self.assertIs(second.encode_bytes(event), data)
+        self.assertEqual(second.encode_many([event, event]), data * 2)
+        buffer = bytearray(b"x")
+        self.assertEqual(second.encode_into(event, buffer), len(data))
+        self.assertEqual(bytes(buffer), b"x" + data)
+        self.assertEqual(proto.encode_bytes(event), EventEncoder(AGUI_MEDIA_TYPE).encode_bytes(event))
+        self.assertEqual(first.encode_bytes(event, "7"), EventEncoder().encode_bytes(event, "7"))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 4)
+
+    def test_entries_are_weak_and_bounded(self):
+        """Test that entries are removed with their event and beyond the limit"""
+        cache = EncodedCache(max_events=2)
+        encoder = EventEncoder(cache=cache)
+        event = _content_event("a")
+        encoder.encode_bytes(event)
+        self.assertEqual(len(cache), 1)
+        del event
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+
+        events = [_content_event(str(i)) for i in range(3)]
+        for event in events:
+            encoder.encode_bytes(event)
+        self.assertEqual(len(cache), 2)
+        # the evicted event is encoded again
+        misses = cache.misses
+        self.assertEqual(encoder.encode_bytes(events[0]), EventEncoder().encode_bytes(events[0]))
+        self.assertEqual(cache.misses, misses + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
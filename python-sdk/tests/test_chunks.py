@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+
+from ag_ui.client import EventApplier, transform_chunks, transform_chunk_stream, verify_events
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    RunFinishedEvent,
+    TextMessageChunkEvent,
+    ToolCallChunkEvent,
+    RawEvent,
+    StateSnapshotEvent,
+)
+
+
+def _types(events):
+    return [event.type for event in events]
+
+
+class TestChunkTransform(unittest.TestCase):
+    """Test suite for the chunk transform"""
+
+    def test_text_message_chunks(self):
+        """Test expanding text message chunks"""
+        events = list(transform_chunks([
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m1", delta="Hel"),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="lo"),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m1", delta=""),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m2", delta="Bye"),
+        ]))
+        self.assertEqual(_types(events), [
+            EventType.TEXT_MESSAGE_START,
+            EventType.TEXT_MESSAGE_CONTENT,
+            EventType.TEXT_MESSAGE_CONTENT,
+            EventType.TEXT_MESSAGE_END,
+            EventType.TEXT_MESSAGE_START,
+            EventType.TEXT_MESSAGE_CONTENT,
+            EventType.TEXT_MESSAGE_END,
+        ])
+        self.assertEqual(events[0].message_id, "m1")
+        self.assertEqual(events[0].role, "assistant")
+        self.assertEqual(events[2].delta, "lo")
+        self.assertEqual(events[2].message_id, "m1")
+        self.assertEqual(events[3].message_id, "m1")
+        self.assertEqual(events[6].message_id, "m2")
+
+    def test_tool_call_chunks(self):
+        """Test expanding tool call chunks and ending them on other events"""
+        events = list(transform_chunks([
+            RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t1", run_id="r1"),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="c1",
+                               tool_call_name="search", parent_message_id="m1", delta='{"q"'),
+            RawEvent(type=EventType.RAW, event={}),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, delta=':"x"}'),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m2", delta="Done"),
+            StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={}),
+            RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t1", run_id="r1"),
+        ]))
+        self.assertEqual(_types(events), [
+            EventType.RUN_STARTED,
+            EventType.TOOL_CALL_START,
+            EventType.TOOL_CALL_ARGS,
+            EventType.RAW,
+            EventType.TOOL_CALL_ARGS,
+            EventType.TOOL_CALL_END,
+            EventType.TEXT_MESSAGE_START,
+            EventType.TEXT_MESSAGE_CONTENT,
+            EventType.TEXT_MESSAGE_END,
+            EventType.STATE_SNAPSHOT,
+            EventType.RUN_FINISHED,
+        ])
+        self.assertEqual(events[1].parent_message_id, "m1")
+
+        # the expanded stream is a valid sequence that can be applied
+        applier = EventApplier().apply_events(verify_events(events))
+        self.assertEqual(applier.messages[0].tool_calls[0].function.arguments, '{"q":"x"}')
+        self.assertEqual(applier.messages[1].content, "Done")
+
+    def test_first_chunk_needs_ids(self):
+        """Test that the first chunk must carry an id and a tool name"""
+        invalid = [
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="x"),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, delta="x"),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="c1", delta="x"),
+        ]
+        for event in invalid:
+            with self.subTest(event=event):
+                with self.assertRaises(ValueError):
+                    list(transform_chunks([event]))
+
+    def test_async_stream(self):
+        """Test expanding chunks from an async iterable"""
+        async def produce():
+            yield TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m1", delta="a")
+
+        async def consume():
+            return [event async for event in transform_chunk_stream(produce())]
+
+        self.assertEqual(_types(asyncio.run(consume())), [
+            EventType.TEXT_MESSAGE_START,
+            EventType.TEXT_MESSAGE_CONTENT,
+            EventType.TEXT_MESSAGE_END,
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallArgsEvent,
+    ThinkingTextMessageContentEvent,
+)
+from ag_ui.server import EventCompactor, compact_events
+
+
+def _content_event(delta, message_id="msg_1", **kwargs):
+    return TextMessageContentEvent(
+        type=EventType.TEXT_MESSAGE_CONTENT,
+        message_id=message_id,
+        delta=delta,
+        **kwargs
+    )
+
+
+class TestEventCompactor(unittest.TestCase):
+    """Test suite for the compaction of content deltas"""
+
+    def _compact(self, events, **kwargs):
+        compactor = EventCompactor(**kwargs)
+        result = []
+        for event in events:
+            result.extend(compactor.add(event))
+        result.extend(compactor.flush())
+        return result
+
+    def test_merges_deltas_for_the_same_id(self):
+        """Test that consecutive deltas for one message are merged"""
+        events = self._compact([
+            _content_event("Hel", timestamp=1),
+            _content_event("lo", timestamp=2),
+            _content_event("!", message_id="msg_2"),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta='{"a"'),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta=":1}"),
+            ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="hm"),
+            ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="m"),
+        ])
+        self.assertEqual(events, [
+            _content_event("Hello", timestamp=1),
+            _content_event("!", message_id="msg_2"),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta='{"a":1}'),
+            ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="hmm"),
+        ])
+
+    def test_keeps_order_with_other_events(self):
+        """Test that other events are not merged across"""
+        end = TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="msg_1")
+        raw = _content_event("c", raw_event={"token": "c"})
+        events = self._compact([_content_event("a"), _content_event("b"), raw, _content_event("d"), end])
+        self.assertEqual(events, [_content_event("ab"), raw, _content_event("d"), end])
+
+    def test_max_size(self):
+        """Test that a merged event is emitted once it reaches max_size"""
+        events = self._compact([_content_event(delta) for delta in ["ab", "cd", "e", "fgh"]], max_size=3)
+        self.assertEqual([event.delta for event in events], ["abcd", "efgh"])
+
+    def test_async_stream_respects_max_delay(self):
+        """Test that a merged event is not held back longer than max_delay"""
+        async def source():
+            yield _content_event("a")
+            yield _content_event("b")
+            await asyncio.sleep(0.2)
+            yield _content_event("c")
+
+        async def collect():
+            return [event.delta async for event in compact_events(source(), max_delay=0.05)]
+
+        self.assertEqual(asyncio.run(collect()), ["ab", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+
+from ag_ui.server import CancellationStats, RunContext, current_run_context
+
+
+def _receiver(disconnect):
+    async def receive():
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+    return receive
+
+
+class TestRunContext(unittest.TestCase):
+    """Test suite for the disconnect-aware run context"""
+
+    def test_disconnect_cancels_tasks(self):
+        """Test that the tasks of a run are cancelled when the client disconnects"""
+        stats = CancellationStats()
+        cancelled = []
+
+        async def work(name):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+
+        async def agent():
+            context = current_run_context()
+            context.create_task(work("background"))
+            await work("agent")
+            return "done"
+
+        async def run():
+            disconnect = asyncio.Event()
+            async with RunContext(_receiver(disconnect), stats) as context:
+                asyncio.get_running_loop().call_later(0.05, disconnect.set)
+                result = await asyncio.wait_for(context.run(agent()), 1)
+            await asyncio.sleep(0)
+            return context, result
+
+        context, result = asyncio.run(run())
+        self.assertIsNone(result)
+        self.assertTrue(context.disconnected)
+        self.assertEqual(context.cancelled_tasks, 2)
+        self.assertEqual(sorted(cancelled), ["agent", "background"])
+        self.assertEqual(stats.cancelled_runs, 1)
+        self.assertEqual(stats.cancelled_tasks, 2)
+        self.assertIsNone(current_run_context())
+
+    def test_completed_run(self):
+        """Test that completed runs are counted and used to estimate the time saved"""
+        stats = CancellationStats()
+
+        async def run():
+            async with RunContext(_receiver(asyncio.Event()), stats) as context:
+                self.assertIs(current_run_context(), context)
+                return await context.run(asyncio.sleep(0, "done"))
+
+        self.assertEqual(asyncio.run(run()), "done")
+        self.assertEqual(stats.completed_runs, 1)
+        self.assertEqual(stats.cancelled_runs, 0)
+        stats.run_seconds = 10.0
+        stats._cancelled(4.0, 1)
+        self.assertEqual(stats.estimated_seconds_saved, 6.0)
+
+    def test_disconnect_after_completion(self):
+        """Test that a disconnect after the run completed is not counted as a cancellation"""
+        stats = CancellationStats()
+
+        async def run():
+            disconnect = asyncio.Event()
+            async with RunContext(_receiver(disconnect), stats) as context:
+                result = await context.run(asyncio.sleep(0, "done"))
+                disconnect.set()
+                await asyncio.sleep(0.01)
+            return context, result
+
+        context, result = asyncio.run(run())
+        self.assertEqual(result, "done")
+        self.assertTrue(context.disconnected)
+        self.assertFalse(context.cancelled)
+        self.assertEqual(stats.completed_runs, 1)
+        self.assertEqual(stats.cancelled_runs, 0)
+
+    def test_disconnect_after_finish(self):
+        """Test that a disconnect after the response is complete does not cancel the run"""
+        stats = CancellationStats()
+
+        async def agent(disconnect):
+            context = current_run_context()
+            context.finish()
+            disconnect.set()
+            await asyncio.sleep(0.01)
+            return "done"
+
+        async def run():
+            disconnect = asyncio.Event()
+            async with RunContext(_receiver(disconnect), stats) as context:
+                return await context.run(agent(disconnect))
+
+        self.assertEqual(asyncio.run(run()), "done")
+        self.assertEqual(stats.completed_runs, 1)
+        self.assertEqual(stats.cancelled_runs, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
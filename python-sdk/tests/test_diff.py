@@ -0,0 +1,125 @@
+import copy
+import random
+import unittest
+
+from ag_ui.core.events import EventType
+from ag_ui.state import apply_patch, create_state_delta, diff_state
+
+
+class TestDiffState(unittest.TestCase):
+    """Test suite for the state differ"""
+
+    def assertRoundTrip(self, old, new):
+        """Asserts that the patch turns old into new"""
+        patch = diff_state(old, new)
+        self.assertEqual(apply_patch(old, patch), new)
+        return patch
+
+    def test_equal_states(self):
+        """Test that equal states produce an empty patch"""
+        state = {"a": [1, {"b": 2}]}
+        self.assertEqual(diff_state(state, state), [])
+        self.assertEqual(diff_state(state, copy.deepcopy(state)), [])
+        self.assertIsNone(create_state_delta(state, copy.deepcopy(state)))
+
+    def test_dict_changes(self):
+        """Test adding, removing and replacing keys"""
+        patch = self.assertRoundTrip(
+            {"keep": 1, "change": 1, "remove": 1, "a/b": {"~": 1}},
+            {"keep": 1, "change": 2, "add": 1, "a/b": {"~": 2}},
+        )
+        self.assertEqual(patch, [
+            {"op": "replace", "path": "/change", "value": 2},
+            {"op": "remove", "path": "/remove"},
+            {"op": "replace", "path": "/a~1b/~0", "value": 2},
+            {"op": "add", "path": "/add", "value": 1},
+        ])
+
+    def test_type_changes(self):
+        """Test that values of different JSON types are replaced"""
+        self.assertEqual(diff_state({"a": 1}, {"a": True}), [{"op": "replace", "path": "/a", "value": True}])
+        self.assertEqual(diff_state({"a": [1]}, {"a": {"0": 1}}), [
+            {"op": "replace", "path": "/a", "value": {"0": 1}},
+        ])
+        self.assertEqual(diff_state(1, 2), [{"op": "replace", "path": "", "value": 2}])
+
+    def test_nested_type_changes(self):
+        """Test that type changes nested in lists are found"""
+        self.assertEqual(diff_state({"a": [{"v": 1}]}, {"a": [{"v": True}]}), [
+            {"op": "replace", "path": "/a/0/v", "value": True},
+        ])
+        self.assertEqual(diff_state([[0]], [[False]]), [{"op": "replace", "path": "/0/0", "value": False}])
+        self.assertEqual(diff_state([1, [2], 3], [1, [2.0], 3]), [{"op": "replace", "path": "/1/0", "value": 2.0}])
+
+    def test_list_append_and_remove(self):
+        """Test that list appends and removals produce single operations"""
+        self.assertEqual(self.assertRoundTrip([1, 2], [1, 2, 3, 4]), [
+            {"op": "add", "path": "/-", "value": 3},
+            {"op": "add", "path": "/-", "value": 4},
+        ])
+        self.assertEqual(self.assertRoundTrip([1, 2, 3], [0, 1, 2, 3]), [
+            {"op": "add", "path": "/0", "value": 0},
+        ])
+        self.assertEqual(self.assertRoundTrip([1, 2, 3, 4], [1, 4]), [
+            {"op": "remove", "path": "/2"},
+            {"op": "remove", "path": "/1"},
+        ])
+
+    def test_nested_list_element_change(self):
+        """Test that a changed element in a list of objects is patched in place"""
+        steps = [{"description": f"Step {i}", "status": "pending"} for i in range(10)]
+        new_steps = list(steps)
+        new_steps[4] = {**steps[4], "status": "completed"}
+        patch = self.assertRoundTrip({"steps": steps}, {"steps": new_steps})
+        self.assertEqual(patch, [{"op": "replace", "path": "/steps/4/status", "value": "completed"}])
+
+    def test_shared_subtrees_are_skipped(self):
+        """Test that subtrees shared by identity are not traversed"""
+        class Opaque:
+            def __eq__(self, other):
+                raise AssertionError("shared subtree was compared")
+
+        shared = {"big": [Opaque()]}
+        self.assertEqual(diff_state({"shared": shared, "a": 1}, {"shared": shared, "a": 2}), [
+            {"op": "replace", "path": "/a", "value": 2},
+        ])
+
+    def test_random_round_trips(self):
+        """Test that random changes to nested states round-trip"""
+        generator = random.Random(0)
+
+        def mutate(value, depth=0):
+            if isinstance(value, dict) and depth < 3:
+                value = dict(value)
+                for key in list(value):
+                    if generator.random() < 0.2:
+                        del value[key]
+                    elif generator.random() < 0.4:
+                        value[key] = mutate(value[key], depth + 1)
+                if generator.random() < 0.3:
+                    value[f"k{generator.randint(0, 9)}"] = generator.randint(0, 9)
+                return value
+            if isinstance(value, list) and depth < 3:
+                value = [mutate(item, depth + 1) if generator.random() < 0.3 else item for item in value]
+                if value and generator.random() < 0.3:
+                    del value[generator.randrange(len(value))]
+                if generator.random() < 0.3:
+                    value.insert(generator.randint(0, len(value)), generator.randint(0, 9))
+                return value
+            return generator.choice([value, generator.randint(0, 9), "x", None, [1], {"n": 1}])
+
+        state = {"a": [1, 2, {"b": [3, 4]}], "c": {"d": {"e": 1}}, "f": "g"}
+        for _ in range(200):
+            new = mutate(state)
+            self.assertRoundTrip(state, new)
+            state = new
+
+    def test_create_state_delta(self):
+        """Test that a StateDeltaEvent is created for changed states"""
+        event = create_state_delta({"a": 1}, {"a": 2})
+        self.assertEqual(event.type, EventType.STATE_DELTA)
+        self.assertEqual(event.delta, [{"op": "replace", "path": "/a", "value": 2}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+
+from ag_ui.core.events import EventType
+from ag_ui.state import StateEmitter, TrackedState
+
+
+def _large_state():
+    return {"steps": [{"description": f"Step {i}", "status": "pending"} for i in range(50)]}
+
+
+class TestStateEmitter(unittest.TestCase):
+    """Test suite for the snapshot-vs-delta state emitter"""
+
+    def test_first_emit_is_a_snapshot(self):
+        """Test that the first state is sent as a snapshot"""
+        state = _large_state()
+        event = StateEmitter().emit(state)
+        self.assertEqual(event.type, EventType.STATE_SNAPSHOT)
+        self.assertIs(event.snapshot, state)
+
+    def test_small_change_is_a_delta(self):
+        """Test that a small change to a large state is sent as a delta"""
+        emitter = StateEmitter()
+        state = _large_state()
+        emitter.emit(state)
+        steps = list(state["steps"])
+        steps[3] = {**steps[3], "status": "completed"}
+        event = emitter.emit({**state, "steps": steps})
+        self.assertEqual(event.type, EventType.STATE_DELTA)
+        self.assertEqual(event.delta, [{"op": "replace", "path": "/steps/3/status", "value": "completed"}])
+
+    def test_unchanged_state(self):
+        """Test that nothing is sent if the state did not change"""
+        emitter = StateEmitter()
+        state = _large_state()
+        emitter.emit(state)
+        self.assertIsNone(emitter.emit(state))
+
+    def test_large_change_is_a_snapshot(self):
+        """Test that a change larger than the state is sent as a snapshot"""
+        emitter = StateEmitter()
+        emitter.emit({"a": list(range(100))})
+        event = emitter.emit({"a": list(range(100, 200))})
+        self.assertEqual(event.type, EventType.STATE_SNAPSHOT)
+        self.assertEqual(event.snapshot, {"a": list(range(100, 200))})
+
+    def test_snapshot_interval(self):
+        """Test that a snapshot is forced after a number of deltas"""
+        emitter = StateEmitter(snapshot_interval=3)
+        state = TrackedState(_large_state())
+        types = [emitter.emit(state).type]
+        for i in range(7):
+            state["steps"][i]["status"] = "completed"
+            types.append(emitter.emit(state).type)
+        self.assertEqual(types, [
+            EventType.STATE_SNAPSHOT,
+            EventType.STATE_DELTA,
+            EventType.STATE_DELTA,
+            EventType.STATE_DELTA,
+            EventType.STATE_SNAPSHOT,
+            EventType.STATE_DELTA,
+            EventType.STATE_DELTA,
+            EventType.STATE_DELTA,
+        ])
+        self.assertFalse(state.has_changes)
+
+    def test_delta_bytes_force_snapshot(self):
+        """Test that a snapshot is forced once the deltas add up to its size"""
+        emitter = StateEmitter(snapshot_interval=None, max_delta_ratio=1.0)
+        state = TrackedState({"count": 0, "padding": "x" * 200})
+        emitter.emit(state)
+        types = []
+        for i in range(1, 10):
+            state["count"] = i
+            types.append(emitter.emit(state).type)
+        self.assertIn(EventType.STATE_SNAPSHOT, types)
+        self.assertEqual(types[0], EventType.STATE_DELTA)
+
+    def test_new_versions_share_unchanged_subtrees(self):
+        """Test that versions built by replacing the changed containers are diffed without copies"""
+        emitter = StateEmitter()
+        state = _large_state()
+        emitter.emit(state)
+        steps = list(state["steps"])
+        steps[3] = {**steps[3], "status": "completed"}
+        new_state = {**state, "steps": steps}
+        event = emitter.emit(new_state)
+        self.assertEqual(event.type, EventType.STATE_DELTA)
+        self.assertEqual(event.delta, [{"op": "replace", "path": "/steps/3/status", "value": "completed"}])
+        self.assertIs(emitter._state, new_state)
+        self.assertEqual(state["steps"][3]["status"], "pending")
+        self.assertIsNone(emitter.emit(new_state))
+
+    def test_diff_after_tracked_state(self):
+        """Test that a snapshot is sent when the previous state was not kept"""
+        emitter = StateEmitter()
+        tracked = TrackedState(_large_state())
+        emitter.emit(tracked)
+        tracked["steps"][0]["status"] = "completed"
+        self.assertEqual(emitter.emit(tracked).type, EventType.STATE_DELTA)
+        event = emitter.emit(tracked.data)
+        self.assertEqual(event.type, EventType.STATE_SNAPSHOT)
+        self.assertIsNone(emitter.emit(tracked.data))
+
+    def test_forced_snapshot(self):
+        """Test that snapshot resets the emitter"""
+        emitter = StateEmitter()
+        state = {"a": 1}
+        emitter.emit(state)
+        self.assertEqual(emitter.snapshot(state).type, EventType.STATE_SNAPSHOT)
+        self.assertIsNone(emitter.emit(state))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,16 @@ import json
 from datetime import datetime
 
 from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
-from ag_ui.core.events import BaseEvent, EventType, TextMessageContentEvent, ToolCallStartEvent
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    TextMessageContentEvent,
+    ToolCallStartEvent,
+    ThinkingStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingEndEvent,
+)
+from ag_ui.proto import ProtoStreamParser
 
 
 class TestEventEncoder(unittest.TestCase):
@@ -186,3 +195,73 @@ class TestEventEncoder(unittest.TestCase):
             original_event.model_dump(), 
             deserialized_event.model_dump()
         )
+
+    def test_encode_protobuf_when_accepted(self):
+        """Test that the protobuf encoding is used when the client accepts it"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta="Hello, world!"
+        )
+
+        encoder = EventEncoder(accept=f"{AGUI_MEDIA_TYPE}, text/event-stream")
+        self.assertEqual(encoder.get_content_type(), AGUI_MEDIA_TYPE)
+
+        encoded = encoder.encode(event)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(int.from_bytes(encoded[:4], "big"), len(encoded) - 4)
+
+    def test_encode_protobuf_thinking_events(self):
+        """Test that thinking events can be sent to a client that accepted protobuf"""
+        events = [
+            ThinkingStartEvent(type=EventType.THINKING_START, title="Planning"),
+            ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="hmm"),
+            ThinkingEndEvent(type=EventType.THINKING_END),
+        ]
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        data = b"".join(encoder.encode_bytes(event) for event in events)
+        self.assertEqual(ProtoStreamParser().feed(data), events)
+
+    def test_encode_sse_by_default(self):
+        """Test that SSE is used when the client does not accept protobuf"""
+        encoder = EventEncoder(accept="text/event-stream")
+        self.assertEqual(encoder.get_content_type(), "text/event-stream")
+        self.assertEqual(EventEncoder().get_content_type(), "text/event-stream")
+
+    def test_encode_bytes_matches_encode(self):
+        """Test that encode_bytes produces the UTF-8 bytes of encode for every format"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta="Grüße ✓",
+            timestamp=1648214400000
+        )
+        for accept in (None, "application/x-ndjson", AGUI_MEDIA_TYPE):
+            encoder = EventEncoder(accept=accept)
+            encoded = encoder.encode(event)
+            if isinstance(encoded, str):
+                encoded = encoded.encode("utf-8")
+            self.assertEqual(encoder.encode_bytes(event), encoded)
+
+    def test_encode_into_reuses_buffer(self):
+        """Test that encode_into appends encoded events to a buffer"""
+        encoder = EventEncoder()
+        events = [
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta=delta)
+            for delta in ("a", "b")
+        ]
+        buffer = bytearray()
+        written = [encoder.encode_into(event, buffer) for event in events]
+        expected = b"".join(encoder.encode_bytes(event) for event in events)
+        self.assertEqual(bytes(buffer), expected)
+        self.assertEqual(sum(written), len(expected))
+
+    def test_encode_sse_event_id(self):
+        """Test that an event id is sent as the SSE id field"""
+        encoder = EventEncoder()
+        event = TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="a")
+        expected = 'id: 7\ndata: {"type":"TEXT_MESSAGE_CONTENT","messageId":"m","delta":"a"}\n\n'
+        self.assertEqual(encoder.encode(event, "7"), expected)
+        self.assertEqual(encoder.encode_bytes(event, "7"), expected.encode("utf-8"))
+        ndjson = EventEncoder(accept="application/x-ndjson")
+        self.assertEqual(ndjson.encode_bytes(event, "7"), ndjson.encode_bytes(event))
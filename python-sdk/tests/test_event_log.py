@@ -0,0 +1,168 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from ag_ui.client import SSEParser
+from ag_ui.core.events import EventType, TextMessageContentEvent, RunErrorEvent, RunStartedEvent, parse_event
+from ag_ui.encoder import EventEncoder
+from ag_ui.server import (
+    EventLog,
+    EventLogGapError,
+    FileEventLog,
+    MemoryEventLog,
+    ResumableRuns,
+    parse_last_event_id,
+)
+
+
+def _content_event(delta):
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta=delta)
+
+
+class TestEventLogs(unittest.TestCase):
+    """Test suite for the event logs"""
+
+    def _check_log(self, log):
+        events = [_content_event(str(i)) for i in range(10)]
+        self.assertEqual([log.append(event) for event in events], list(range(1, 11)))
+        self.assertEqual(log.first_sequence, 6)
+        self.assertEqual(log.read(7), [(8, events[7]), (9, events[8]), (10, events[9])])
+        self.assertEqual(log.read(5), list(zip(range(6, 11), events[5:])))
+        self.assertEqual(log.read(10), [])
+        with self.assertRaises(EventLogGapError):
+            log.read(3)
+        log.close()
+        with self.assertRaises(ValueError):
+            log.append(events[0])
+
+    def test_memory_log(self):
+        """Test the ring buffer event log"""
+        self._check_log(MemoryEventLog(max_events=5))
+
+    def test_file_log(self):
+        """Test the file-backed event log, including compaction of the file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.log")
+            log = FileEventLog(path, max_events=5)
+            self._check_log(log)
+            with open(path, "rb") as file:
+                lines = file.read().splitlines()
+            self.assertLessEqual(len(lines), 10)
+            self.assertEqual(lines[-1].split(b" ", 1)[0], b"10")
+
+    def test_event_log_is_abstract(self):
+        """Test that an event log must implement its storage"""
+        with self.assertRaises(TypeError):
+            EventLog()
+
+    def test_file_log_delete(self):
+        """Test that deleting a file-backed log removes its file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.log")
+            log = FileEventLog(path)
+            log.append(_content_event("a"))
+            log.flush()
+            self.assertEqual(log.read(0), [(1, _content_event("a"))])
+            log.delete()
+            self.assertFalse(os.path.exists(path))
+            with self.assertRaises(ValueError):
+                log.append(_content_event("b"))
+
+    def test_follow(self):
+        """Test that follow yields retained and later events until the log is closed"""
+        log = MemoryEventLog()
+        log.append(_content_event("a"))
+
+        async def produce():
+            await asyncio.sleep(0.01)
+            log.append(_content_event("b"))
+            await asyncio.sleep(0.01)
+            log.close()
+
+        async def consume():
+            task = asyncio.ensure_future(produce())
+            result = [(sequence, event.delta) async for sequence, event in log.follow()]
+            await task
+            return result
+
+        self.assertEqual(asyncio.run(consume()), [(1, "a"), (2, "b")])
+
+    def test_parse_last_event_id(self):
+        """Test parsing the Last-Event-ID header"""
+        self.assertEqual(parse_last_event_id(None), 0)
+        self.assertEqual(parse_last_event_id("12"), 12)
+        self.assertEqual(parse_last_event_id("abc"), 0)
+
+
+class TestResumableRuns(unittest.TestCase):
+    """Test suite for resuming runs from their event log"""
+
+    def test_resume_replays_missing_events(self):
+        """Test that a reconnecting client is sent only the events it missed"""
+        runs_started = []
+
+        async def agent():
+            runs_started.append(True)
+            yield RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+            for delta in "abcd":
+                await asyncio.sleep(0)
+                yield _content_event(delta)
+
+        def decode(chunks):
+            parser = SSEParser()
+            messages = [message for chunk in chunks for message in parser.feed(chunk)]
+            return [(message.id, parse_event(message.data)) for message in messages]
+
+        async def run():
+            runs = ResumableRuns()
+            encoder = EventEncoder()
+            first = []
+            async for chunk in runs.stream("r", agent, encoder):
+                first.append(chunk)
+                if len(first) == 2:
+                    break  # the connection drops
+            last_event_id = decode(first)[-1][0]
+            second = [chunk async for chunk in runs.stream("r", agent, encoder, last_event_id)]
+            return decode(first), decode(second)
+
+        first, second = asyncio.run(run())
+        self.assertEqual(len(runs_started), 1)
+        self.assertEqual([event_id for event_id, _ in first], ["1", "2"])
+        self.assertEqual([event_id for event_id, _ in second], ["3", "4", "5"])
+        self.assertEqual([event.delta for _, event in second], ["b", "c", "d"])
+
+    def test_failed_run_ends_with_run_error(self):
+        """Test that a failing agent ends the log with a RUN_ERROR event"""
+        async def agent():
+            yield RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+            raise RuntimeError("boom")
+
+        async def run():
+            runs = ResumableRuns()
+            with self.assertLogs("ag_ui.server.resumable", level="ERROR"):
+                return [chunk async for chunk in runs.stream("r", agent, EventEncoder())]
+
+        event = SSEParser().feed(b"".join(asyncio.run(run())))[-1]
+        self.assertEqual(
+            parse_event(event.data),
+            RunErrorEvent(type=EventType.RUN_ERROR, message="The run failed", code="RUN_FAILED"),
+        )
+
+    def test_evicted_logs_are_deleted(self):
+        """Test that the logs of evicted runs are deleted"""
+        async def agent():
+            yield _content_event("a")
+
+        async def run(directory):
+            runs = ResumableRuns(log_factory=lambda run_id: FileEventLog(os.path.join(directory, run_id)), max_runs=1)
+            for run_id in ("r1", "r2"):
+                [chunk async for chunk in runs.stream(run_id, agent, EventEncoder())]
+
+        with tempfile.TemporaryDirectory() as directory:
+            asyncio.run(run(directory))
+            self.assertEqual(os.listdir(directory), ["r2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
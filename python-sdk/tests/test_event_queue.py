@@ -0,0 +1,118 @@
+import asyncio
+import unittest
+
+from ag_ui.core.events import (
+    EventType,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+)
+from ag_ui.server import EventQueue, OverflowPolicy, buffer_events, merge_deltas
+
+
+def _content_event(delta, message_id="m"):
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=message_id, delta=delta)
+
+
+def _snapshot(value):
+    return StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"value": value})
+
+
+def _delta(value):
+    return StateDeltaEvent(type=EventType.STATE_DELTA, delta=[{"op": "replace", "path": "/value", "value": value}])
+
+
+async def _fill(queue, events):
+    for event in events:
+        await queue.put(event)
+    queue.close()
+    return [event async for event in queue]
+
+
+class TestEventQueue(unittest.TestCase):
+    """Test suite for the bounded event queue"""
+
+    def test_watermarks(self):
+        """Test that the producer is paused at the high watermark until the low watermark"""
+        queue = EventQueue(max_events=4, low_watermark=1)
+        log = []
+
+        async def produce():
+            for i in range(6):
+                await queue.put(_content_event(str(i)))
+                log.append(("put", i))
+            queue.close()
+
+        async def consume():
+            task = asyncio.ensure_future(produce())
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(queue), 4)
+            events = []
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                log.append(("got", event.delta))
+                events.append(event.delta)
+                await asyncio.sleep(0)
+            await task
+            return events
+
+        self.assertEqual(asyncio.run(consume()), [str(i) for i in range(6)])
+        # the producer only resumes once the queue is down to one event
+        self.assertLess(log.index(("got", "2")), log.index(("put", 4)))
+        self.assertEqual(queue.metrics.pauses, 1)
+        self.assertEqual(queue.metrics.peak_size, 4)
+        self.assertEqual(queue.metrics.got_events, 6)
+
+    def test_coalesce(self):
+        """Test that queued deltas for the same message are merged"""
+        queue = EventQueue(policy="coalesce")
+        events = asyncio.run(_fill(queue, [
+            _content_event("a"),
+            _content_event("b"),
+            _content_event("c", message_id="n"),
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="n"),
+            _content_event("d"),
+        ]))
+        self.assertEqual(queue.policy, OverflowPolicy.COALESCE)
+        self.assertEqual([getattr(event, "delta", None) for event in events], ["ab", "c", None, "d"])
+        self.assertEqual(queue.metrics.coalesced_events, 1)
+        self.assertIsNone(merge_deltas(_content_event("abc"), _content_event("d"), max_size=3))
+
+    def test_drop_snapshots(self):
+        """Test that a new snapshot replaces the queued state events"""
+        queue = EventQueue(policy=OverflowPolicy.DROP_SNAPSHOTS)
+        events = asyncio.run(_fill(queue, [
+            _snapshot(1),
+            _content_event("a"),
+            _delta(2),
+            _snapshot(3),
+            _delta(4),
+        ]))
+        self.assertEqual([event.type for event in events], [
+            EventType.TEXT_MESSAGE_CONTENT, EventType.STATE_SNAPSHOT, EventType.STATE_DELTA,
+        ])
+        self.assertEqual(events[1].snapshot, {"value": 3})
+        self.assertEqual(queue.metrics.dropped_events, 2)
+
+    def test_buffer_events(self):
+        """Test that a stream is buffered through a queue and its errors are raised"""
+        async def events():
+            yield _content_event("a")
+            yield _content_event("b")
+            raise RuntimeError("boom")
+
+        async def collect():
+            result = []
+            with self.assertRaises(RuntimeError):
+                async for event in buffer_events(events(), EventQueue(max_events=1)):
+                    result.append(event.delta)
+            return result
+
+        self.assertEqual(asyncio.run(collect()), ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
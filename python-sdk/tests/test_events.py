@@ -23,7 +23,11 @@ from ag_ui.core.events import (
     RunErrorEvent,
     StepStartedEvent,
     StepFinishedEvent,
-    Event
+    ThinkingStartEvent,
+    ThinkingTextMessageContentEvent,
+    Event,
+    parse_event,
+    parse_events
 )
 
 
@@ -568,6 +572,89 @@ class TestEvents(unittest.TestCase):
         # Verify Unicode and special characters are preserved
         self.assertEqual(deserialized.delta, text)
 
+    def test_trusted_construction(self):
+        """Test that trusted events equal validated events"""
+        pairs = [
+            (
+                TextMessageContentEvent.trusted(message_id="msg_1", delta="Hi", timestamp=1648214400000),
+                TextMessageContentEvent(
+                    type=EventType.TEXT_MESSAGE_CONTENT,
+                    message_id="msg_1",
+                    delta="Hi",
+                    timestamp=1648214400000
+                ),
+            ),
+            (
+                ToolCallArgsEvent.trusted(tool_call_id="call_1", delta="{}"),
+                ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="call_1", delta="{}"),
+            ),
+            (
+                ToolCallStartEvent.trusted(tool_call_id="call_1", tool_call_name="search"),
+                ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="call_1", tool_call_name="search"),
+            ),
+            (
+                StateDeltaEvent.trusted(delta=[{"op": "add", "path": "/a", "value": 1}]),
+                StateDeltaEvent(type=EventType.STATE_DELTA, delta=[{"op": "add", "path": "/a", "value": 1}]),
+            ),
+        ]
+        for trusted, validated in pairs:
+            with self.subTest(type=validated.type):
+                self.assertEqual(trusted, validated)
+                self.assertEqual(trusted.model_fields_set, validated.model_fields_set)
+                self.assertEqual(
+                    trusted.model_dump_json(by_alias=True, exclude_none=True),
+                    validated.model_dump_json(by_alias=True, exclude_none=True)
+                )
+
+    def test_trusted_construction_checks_invariants(self):
+        """Test that trusted construction keeps cheap invariant checks"""
+        with self.assertRaises(ValueError):
+            TextMessageContentEvent.trusted(message_id="msg_1", delta="")
+        with self.assertRaises(ValueError):
+            RunStartedEvent.trusted(thread_id="thread_1")
+        with self.assertRaises(ValueError):
+            RunStartedEvent.trusted(thread_id="thread_1", run_id="run_1", threadId="thread_1")
+
+    def test_parse_event(self):
+        """Test parsing events from JSON bytes, strings and dicts"""
+        event = parse_event(b'{"type":"TEXT_MESSAGE_CONTENT","messageId":"msg_1","delta":"Hi"}')
+        self.assertIsInstance(event, TextMessageContentEvent)
+        self.assertEqual(event.delta, "Hi")
+
+        event = parse_event('{"type":"THINKING_START","title":"Planning"}')
+        self.assertIsInstance(event, ThinkingStartEvent)
+
+        event = parse_event({"type": "THINKING_TEXT_MESSAGE_CONTENT", "delta": "hmm"})
+        self.assertIsInstance(event, ThinkingTextMessageContentEvent)
+
+    def test_parse_event_errors(self):
+        """Test that invalid events raise validation errors"""
+        with self.assertRaises(ValidationError):
+            parse_event(b'{"type":"UNKNOWN"}')
+        with self.assertRaises(ValidationError):
+            parse_event(b'{"type":"RUN_STARTED","threadId":"t"}')
+        with self.assertRaises(ValidationError):
+            parse_event(b"not json")
+
+    def test_parse_events(self):
+        """Test parsing a sequence of events covering every event type"""
+        events = [
+            {"type": event_type.value}
+            for event_type in (
+                EventType.THINKING_TEXT_MESSAGE_START,
+                EventType.THINKING_TEXT_MESSAGE_END,
+                EventType.THINKING_END,
+            )
+        ]
+        events.append(b'{"type":"STEP_STARTED","stepName":"plan"}')
+        parsed = list(parse_events(events))
+        self.assertEqual([event.type for event in parsed], [
+            EventType.THINKING_TEXT_MESSAGE_START,
+            EventType.THINKING_TEXT_MESSAGE_END,
+            EventType.THINKING_END,
+            EventType.STEP_STARTED,
+        ])
+
 
 if __name__ == "__main__":
     unittest.main()
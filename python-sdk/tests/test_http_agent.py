@@ -0,0 +1,120 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from ag_ui.client import HttpAgent
+from ag_ui.core.events import EventType, RunStartedEvent, TextMessageContentEvent, RunFinishedEvent
+from ag_ui.core.types import RunAgentInput
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+
+
+def _run_input():
+    return RunAgentInput(
+        thread_id="thread_1",
+        run_id="run_1",
+        state={},
+        messages=[],
+        tools=[],
+        context=[],
+        forwarded_props={}
+    )
+
+
+def _events():
+    return [
+        RunStartedEvent(type=EventType.RUN_STARTED, thread_id="thread_1", run_id="run_1"),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta="Hello"),
+        RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="thread_1", run_id="run_1"),
+    ]
+
+
+class _ChunkedStream(httpx.AsyncByteStream if httpx else object):
+    def __init__(self, data, size):
+        self.data = data
+        self.size = size
+
+    async def __aiter__(self):
+        for i in range(0, len(self.data), self.size):
+            yield self.data[i:i + self.size]
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestHttpAgent(unittest.TestCase):
+    """Test suite for the HttpAgent"""
+
+    def _serve(self, requests):
+        def handler(request):
+            requests.append(request)
+            encoder = EventEncoder(accept=request.headers["accept"])
+            body = encoder.encode_many(_events())
+            return httpx.Response(
+                200,
+                headers={"content-type": encoder.get_content_type()},
+                stream=_ChunkedStream(body, 5)
+            )
+        return httpx.MockTransport(handler)
+
+    def _run(self, agent, runs=1):
+        async def collect():
+            async with agent:
+                return [[event async for event in agent.run(_run_input())] for _ in range(runs)]
+        return asyncio.run(collect())
+
+    def test_run_with_protobuf(self):
+        """Test that runs negotiate protobuf and stream typed events"""
+        requests = []
+        client = httpx.AsyncClient(transport=self._serve(requests))
+        agent = HttpAgent("http://agent/run", headers={"Authorization": "Bearer token"}, client=client)
+
+        self.assertEqual(self._run(agent), [_events()])
+        request = requests[0]
+        self.assertTrue(request.headers["accept"].startswith(AGUI_MEDIA_TYPE))
+        self.assertEqual(request.headers["authorization"], "Bearer token")
+        self.assertEqual(json.loads(request.content)["threadId"], "thread_1")
+
+    def test_run_with_sse(self):
+        """Test that runs can be streamed as SSE"""
+        requests = []
+        client = httpx.AsyncClient(transport=self._serve(requests))
+        agent = HttpAgent("http://agent/run", use_protobuf=False, client=client)
+
+        self.assertEqual(self._run(agent), [_events()])
+        self.assertEqual(requests[0].headers["accept"], "text/event-stream")
+
+    def test_runs_share_client(self):
+        """Test that consecutive runs reuse the pooled client"""
+        requests = []
+        agent = HttpAgent("http://agent/run")
+        agent._client = httpx.AsyncClient(transport=self._serve(requests))
+
+        self.assertEqual(self._run(agent, runs=3), [_events()] * 3)
+        self.assertEqual(len(requests), 3)
+        self.assertTrue(agent._client.is_closed)
+
+    def test_error_status(self):
+        """Test that error responses raise HTTPStatusError"""
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+        agent = HttpAgent("http://agent/run", client=client)
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            self._run(agent)
+
+
+class TestHttpAgentWithoutHttpx(unittest.TestCase):
+    """Test suite for the HttpAgent when httpx is not installed"""
+
+    def test_missing_httpx(self):
+        """Test that a missing httpx is only reported when an agent is created"""
+        with mock.patch.dict("sys.modules", {"httpx": None}):
+            with self.assertRaisesRegex(ImportError, r"ag-ui-protocol\[client\]"):
+                HttpAgent("http://agent/run")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE, SSE_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+from ag_ui.encoder.media_type import parse_accept, negotiate_media_type, MediaRange
+from ag_ui.core.events import EventType, TextMessageContentEvent
+
+
+class TestMediaType(unittest.TestCase):
+    """Test suite for Accept header negotiation"""
+
+    def test_parse_accept(self):
+        """Test parsing media ranges with q-values and parameters"""
+        ranges = parse_accept('text/event-stream;charset=utf-8, Application/*;q=0.5, */*;q="0.1", bogus, a/b;q=x')
+        self.assertEqual(ranges, [
+            MediaRange("text", "event-stream", 1.0),
+            MediaRange("application", "*", 0.5),
+            MediaRange("*", "*", 0.1),
+        ])
+
+    def test_default_without_header(self):
+        """Test that SSE is used without an Accept header"""
+        self.assertEqual(negotiate_media_type(None), SSE_MEDIA_TYPE)
+        self.assertEqual(negotiate_media_type(""), SSE_MEDIA_TYPE)
+        self.assertEqual(negotiate_media_type("application/json"), SSE_MEDIA_TYPE)
+
+    def test_cheapest_explicit_media_type(self):
+        """Test that the cheapest explicitly accepted format is chosen"""
+        accept = f"text/event-stream, {NDJSON_MEDIA_TYPE}, {AGUI_MEDIA_TYPE}"
+        self.assertEqual(negotiate_media_type(accept), AGUI_MEDIA_TYPE)
+        accept = f"text/event-stream, {NDJSON_MEDIA_TYPE}"
+        self.assertEqual(negotiate_media_type(accept), NDJSON_MEDIA_TYPE)
+
+    def test_q_values(self):
+        """Test that q-values take precedence over encoding cost"""
+        accept = f"{AGUI_MEDIA_TYPE};q=0.5, text/event-stream"
+        self.assertEqual(negotiate_media_type(accept), SSE_MEDIA_TYPE)
+        accept = f"{AGUI_MEDIA_TYPE};q=0, */*"
+        self.assertEqual(negotiate_media_type(accept), SSE_MEDIA_TYPE)
+        accept = f"text/event-stream;q=0, {NDJSON_MEDIA_TYPE};q=0.2"
+        self.assertEqual(negotiate_media_type(accept), NDJSON_MEDIA_TYPE)
+
+    def test_wildcards(self):
+        """Test that wildcard-only matches fall back to SSE"""
+        self.assertEqual(negotiate_media_type("*/*"), SSE_MEDIA_TYPE)
+        self.assertEqual(negotiate_media_type("text/*"), SSE_MEDIA_TYPE)
+        self.assertEqual(negotiate_media_type("application/*"), SSE_MEDIA_TYPE)
+        self.assertEqual(negotiate_media_type("application/json, application/*;q=0.8"), SSE_MEDIA_TYPE)
+        self.assertEqual(negotiate_media_type(f"application/*, {NDJSON_MEDIA_TYPE};q=0.5"), NDJSON_MEDIA_TYPE)
+        self.assertEqual(negotiate_media_type(f"*/*, {AGUI_MEDIA_TYPE}"), AGUI_MEDIA_TYPE)
+
+    def test_encoder_uses_negotiated_type(self):
+        """Test that the encoder encodes with the negotiated media type"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta="Hello"
+        )
+        encoder = EventEncoder(accept=NDJSON_MEDIA_TYPE)
+        self.assertEqual(encoder.get_content_type(), NDJSON_MEDIA_TYPE)
+        self.assertEqual(
+            encoder.encode(event),
+            '{"type":"TEXT_MESSAGE_CONTENT","messageId":"msg_123","delta":"Hello"}\n'
+        )
+
+    def test_negotiation_is_cached(self):
+        """Test that negotiation results are cached per Accept header"""
+        negotiate_media_type.cache_clear()
+        EventEncoder(accept="text/event-stream")
+        EventEncoder(accept="text/event-stream")
+        self.assertEqual(negotiate_media_type.cache_info().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+
+from ag_ui.state import JsonPatchError, apply_patch, parse_pointer
+
+
+class TestJsonPatch(unittest.TestCase):
+    """Test suite for the JSON Patch implementation"""
+
+    def test_parse_pointer(self):
+        """Test parsing and unescaping JSON Pointers"""
+        self.assertEqual(parse_pointer(""), ())
+        self.assertEqual(parse_pointer("/a/0"), ("a", "0"))
+        self.assertEqual(parse_pointer("/a~1b/c~0d/~01"), ("a/b", "c~d", "~1"))
+        with self.assertRaises(JsonPatchError):
+            parse_pointer("a")
+
+    def test_operations(self):
+        """Test the RFC 6902 operations"""
+        document = {"a": 1, "list": [1, 2, 3], "nested": {"x": {"y": 1}}}
+        result = apply_patch(document, [
+            {"op": "add", "path": "/b", "value": 2},
+            {"op": "add", "path": "/list/1", "value": 9},
+            {"op": "add", "path": "/list/-", "value": 4},
+            {"op": "remove", "path": "/a"},
+            {"op": "replace", "path": "/list/0", "value": 0},
+            {"op": "move", "from": "/nested/x", "path": "/moved"},
+            {"op": "copy", "from": "/moved", "path": "/copied"},
+            {"op": "test", "path": "/copied/y", "value": 1},
+        ])
+        self.assertEqual(result, {
+            "b": 2,
+            "list": [0, 9, 2, 3, 4],
+            "nested": {},
+            "moved": {"y": 1},
+            "copied": {"y": 1},
+        })
+        self.assertEqual(document, {"a": 1, "list": [1, 2, 3], "nested": {"x": {"y": 1}}})
+
+    def test_replace_root(self):
+        """Test replacing the whole document"""
+        self.assertEqual(apply_patch({"a": 1}, [{"op": "replace", "path": "", "value": [1]}]), [1])
+
+    def test_errors(self):
+        """Test that invalid operations raise JsonPatchError"""
+        invalid = [
+            {"op": "remove", "path": "/missing"},
+            {"op": "replace", "path": "/list/5", "value": 1},
+            {"op": "add", "path": "/list/01", "value": 1},
+            {"op": "add", "path": "/list/\u00b9", "value": 1},
+            {"op": "replace", "path": "/list/\u0660", "value": 1},
+            {"op": "test", "path": "/a", "value": 2},
+            {"op": "move", "from": "/nested", "path": "/nested/x/z"},
+            {"op": "frobnicate", "path": "/a"},
+            {"path": "/a"},
+            {"op": "add", "path": 123, "value": 1},
+            {"op": "add", "path": ["a"], "value": 1},
+            {"op": "copy", "from": 123, "path": "/b"},
+            {"op": "move", "from": None, "path": "/b"},
+        ]
+        for operation in invalid:
+            with self.subTest(operation=operation):
+                with self.assertRaises(JsonPatchError):
+                    apply_patch({"a": 1, "list": [1], "nested": {"x": {}}}, [operation])
+
+    def test_test_compares_numbers_by_value(self):
+        """Test that the test operation equates 1 and 1.0 but not True and 1, at any depth"""
+        document = {"a": 1.0, "b": True, "nested": {"list": [0, {"v": 1}]}}
+        passing = [
+            {"op": "test", "path": "/a", "value": 1},
+            {"op": "test", "path": "/nested", "value": {"list": [0.0, {"v": 1.0}]}},
+        ]
+        apply_patch(document, passing)
+        failing = [
+            {"op": "test", "path": "/a", "value": True},
+            {"op": "test", "path": "/b", "value": 1},
+            {"op": "test", "path": "/nested/list", "value": [False, {"v": 1}]},
+            {"op": "test", "path": "/nested", "value": {"list": [0, {"v": True}]}},
+        ]
+        for operation in failing:
+            with self.subTest(operation=operation):
+                with self.assertRaises(JsonPatchError):
+                    apply_patch(document, [operation])
+
+    def test_in_place(self):
+        """Test that in-place patches modify the document without copying it"""
+        nested = {"status": "pending"}
+        document = {"steps": [nested]}
+        result = apply_patch(document, [
+            {"op": "replace", "path": "/steps/0/status", "value": "completed"},
+            {"op": "add", "path": "/steps/-", "value": {"status": "pending"}},
+        ], in_place=True)
+        self.assertIs(result, document)
+        self.assertIs(document["steps"][0], nested)
+        self.assertEqual(nested, {"status": "completed"})
+        self.assertEqual(len(document["steps"]), 2)
+
+    def test_in_place_values_are_copied(self):
+        """Test that values from the patch are not shared with the document"""
+        value = {"a": [1]}
+        document = apply_patch({}, [{"op": "add", "path": "/v", "value": value}], in_place=True)
+        document["v"]["a"].append(2)
+        self.assertEqual(value, {"a": [1]})
+
+    def test_in_place_rollback(self):
+        """Test that a failed in-place patch leaves the document unchanged"""
+        original = {
+            "a": 1,
+            "list": [1, 2, 3],
+            "nested": {"x": {"y": 1}},
+        }
+        patch = [
+            {"op": "add", "path": "/b", "value": 2},
+            {"op": "replace", "path": "/a", "value": 5},
+            {"op": "add", "path": "/list/0", "value": 0},
+            {"op": "remove", "path": "/list/2"},
+            {"op": "remove", "path": "/a"},
+            {"op": "move", "from": "/nested/x", "path": "/list/-"},
+            {"op": "copy", "from": "/list/0", "path": "/c"},
+            {"op": "replace", "path": "", "value": {}},
+            {"op": "test", "path": "/missing", "value": 1},
+        ]
+        for end in range(len(patch)):
+            with self.subTest(end=end):
+                document = {
+                    "a": 1,
+                    "list": [1, 2, 3],
+                    "nested": {"x": {"y": 1}},
+                }
+                list_ = document["list"]
+                with self.assertRaises(JsonPatchError):
+                    apply_patch(document, patch[:end] + [{"op": "remove", "path": "/missing"}], in_place=True)
+                self.assertEqual(document, original)
+                self.assertEqual(list(document), list(original))
+                self.assertIs(document["list"], list_)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+import asyncio
+import unittest
+
+from ag_ui.core.types import UserMessage, AssistantMessage, ToolMessage, ToolCall, FunctionCall
+from ag_ui.core.events import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallChunkEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+    MessagesSnapshotEvent,
+    CustomEvent,
+    RunErrorEvent,
+)
+from ag_ui.proto import encode, encode_frame, decode, ProtoStreamParser, parse_proto_stream
+
+
+def _sample_events():
+    return [
+        TextMessageStartEvent(
+            type=EventType.TEXT_MESSAGE_START,
+            message_id="msg_1",
+            role="assistant",
+            timestamp=1648214400000
+        ),
+        TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_1",
+            delta="Hello, wörld ✓"
+        ),
+        ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id="call_1",
+            tool_call_name="search",
+            parent_message_id="msg_1",
+            raw_event={"source": ["llm", 1, 2.5, None, True]}
+        ),
+        StateSnapshotEvent(
+            type=EventType.STATE_SNAPSHOT,
+            snapshot={"steps": [{"status": "pending"}], "count": 3, "empty": None}
+        ),
+        StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[
+                {"op": "add", "path": "/a", "value": None},
+                {"op": "remove", "path": "/b"},
+                {"op": "move", "path": "/c", "from": "/d"},
+            ]
+        ),
+        MessagesSnapshotEvent(
+            type=EventType.MESSAGES_SNAPSHOT,
+            messages=[
+                UserMessage(id="1", role="user", content="hi"),
+                AssistantMessage(
+                    id="2",
+                    role="assistant",
+                    tool_calls=[
+                        ToolCall(id="call_1", type="function", function=FunctionCall(name="f", arguments="{}"))
+                    ]
+                ),
+                ToolMessage(id="3", role="tool", content="result", tool_call_id="call_1"),
+            ]
+        ),
+        CustomEvent(type=EventType.CUSTOM, name="custom", value=[1, "two"]),
+        RunErrorEvent(type=EventType.RUN_ERROR, message="failed", code="E1", timestamp=-1),
+        TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="chunk"),
+        ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="call_2", delta="{"),
+        ThinkingStartEvent(type=EventType.THINKING_START, title="Planning"),
+        ThinkingStartEvent(type=EventType.THINKING_START),
+        ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START),
+        ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="hmm"),
+        ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END, timestamp=2),
+        ThinkingEndEvent(type=EventType.THINKING_END),
+    ]
+
+
+class TestProtoEncoding(unittest.TestCase):
+    """Test suite for the protocol buffer encoding"""
+
+    def test_encode_text_message_content(self):
+        """Test the wire format of a text message content event"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="m1",
+            delta="hi"
+        )
+        expected = bytes.fromhex(
+            "120c"      # oneof field 2 (text_message_content), 12 bytes
+            "0a020801"  # base_event { type: TEXT_MESSAGE_CONTENT }
+            "12026d31"  # message_id: "m1"
+            "1a026869"  # delta: "hi"
+        )
+        self.assertEqual(encode(event), expected)
+
+    def test_encode_frame_prefixes_length(self):
+        """Test that frames carry a 4-byte big-endian length prefix"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="m1",
+            delta="x" * 300,
+            timestamp=1648214400000
+        )
+        message = encode(event)
+        frame = encode_frame(event)
+        self.assertEqual(frame[4:], message)
+        self.assertEqual(int.from_bytes(frame[:4], "big"), len(message))
+
+    def test_encode_timestamp_and_raw_event(self):
+        """Test that base event fields are encoded"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="m1",
+            delta="hi",
+            timestamp=1,
+            raw_event=None
+        )
+        self.assertIn(bytes.fromhex("0a0408011001"), encode(event))
+
+    def test_encode_chunk_event_without_enum_value(self):
+        """Test that chunk events are identified by their oneof field"""
+        event = TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="a")
+        encoded = encode(event)
+        self.assertEqual(encoded[:2], b"\x8a\x01")
+
+    def test_encode_state_events(self):
+        """Test that state events with JSON values can be encoded"""
+        snapshot = StateSnapshotEvent(
+            type=EventType.STATE_SNAPSHOT,
+            snapshot={"count": 1, "items": ["a", None, True]}
+        )
+        self.assertTrue(encode(snapshot).startswith(b"\x3a"))
+
+        delta = StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[{"op": "replace", "path": "/count", "value": 2}]
+        )
+        self.assertTrue(encode(delta).startswith(b"\x42"))
+
+    def test_encode_thinking_events(self):
+        """Test the wire format of thinking events"""
+        event = ThinkingStartEvent(type=EventType.THINKING_START, title="t")
+        expected = bytes.fromhex(
+            "b20107"    # oneof field 22 (thinking_start), 7 bytes
+            "0a020813"  # base_event { type: THINKING_START }
+            "120174"    # title: "t"
+        )
+        self.assertEqual(encode(event), expected)
+
+        event = ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="a")
+        self.assertEqual(encode(event), bytes.fromhex("a20107" "0a020811" "120161"))
+
+
+class TestProtoDecoding(unittest.TestCase):
+    """Test suite for protocol buffer decoding and stream parsing"""
+
+    def test_round_trip(self):
+        """Test that every supported event survives encoding and decoding"""
+        for event in _sample_events():
+            with self.subTest(type=event.type):
+                self.assertEqual(decode(encode(event)), event)
+
+    def test_decode_invalid_data(self):
+        """Test that invalid messages raise ValueError"""
+        with self.assertRaises(ValueError):
+            decode(b"")
+        with self.assertRaises(ValueError):
+            decode(encode(_sample_events()[1])[:-3])
+
+    def test_decode_unexpected_wire_types(self):
+        """Test that fields with an unexpected wire type or size raise ValueError"""
+        messages = [
+            "12050a03120141",      # base_event.timestamp as a string
+            "3a0712051203000000",  # snapshot number of 3 bytes
+            "12021001",            # message_id as a varint
+        ]
+        for message in messages:
+            with self.subTest(message=message):
+                with self.assertRaises(ValueError):
+                    decode(bytes.fromhex(message))
+
+    def test_round_trip_custom_event_without_value(self):
+        """Test that a custom event with a null value survives encoding and decoding"""
+        event = CustomEvent(type=EventType.CUSTOM, name="ping", value=None)
+        self.assertEqual(decode(encode(event)), event)
+
+    def test_stream_parser_reassembles_split_frames(self):
+        """Test that frames split across arbitrary chunks are reassembled"""
+        events = _sample_events()
+        stream = b"".join(encode_frame(event) for event in events)
+
+        for chunk_size in (1, 3, 7, 64, len(stream)):
+            with self.subTest(chunk_size=chunk_size):
+                parser = ProtoStreamParser()
+                decoded = []
+                for i in range(0, len(stream), chunk_size):
+                    decoded.extend(parser.feed(stream[i:i + chunk_size]))
+                parser.close()
+                self.assertEqual(decoded, events)
+
+    def test_stream_parser_incomplete_frame(self):
+        """Test that a stream ending within a frame is reported"""
+        parser = ProtoStreamParser()
+        self.assertEqual(parser.feed(encode_frame(_sample_events()[0])[:-1]), [])
+        with self.assertRaises(ValueError):
+            parser.close()
+
+    def test_stream_parser_resets_after_invalid_frame(self):
+        """Test that the parser drops its buffer when a frame cannot be decoded"""
+        parser = ProtoStreamParser()
+        invalid = bytes.fromhex("12050a03120141")
+        frame = encode_frame(_sample_events()[0])
+        parser.feed(frame[:2])
+        with self.assertRaises(ValueError):
+            parser.feed(frame[2:] + len(invalid).to_bytes(4, "big") + invalid + frame[:3])
+        self.assertEqual(parser.feed(frame), [_sample_events()[0]])
+        parser.close()
+
+    def test_stream_parser_rejects_oversized_frames(self):
+        """Test that a frame longer than the maximum frame size is rejected"""
+        frame = encode_frame(_sample_events()[0])
+        parser = ProtoStreamParser(max_frame_size=len(frame) - 4)
+        self.assertEqual(parser.feed(frame), [_sample_events()[0]])
+
+        parser = ProtoStreamParser(max_frame_size=len(frame) - 5)
+        with self.assertRaises(ValueError):
+            parser.feed(frame[:4])
+        self.assertEqual(parser.feed(b""), [])
+        parser.close()
+
+        with self.assertRaises(ValueError):
+            ProtoStreamParser().feed((1 << 31).to_bytes(4, "big"))
+
+    def test_parse_proto_stream(self):
+        """Test parsing an asynchronous stream of chunks"""
+        events = _sample_events()
+        stream = b"".join(encode_frame(event) for event in events)
+
+        async def chunks():
+            for i in range(0, len(stream), 5):
+                yield stream[i:i + 5]
+
+        async def collect():
+            return [event async for event in parse_proto_stream(chunks())]
+
+        self.assertEqual(asyncio.run(collect()), events)
+
+
+if __name__ == "__main__":
+    unittest.main()
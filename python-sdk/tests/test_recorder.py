@@ -0,0 +1,161 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from ag_ui.core.types import UserMessage, AssistantMessage, ToolMessage, ToolCall, FunctionCall
+from ag_ui.core.events import (
+    EventType,
+    CustomEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+    StepFinishedEvent,
+    StepStartedEvent,
+    TextMessageChunkEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ThinkingEndEvent,
+    ThinkingStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    ThinkingTextMessageStartEvent,
+    ToolCallArgsEvent,
+    ToolCallChunkEvent,
+    ToolCallEndEvent,
+    ToolCallStartEvent,
+)
+from ag_ui.server import RunRecorder, RunReader
+
+
+def _run(run_id, thread_id="t1", deltas="ab"):
+    return [
+        RunStartedEvent(type=EventType.RUN_STARTED, thread_id=thread_id, run_id=run_id),
+        *[
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=run_id, delta=delta)
+            for delta in deltas
+        ],
+        RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id=thread_id, run_id=run_id),
+    ]
+
+
+class TestRunRecorder(unittest.TestCase):
+    """Test suite for the run recorder and reader"""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_record_and_seek_runs(self):
+        """Test recording runs and reading them back by run and thread id"""
+        first = _run("r1") + [ThinkingStartEvent(type=EventType.THINKING_START)]
+        second = _run("r2", thread_id="t2", deltas="xyz")
+        with RunRecorder(self.directory) as recorder:
+            for event in first + second:
+                recorder.record(event)
+
+        with RunReader(self.directory) as reader:
+            self.assertEqual([run.run_id for run in reader.runs], ["r1", "r2"])
+            self.assertEqual(list(reader.events(run_id="r2")), second)
+            self.assertEqual(list(reader.events(thread_id="t1")), first[:-1])
+            self.assertEqual(list(reader), first + second)
+            self.assertEqual(reader.find(run_id="missing"), [])
+            events = reader.events()
+            self.assertEqual(next(events), first[0])
+        # closing the reader does not fail while an iterator is suspended
+        events.close()
+
+    def test_every_event_type_roundtrips(self):
+        """Test that every event type is read back exactly as it was recorded"""
+        events = [
+            RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r", timestamp=1),
+            StepStartedEvent(type=EventType.STEP_STARTED, step_name="plan"),
+            TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m", role="assistant"),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="wörld ✓"),
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m"),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="chunk"),
+            ThinkingStartEvent(type=EventType.THINKING_START, title="hm"),
+            ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START),
+            ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="hmm"),
+            ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END),
+            ThinkingEndEvent(type=EventType.THINKING_END),
+            ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="c", tool_call_name="f"),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c", delta="{}"),
+            ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id="c"),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="c", delta="{"),
+            StateSnapshotEvent(
+                type=EventType.STATE_SNAPSHOT,
+                snapshot={"int": 1, "float": 1.0, "large": 2**53 + 1, "none": None, "list": [True, "b"]},
+            ),
+            StateDeltaEvent(type=EventType.STATE_DELTA, delta=[{"op": "add", "path": "/a", "value": None}]),
+            MessagesSnapshotEvent(type=EventType.MESSAGES_SNAPSHOT, messages=[
+                UserMessage(id="1", role="user", content="hi"),
+                AssistantMessage(id="2", role="assistant", tool_calls=[
+                    ToolCall(id="c", type="function", function=FunctionCall(name="f", arguments="{}")),
+                ]),
+                ToolMessage(id="3", role="tool", content="result", tool_call_id="c"),
+            ]),
+            RawEvent(type=EventType.RAW, event={"n": 2.5}, source="llm"),
+            CustomEvent(type=EventType.CUSTOM, name="none", value=None, raw_event=[1, 2]),
+            StepFinishedEvent(type=EventType.STEP_FINISHED, step_name="plan"),
+            RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"),
+            RunErrorEvent(type=EventType.RUN_ERROR, message="boom", code="E1"),
+        ]
+        self.assertEqual({event.type for event in events}, set(EventType))
+        with RunRecorder(self.directory) as recorder:
+            for event in events:
+                recorder.record(event)
+        with RunReader(self.directory) as reader:
+            recorded = list(reader)
+        self.assertEqual(recorded, events)
+        snapshot = recorded[15].snapshot
+        self.assertIs(type(snapshot["float"]), float)
+        self.assertEqual(snapshot["large"], 2**53 + 1)
+
+    def test_segments_and_reopening(self):
+        """Test that runs span segments and recorders can be reopened"""
+        with RunRecorder(self.directory, max_segment_size=100) as recorder:
+            for event in _run("r1", deltas="abcdefgh"):
+                recorder.record(event)
+        with RunRecorder(self.directory, max_segment_size=100) as recorder:
+            for event in _run("r2"):
+                recorder.record(event)
+        segments = [name for name in os.listdir(self.directory) if name.endswith(".agui")]
+        self.assertGreater(len(segments), 2)
+
+        with RunReader(self.directory) as reader:
+            self.assertEqual(list(reader.events(run_id="r1")), _run("r1", deltas="abcdefgh"))
+            self.assertEqual(list(reader.events(run_id="r2")), _run("r2"))
+            self.assertEqual([run.run for run in reader.runs], [1, 2])
+
+    def test_concurrent_streams(self):
+        """Test recording interleaved runs from several streams"""
+        async def stream(events):
+            for event in events:
+                await asyncio.sleep(0)
+                yield event
+
+        async def record(recorder):
+            async def consume(events):
+                return [event async for event in recorder.record_stream(stream(events))]
+            return await asyncio.gather(consume(_run("r1", deltas="abc")), consume(_run("r2", deltas="xyz")))
+
+        with RunRecorder(self.directory) as recorder:
+            passed = asyncio.run(record(recorder))
+        self.assertEqual(passed, [_run("r1", deltas="abc"), _run("r2", deltas="xyz")])
+
+        with RunReader(self.directory) as reader:
+            self.assertEqual(list(reader.events(run_id="r1")), _run("r1", deltas="abc"))
+            self.assertEqual(list(reader.events(run_id="r2")), _run("r2", deltas="xyz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
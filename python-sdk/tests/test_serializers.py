@@ -0,0 +1,89 @@
+import unittest
+
+from pydantic_core import PydanticSerializationError
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageContentEvent,
+    ThinkingTextMessageContentEvent,
+    ToolCallArgsEvent,
+    StateDeltaEvent,
+    TextMessageStartEvent,
+)
+from ag_ui.encoder.serializers import serialize_event
+
+
+class TestSerializers(unittest.TestCase):
+    """Test suite for the specialized event serializers"""
+
+    def assertMatchesPydantic(self, event):
+        expected = event.model_dump_json(by_alias=True, exclude_none=True).encode("utf-8")
+        self.assertEqual(serialize_event(event), expected)
+
+    def test_text_events_match_pydantic(self):
+        """Test that text events serialize byte-identically to pydantic"""
+        deltas = ["Hello", 'quote " and \\ backslash', "line\nbreak\ttab\x00\x1f\x7f", "üñí ✓ 😀", " "]
+        for delta in deltas:
+            for timestamp in (None, 0, 1648214400000):
+                with self.subTest(delta=delta, timestamp=timestamp):
+                    self.assertMatchesPydantic(TextMessageContentEvent(
+                        type=EventType.TEXT_MESSAGE_CONTENT,
+                        message_id='msg_"1"',
+                        delta=delta,
+                        timestamp=timestamp
+                    ))
+                    self.assertMatchesPydantic(ToolCallArgsEvent(
+                        type=EventType.TOOL_CALL_ARGS,
+                        tool_call_id="call_1",
+                        delta=delta,
+                        timestamp=timestamp
+                    ))
+                    self.assertMatchesPydantic(ThinkingTextMessageContentEvent(
+                        type=EventType.THINKING_TEXT_MESSAGE_CONTENT,
+                        delta=delta,
+                        timestamp=timestamp
+                    ))
+
+    def test_state_delta_matches_pydantic(self):
+        """Test that state deltas serialize byte-identically to pydantic"""
+        event = StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[
+                {"op": "replace", "path": "/steps/0/status", "value": "completed"},
+                {"op": "add", "path": "/values", "value": [1, 2.5, 1e-7, float("inf"), None, True]},
+                {"op": "remove", "path": "/ü"},
+            ],
+            timestamp=1
+        )
+        self.assertMatchesPydantic(event)
+
+    def test_raw_event_uses_generic_serialization(self):
+        """Test that events with a raw event fall back to pydantic"""
+        self.assertMatchesPydantic(TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_1",
+            delta="Hello",
+            raw_event={"source": "llm"}
+        ))
+
+    def test_other_events_use_pydantic(self):
+        """Test that events without a specialized serializer are supported"""
+        self.assertMatchesPydantic(TextMessageStartEvent(
+            type=EventType.TEXT_MESSAGE_START,
+            message_id="msg_1",
+            role="assistant"
+        ))
+
+    def test_invalid_unicode_is_reported(self):
+        """Test that lone surrogates raise the same error as pydantic"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_1",
+            delta="\ud800"
+        )
+        with self.assertRaises(PydanticSerializationError):
+            serialize_event(event)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import asyncio
+import unittest
+
+from pydantic import ValidationError
+
+from ag_ui.client import SSEParser, ServerSentEvent, parse_sse_stream
+from ag_ui.core.events import EventType, TextMessageContentEvent, RunStartedEvent
+from ag_ui.encoder import EventEncoder
+
+
+class TestSSEParser(unittest.TestCase):
+    """Test suite for the SSE parser"""
+
+    def test_parses_data_messages(self):
+        """Test parsing complete data messages"""
+        parser = SSEParser()
+        messages = parser.feed(b'data: {"a":1}\n\ndata: {"b":2}\n\n')
+        self.assertEqual(messages, [ServerSentEvent(b'{"a":1}'), ServerSentEvent(b'{"b":2}')])
+
+    def test_reassembles_split_chunks(self):
+        """Test that messages split at any byte position are reassembled"""
+        stream = 'data: {"delta":"grüße ✓"}\r\n\r\nevent: update\ndata:second\n\n'.encode("utf-8")
+        for size in range(1, len(stream) + 1):
+            with self.subTest(size=size):
+                parser = SSEParser()
+                messages = []
+                for i in range(0, len(stream), size):
+                    messages.extend(parser.feed(stream[i:i + size]))
+                self.assertEqual(messages, [
+                    ServerSentEvent('{"delta":"grüße ✓"}'.encode("utf-8")),
+                    ServerSentEvent(b"second", "update"),
+                ])
+
+    def test_multi_line_data_comments_and_fields(self):
+        """Test multi-line data, comments, ids and retry fields"""
+        parser = SSEParser()
+        messages = parser.feed(
+            b": keep-alive\n"
+            b"id: 42\n"
+            b"retry: 3000\n"
+            b"data: {\"a\":\n"
+            b"data:  1}\n"
+            b"\n"
+            b"retry: soon\n"
+            b"\n"
+        )
+        self.assertEqual(messages, [ServerSentEvent(b'{"a":\n 1}', "message", "42")])
+        self.assertEqual(parser.last_event_id, "42")
+        self.assertEqual(parser.retry, 3000)
+
+    def test_bare_carriage_returns(self):
+        """Test that CR line endings are supported, also when split from LF"""
+        parser = SSEParser()
+        messages = parser.feed(b"data: a\r")
+        messages += parser.feed(b"\ndata: b\r\r")
+        self.assertEqual(messages, [ServerSentEvent(b"a\nb")])
+
+    def test_empty_data_is_not_dispatched(self):
+        """Test that events with empty data are skipped"""
+        parser = SSEParser()
+        messages = parser.feed(b"data:\n\nevent: ping\ndata: \n\ndata: a\n\n")
+        self.assertEqual(messages, [ServerSentEvent(b"a")])
+
+    def test_byte_order_mark(self):
+        """Test that a byte order mark at the start of the stream is skipped"""
+        stream = b"\xef\xbb\xbfdata: a\n\ndata: \xef\xbb\xbfb\n\n"
+        for size in range(1, len(stream) + 1):
+            with self.subTest(size=size):
+                parser = SSEParser()
+                messages = []
+                for i in range(0, len(stream), size):
+                    messages.extend(parser.feed(stream[i:i + size]))
+                self.assertEqual(messages, [ServerSentEvent(b"a"), ServerSentEvent(b"\xef\xbb\xbfb")])
+        parser = SSEParser()
+        self.assertEqual(parser.feed(b"\xef\xbb"), [])
+        # a partial byte order mark is part of the first field name
+        self.assertEqual(parser.feed(b"data: a\n\n"), [])
+
+    def test_incomplete_message_is_not_dispatched(self):
+        """Test that a message without a terminating blank line is kept back"""
+        parser = SSEParser()
+        self.assertEqual(parser.feed(b"data: a\n"), [])
+
+
+class TestParseSSEStream(unittest.TestCase):
+    """Test suite for parsing typed events from an SSE stream"""
+
+    def test_yields_typed_events(self):
+        """Test that encoded events are parsed back into event models"""
+        encoder = EventEncoder()
+        events = [
+            RunStartedEvent(type=EventType.RUN_STARTED, thread_id="thread_1", run_id="run_1"),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta="Hi ✓"),
+        ]
+        stream = encoder.encode_many(events)
+
+        async def chunks():
+            for i in range(0, len(stream), 7):
+                yield stream[i:i + 7]
+
+        async def collect():
+            return [event async for event in parse_sse_stream(chunks())]
+
+        self.assertEqual(asyncio.run(collect()), events)
+
+    def test_invalid_event(self):
+        """Test that invalid events raise validation errors"""
+        async def chunks():
+            yield b'data: {"type":"NOPE"}\n\n'
+
+        async def collect():
+            return [event async for event in parse_sse_stream(chunks())]
+
+        with self.assertRaises(ValidationError):
+            asyncio.run(collect())
+
+
+if __name__ == "__main__":
+    unittest.main()
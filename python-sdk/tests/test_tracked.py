@@ -0,0 +1,117 @@
+import copy
+import unittest
+
+from ag_ui.core.events import EventType
+from ag_ui.state import TrackedState, apply_patch
+
+
+class TestTrackedState(unittest.TestCase):
+    """Test suite for the tracked state container"""
+
+    def assertReplays(self, before, state):
+        """Asserts that the recorded operations turn `before` into the current state"""
+        event = state.flush()
+        self.assertEqual(apply_patch(before, event.delta), state.data)
+        return event.delta
+
+    def test_nested_assignment(self):
+        """Test that nested assignments are recorded with their path"""
+        data = {"steps": [{"description": "Step 1", "status": "pending"}]}
+        state = TrackedState(data)
+        state["steps"][0]["status"] = "completed"
+        state["title"] = "Plan"
+        event = state.flush()
+        self.assertEqual(event.type, EventType.STATE_DELTA)
+        self.assertEqual(event.delta, [
+            {"op": "replace", "path": "/steps/0/status", "value": "completed"},
+            {"op": "add", "path": "/title", "value": "Plan"},
+        ])
+        self.assertEqual(data["steps"][0]["status"], "completed")
+        self.assertIsNone(state.flush())
+
+    def test_list_operations(self):
+        """Test that list methods record add and remove operations"""
+        before = {"items": [1, 2, 3], "d": {"a": 1, "b/c": 2}}
+        state = TrackedState(copy.deepcopy(before))
+        items = state["items"]
+        items.append(4)
+        items.insert(0, 0)
+        items.extend([5, 6])
+        items.remove(2)
+        self.assertEqual(items.pop(), 6)
+        del items[-1]
+        items[0] = -1
+        items += [7]
+        d = state["d"]
+        d.update({"c": 3})
+        d.setdefault("e", {"f": []})["f"].append(1)
+        self.assertEqual(d.pop("a"), 1)
+        del d["b/c"]
+        delta = self.assertReplays(before, state)
+        self.assertIn({"op": "add", "path": "/items/-", "value": 4}, delta)
+        self.assertIn({"op": "remove", "path": "/d/b~1c"}, delta)
+        self.assertEqual(state.data, {"items": [-1, 1, 3, 4, 7], "d": {"c": 3, "e": {"f": [1]}}})
+
+    def test_proxies_follow_list_changes(self):
+        """Test that proxies keep their path when indices shift"""
+        before = {"steps": [{"n": 0}, {"n": 1}, {"n": 2}]}
+        state = TrackedState(copy.deepcopy(before))
+        last = state["steps"][2]
+        state["steps"].insert(0, {"n": -1})
+        del state["steps"][1]
+        last["n"] = 20
+        delta = self.assertReplays(before, state)
+        self.assertEqual(delta[-1], {"op": "replace", "path": "/steps/2/n", "value": 20})
+
+        removed = state["steps"][0]
+        del state["steps"][0]
+        with self.assertRaises(ValueError):
+            removed["n"] = 0
+
+    def test_values_are_not_shared(self):
+        """Test that recorded values do not change with later mutations"""
+        before = {"a": None}
+        state = TrackedState(copy.deepcopy(before))
+        value = {"list": []}
+        state["a"] = value
+        state["b"] = state["a"]
+        state["a"]["list"].append(1)
+        value["list"].append("untracked")
+        delta = self.assertReplays(before, state)
+        self.assertEqual(delta[0], {"op": "replace", "path": "/a", "value": {"list": []}})
+        self.assertEqual(state.data, {"a": {"list": [1]}, "b": {"list": []}})
+
+    def test_repeated_assignments_are_merged(self):
+        """Test that repeated assignments to one path keep only the last value"""
+        state = TrackedState({"count": 0})
+        for i in range(1, 100):
+            state["count"] = i
+        self.assertEqual(state.flush().delta, [{"op": "replace", "path": "/count", "value": 99}])
+
+    def test_snapshot(self):
+        """Test that a snapshot copies the state and discards pending operations"""
+        state = TrackedState({"a": [1]})
+        state["a"].append(2)
+        self.assertTrue(state.has_changes)
+        event = state.snapshot()
+        self.assertEqual(event.snapshot, {"a": [1, 2]})
+        self.assertFalse(state.has_changes)
+        state["a"].append(3)
+        self.assertEqual(event.snapshot, {"a": [1, 2]})
+
+    def test_list_root_and_read_access(self):
+        """Test a list as the root and that reads do not record operations"""
+        state = TrackedState([{"a": 1}])
+        self.assertEqual(state[0], {"a": 1})
+        self.assertEqual(list(state[0].items()), [("a", 1)])
+        self.assertEqual(len(state), 1)
+        self.assertIsNone(state.flush())
+        state.root.append({"b": 2})
+        state.root.sort(key=lambda item: list(item)[0], reverse=True)
+        self.assertReplays([{"a": 1}], state)
+        with self.assertRaises(TypeError):
+            TrackedState("text")
+
+
+if __name__ == "__main__":
+    unittest.main()
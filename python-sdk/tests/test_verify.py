@@ -0,0 +1,189 @@
+import asyncio
+import unittest
+
+from ag_ui.client import AGUIError, EventVerifier, verify_events, verify_event_stream, verified
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    RawEvent,
+    StateSnapshotEvent,
+)
+
+
+def _run_started():
+    return RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t1", run_id="r1")
+
+
+def _run_finished():
+    return RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t1", run_id="r1")
+
+
+def _valid_run():
+    return [
+        _run_started(),
+        StepStartedEvent(type=EventType.STEP_STARTED, step_name="plan"),
+        ThinkingStartEvent(type=EventType.THINKING_START),
+        ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START),
+        ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="hmm"),
+        ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END),
+        ThinkingEndEvent(type=EventType.THINKING_END),
+        TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant"),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta="Hi"),
+        RawEvent(type=EventType.RAW, event={"x": 1}),
+        TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m1"),
+        ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="c1", tool_call_name="search"),
+        ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta="{}"),
+        ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id="c1"),
+        StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": 1}),
+        StepFinishedEvent(type=EventType.STEP_FINISHED, step_name="plan"),
+        _run_finished(),
+    ]
+
+
+class TestEventVerifier(unittest.TestCase):
+    """Test suite for the event sequence verifier"""
+
+    def assertRejected(self, events, message):
+        """Verifies events and asserts that the last one is rejected"""
+        verifier = EventVerifier()
+        for event in events[:-1]:
+            verifier.verify(event)
+        with self.assertRaises(AGUIError) as context:
+            verifier.verify(events[-1])
+        self.assertIn(message, str(context.exception))
+
+    def test_valid_run(self):
+        """Test that a valid run passes unchanged"""
+        events = _valid_run()
+        self.assertEqual(list(verify_events(events)), events)
+
+    def test_first_event_must_be_run_started(self):
+        """Test that a run must start with RUN_STARTED"""
+        self.assertRejected([_valid_run()[1]], "First event must be 'RUN_STARTED'")
+
+    def test_run_error_may_be_first(self):
+        """Test that RUN_ERROR is accepted as the first event and ends the run"""
+        error = RunErrorEvent(type=EventType.RUN_ERROR, message="boom")
+        self.assertRejected([error, _run_started()], "already errored")
+
+    def test_multiple_run_started(self):
+        """Test that RUN_STARTED can only be sent once"""
+        self.assertRejected([_run_started(), _run_started()], "multiple 'RUN_STARTED'")
+
+    def test_events_after_run_finished(self):
+        """Test that only RUN_ERROR may follow RUN_FINISHED"""
+        events = [_run_started(), _run_finished()]
+        self.assertRejected(events + [_run_started()], "already finished")
+        verifier = EventVerifier()
+        for event in events:
+            verifier.verify(event)
+        verifier.verify(RunErrorEvent(type=EventType.RUN_ERROR, message="late"))
+
+    def test_text_message_rules(self):
+        """Test text message ordering and id checks"""
+        start = TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant")
+        self.assertRejected(
+            [_run_started(), start, _valid_run()[11]],
+            "after 'TEXT_MESSAGE_START'",
+        )
+        self.assertRejected(
+            [_run_started(), start, TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT, message_id="m2", delta="x")],
+            "Message ID mismatch",
+        )
+        self.assertRejected(
+            [_run_started(), TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m1")],
+            "No active text message",
+        )
+
+    def test_tool_call_rules(self):
+        """Test tool call ordering and id checks"""
+        start = ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="c1", tool_call_name="f")
+        self.assertRejected([_run_started(), start, start], "A tool call is already in progress")
+        self.assertRejected(
+            [_run_started(), start, ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id="c2")],
+            "Tool call ID mismatch",
+        )
+        self.assertRejected(
+            [_run_started(), ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta="{}")],
+            "No active tool call",
+        )
+
+    def test_step_rules(self):
+        """Test that steps must be started once and finished before the run ends"""
+        step = StepStartedEvent(type=EventType.STEP_STARTED, step_name="plan")
+        self.assertRejected([_run_started(), step, step], 'Step "plan" is already active')
+        self.assertRejected(
+            [_run_started(), StepFinishedEvent(type=EventType.STEP_FINISHED, step_name="plan")],
+            "that was not started",
+        )
+        self.assertRejected([_run_started(), step, _run_finished()], "steps are still active: plan")
+
+    def test_thinking_rules(self):
+        """Test that thinking messages must be inside a thinking step"""
+        self.assertRejected(
+            [_run_started(), ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START)],
+            "A thinking step is not in progress",
+        )
+        self.assertRejected(
+            [_run_started(), ThinkingEndEvent(type=EventType.THINKING_END)],
+            "No active thinking step",
+        )
+
+    def test_reset(self):
+        """Test that a reset verifier accepts a new run"""
+        verifier = EventVerifier()
+        for event in _valid_run():
+            verifier.verify(event)
+        verifier.reset()
+        for event in _valid_run():
+            verifier.verify(event)
+
+    def test_async_stream(self):
+        """Test verifying an async iterable of events"""
+        async def produce():
+            yield _run_started()
+            yield _run_started()
+
+        async def consume():
+            return [event async for event in verify_event_stream(produce())]
+
+        with self.assertRaises(AGUIError):
+            asyncio.run(consume())
+
+    def test_verified_decorator(self):
+        """Test the decorator on sync and async generator functions"""
+        @verified
+        def run_sync():
+            yield from _valid_run()
+
+        @verified(debug=True)
+        async def run_async():
+            for event in _valid_run():
+                yield event
+
+        async def consume():
+            return [event async for event in run_async()]
+
+        self.assertEqual(len(list(run_sync())), len(_valid_run()))
+        self.assertEqual(len(asyncio.run(consume())), len(_valid_run()))
+        self.assertEqual(run_sync.__name__, "run_sync")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,22 +15,22 @@ from .predictive_state_updates import predictive_state_updates_endpoint
 app = FastAPI(title="AG-UI Endpoint")
 
 # Register the agentic chat endpoint
-app.post("/agentic_chat")(agentic_chat_endpoint)
+app.add_route("/agentic_chat", agentic_chat_endpoint, methods=["POST"])
 
 # Register the human in the loop endpoint
-app.post("/human_in_the_loop")(human_in_the_loop_endpoint)
+app.add_route("/human_in_the_loop", human_in_the_loop_endpoint, methods=["POST"])
 
 # Register the agentic generative UI endpoint
-app.post("/agentic_generative_ui")(agentic_generative_ui_endpoint)
+app.add_route("/agentic_generative_ui", agentic_generative_ui_endpoint, methods=["POST"])
 
 # Register the tool-based generative UI endpoint
-app.post("/tool_based_generative_ui")(tool_based_generative_ui_endpoint)
+app.add_route("/tool_based_generative_ui", tool_based_generative_ui_endpoint, methods=["POST"])
 
 # Register the shared state endpoint
-app.post("/shared_state")(shared_state_endpoint)
+app.add_route("/shared_state", shared_state_endpoint, methods=["POST"])
 
 # Register the predictive state updates endpoint
-app.post("/predictive_state_updates")(predictive_state_updates_endpoint)
+app.add_route("/predictive_state_updates", predictive_state_updates_endpoint, methods=["POST"])
 
 
 def main():
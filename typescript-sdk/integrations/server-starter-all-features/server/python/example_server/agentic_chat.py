@@ -5,13 +5,9 @@ Agentic chat endpoint for the AG-UI protocol.
 import uuid
 import asyncio
 import json
-from fastapi import Request
-from fastapi.responses import StreamingResponse
 from ag_ui.core import (
     RunAgentInput,
     EventType,
-    RunStartedEvent,
-    RunFinishedEvent,
     TextMessageStartEvent,
     TextMessageContentEvent,
     TextMessageEndEvent,
@@ -24,61 +20,32 @@ from ag_ui.core import (
     AssistantMessage
 )
 from ag_ui.core.events import TextMessageChunkEvent
-from ag_ui.encoder import EventEncoder
+from ag_ui.server import agui_endpoint
 
-async def agentic_chat_endpoint(input_data: RunAgentInput, request: Request):
+@agui_endpoint
+async def agentic_chat_endpoint(input_data: RunAgentInput):
     """Agentic chat endpoint"""
-    # Get the accept header from the request
-    accept_header = request.headers.get("accept")
-
-    # Create an event encoder to properly format SSE events
-    encoder = EventEncoder(accept=accept_header)
-
-    async def event_generator():
-        # Get the last message content for conditional logic
-        last_message_content = None
-        last_message_role = None
-        if input_data.messages and len(input_data.messages) > 0:
-            last_message = input_data.messages[-1]
-            last_message_content = last_message.content
-            last_message_role = getattr(last_message, 'role', None)
-
-        # Send run started event
-        yield encoder.encode(
-            RunStartedEvent(
-                type=EventType.RUN_STARTED,
-                thread_id=input_data.thread_id,
-                run_id=input_data.run_id
-            ),
-        )
-
-        # Conditional logic based on last message
-        if last_message_role == "tool":
-            async for event in send_tool_result_message_events():
-                yield encoder.encode(event)
-        elif last_message_content == "tool":
-            async for event in send_tool_call_events():
-                yield encoder.encode(event)
-        elif last_message_content == "backend_tool":
-            async for event in send_backend_tool_call_events(input_data.messages):
-                yield encoder.encode(event)
-        else:
-            async for event in send_text_message_events():
-                yield encoder.encode(event)
-
-        # Send run finished event
-        yield encoder.encode(
-            RunFinishedEvent(
-                type=EventType.RUN_FINISHED,
-                thread_id=input_data.thread_id,
-                run_id=input_data.run_id
-            ),
-        )
-
-    return StreamingResponse(
-        event_generator(),
-        media_type=encoder.get_content_type()
-    )
+    # Get the last message content for conditional logic
+    last_message_content = None
+    last_message_role = None
+    if input_data.messages and len(input_data.messages) > 0:
+        last_message = input_data.messages[-1]
+        last_message_content = last_message.content
+        last_message_role = getattr(last_message, 'role', None)
+
+    # Conditional logic based on last message
+    if last_message_role == "tool":
+        async for event in send_tool_result_message_events():
+            yield event
+    elif last_message_content == "tool":
+        async for event in send_tool_call_events():
+            yield event
+    elif last_message_content == "backend_tool":
+        async for event in send_backend_tool_call_events(input_data.messages):
+            yield event
+    else:
+        async for event in send_text_message_events():
+            yield event
 
 
 async def send_text_message_events():
@@ -3,61 +3,22 @@ Agentic generative UI endpoint for the AG-UI protocol.
 """
 
 import asyncio
-import copy
-import jsonpatch
-from fastapi import Request
-from fastapi.responses import StreamingResponse
-from ag_ui.core import (
-    RunAgentInput,
-    EventType,
-    RunStartedEvent,
-    RunFinishedEvent,
-    StateSnapshotEvent,
-    StateDeltaEvent
-)
-from ag_ui.encoder import EventEncoder
+from ag_ui.core import RunAgentInput
+from ag_ui.server import agui_endpoint
+from ag_ui.state import TrackedState
 
-async def agentic_generative_ui_endpoint(input_data: RunAgentInput, request: Request):
+@agui_endpoint
+async def agentic_generative_ui_endpoint(input_data: RunAgentInput):
     """Agentic generative UI endpoint"""
-    # Get the accept header from the request
-    accept_header = request.headers.get("accept")
-
-    # Create an event encoder to properly format SSE events
-    encoder = EventEncoder(accept=accept_header)
-
-    async def event_generator():
-        # Send run started event
-        yield encoder.encode(
-            RunStartedEvent(
-                type=EventType.RUN_STARTED,
-                thread_id=input_data.thread_id,
-                run_id=input_data.run_id
-            ),
-        )
-
-        # Send state events
-        async for event in send_state_events():
-            yield encoder.encode(event)
-
-        # Send run finished event
-        yield encoder.encode(
-            RunFinishedEvent(
-                type=EventType.RUN_FINISHED,
-                thread_id=input_data.thread_id,
-                run_id=input_data.run_id
-            ),
-        )
-
-    return StreamingResponse(
-        event_generator(),
-        media_type=encoder.get_content_type()
-    )
+    # Send state events
+    async for event in send_state_events():
+        yield event
 
 
 async def send_state_events():
     """Send state events with snapshots and deltas"""
-    # Initialize state
-    state = {
+    # Initialize state, recording JSON patches as it is changed
+    state = TrackedState({
         "steps": [
             {
                 "description": f"Step {i + 1}",
@@ -65,41 +26,23 @@ async def send_state_events():
             }
             for i in range(10)
         ]
-    }
+    })
 
     # Send initial state snapshot
-    yield StateSnapshotEvent(
-        type=EventType.STATE_SNAPSHOT,
-        snapshot=state
-    )
-    
+    yield state.snapshot()
+
     # Sleep for 1 second
     await asyncio.sleep(1.0)
 
-    # Create a copy to track changes for JSON patches
-    previous_state = copy.deepcopy(state)
-
     # Update each step and send deltas
-    for i, step in enumerate(state["steps"]):
+    for step in state["steps"]:
         step["status"] = "completed"
-        
-        # Generate JSON patch from previous state to current state
-        patch = jsonpatch.make_patch(previous_state, state)
-        
-        # Send state delta event
-        yield StateDeltaEvent(
-            type=EventType.STATE_DELTA,
-            delta=patch.patch
-        )
-        
-        # Update previous state for next iteration
-        previous_state = copy.deepcopy(state)
-        
+
+        # Send state delta event with the changes since the last one
+        yield state.flush()
+
         # Sleep for 1 second
         await asyncio.sleep(1.0)
 
     # Optionally send a final snapshot to the client
-    yield StateSnapshotEvent(
-        type=EventType.STATE_SNAPSHOT,
-        snapshot=state
-    )
+    yield state.snapshot()
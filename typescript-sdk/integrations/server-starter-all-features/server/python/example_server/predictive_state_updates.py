@@ -5,13 +5,9 @@ Predictive state updates endpoint for the AG-UI protocol.
 import uuid
 import asyncio
 import random
-from fastapi import Request
-from fastapi.responses import StreamingResponse
 from ag_ui.core import (
     RunAgentInput,
     EventType,
-    RunStartedEvent,
-    RunFinishedEvent,
     TextMessageStartEvent,
     TextMessageContentEvent,
     TextMessageEndEvent,
@@ -20,52 +16,23 @@ from ag_ui.core import (
     ToolCallEndEvent,
     CustomEvent
 )
-from ag_ui.encoder import EventEncoder
+from ag_ui.server import agui_endpoint
 
-async def predictive_state_updates_endpoint(input_data: RunAgentInput, request: Request):
+@agui_endpoint
+async def predictive_state_updates_endpoint(input_data: RunAgentInput):
     """Predictive state updates endpoint"""
-    # Get the accept header from the request
-    accept_header = request.headers.get("accept")
-
-    # Create an event encoder to properly format SSE events
-    encoder = EventEncoder(accept=accept_header)
-
-    async def event_generator():
-        # Get the last message for conditional logic
-        last_message = None
-        if input_data.messages and len(input_data.messages) > 0:
-            last_message = input_data.messages[-1]
-
-        # Send run started event
-        yield encoder.encode(
-            RunStartedEvent(
-                type=EventType.RUN_STARTED,
-                thread_id=input_data.thread_id,
-                run_id=input_data.run_id
-            ),
-        )
-
-        # Conditional logic based on last message role
-        if last_message and getattr(last_message, 'role', None) == "tool":
-            async for event in send_text_message_events():
-                yield encoder.encode(event)
-        else:
-            async for event in send_tool_call_events():
-                yield encoder.encode(event)
-
-        # Send run finished event
-        yield encoder.encode(
-            RunFinishedEvent(
-                type=EventType.RUN_FINISHED,
-                thread_id=input_data.thread_id,
-                run_id=input_data.run_id
-            ),
-        )
-
-    return StreamingResponse(
-        event_generator(),
-        media_type=encoder.get_content_type()
-    )
+    # Get the last message for conditional logic
+    last_message = None
+    if input_data.messages and len(input_data.messages) > 0:
+        last_message = input_data.messages[-1]
+
+    # Conditional logic based on last message role
+    if last_message and getattr(last_message, 'role', None) == "tool":
+        async for event in send_text_message_events():
+            yield event
+    else:
+        async for event in send_tool_call_events():
+            yield event
 
 
 def make_story(name: str) -> str: